@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for resume_mailer.py hot paths.
+Run directly to print timings for each benchmark.
+
+    python benchmark_resume_mailer.py --json results.json
+    python benchmark_resume_mailer.py --compare results.json --threshold 0.2
+
+--compare exits with status 1 if any benchmark got slower than the saved run
+by more than the threshold (a fraction, 0.2 = 20%).
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from datetime import datetime
+
+from resume_mailer import (
+    ResumeParser, CompanyAssessment, CoverLetterGenerator, EmailSender, AsyncEmailSender,
+    tokenize_sections, PostingIndex, PostingCatalog, ColumnarCatalog,
+)
+from resume_mailer_testing import LocalSMTPServer, reference_experience_relevance, reference_culture_fit
+
+
+def _time(func, repeat=3):
+    """Return the best wall time of several runs of func, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def synthetic_skill_lists(count, skills_per_posting, seed=0):
+    """Build posting skill lists drawn from a realistic mix of matching and unknown skills."""
+    rng = random.Random(seed)
+    vocabulary = ['Python', 'Swift', 'AWS', 'Docker', 'React', 'Django', 'Kubernetes', 'Go',
+                  'Rust', 'Terraform', 'PostgreSQL', 'CI/CD', 'TensorFlow', 'Scala', 'Kafka']
+    vocabulary += [f'Framework{i}' for i in range(300)]
+    return [[rng.choice(vocabulary) for _ in range(skills_per_posting)] for _ in range(count)]
+
+
+def legacy_skills_match(resume_data, required_skills):
+    """The original quadratic substring scan, kept as the benchmark baseline."""
+    if not required_skills:
+        return 35
+    all_candidate_skills = []
+    for skill_category in resume_data['skills'].values():
+        all_candidate_skills.extend([s.lower() for s in skill_category])
+    matched_skills = 0
+    for req_skill in required_skills:
+        req_skill_lower = req_skill.lower()
+        if any(req_skill_lower in candidate_skill or candidate_skill in req_skill_lower
+               for candidate_skill in all_candidate_skills):
+            matched_skills += 1
+    return int(matched_skills / len(required_skills) * 40)
+
+
+def benchmark_skills_match(postings=2000, skills_per_posting=60):
+    """Compare the skill index against the original substring scan."""
+    resume_data = ResumeParser().data
+    assessment = CompanyAssessment(resume_data)
+    skill_lists = synthetic_skill_lists(postings, skills_per_posting)
+    
+    assert all(assessment._assess_skills_match(skills) == legacy_skills_match(resume_data, skills)
+               for skills in skill_lists)
+    
+    legacy = _time(lambda: [legacy_skills_match(resume_data, skills) for skills in skill_lists])
+    indexed = _time(lambda: [assessment._assess_skills_match(skills) for skills in skill_lists])
+    return {
+        'name': f'skills_match ({postings} postings x {skills_per_posting} skills)',
+        'baseline_seconds': legacy,
+        'seconds': indexed,
+    }
+
+
+def synthetic_postings(count, skills_per_posting=10, seed=0):
+    """Build a catalog of company_info dicts with varied enums and skill lists."""
+    rng = random.Random(seed)
+    industries = ['tech', 'ecommerce', 'finance', 'automotive', 'healthcare', 'media']
+    sizes = ['startup', 'medium', 'enterprise']
+    cultures = ['fast-paced', 'balanced', 'traditional']
+    positions = ['Senior iOS Developer', 'DevOps Engineer', 'Junior Analyst', 'Lead Engineer',
+                 'Data Scientist', 'Principal Architect', 'Entry Level Developer']
+    skill_lists = synthetic_skill_lists(count, skills_per_posting, seed)
+    return [{
+        'company_name': f'Company {i}',
+        'position': rng.choice(positions),
+        'required_skills': skill_lists[i],
+        'industry': rng.choice(industries),
+        'company_size': rng.choice(sizes),
+        'work_culture': rng.choice(cultures),
+        'remote_policy': 'remote',
+    } for i in range(count)]
+
+
+def benchmark_score_many(postings=20000):
+    """Compare columnar batch scoring against per-posting calculate_success_score."""
+    assessment = CompanyAssessment(ResumeParser().data)
+    catalog = synthetic_postings(postings)
+    
+    per_posting = _time(lambda: [assessment.calculate_success_score(info) for info in catalog])
+    columnar = _time(lambda: assessment.score_many(catalog))
+    return {
+        'name': f'score_many ({postings} postings)',
+        'baseline_seconds': per_posting,
+        'seconds': columnar,
+    }
+
+
+def synthetic_resume(sections=200, lines_per_section=20, seed=0):
+    """Build a large resume: many filler sections ahead of the ones the parser reads."""
+    rng = random.Random(seed)
+    words = ['built', 'deployed', 'python', 'pipelines', 'scalable', 'systems', 'automation',
+             'models', 'cloud', 'services', 'reduced', 'latency', 'across', 'teams']
+    
+    def bullets(count):
+        return '\n'.join('- ' + ' '.join(rng.choice(words) for _ in range(12)) for _ in range(count))
+    
+    parts = [
+        "# Synthetic Candidate\n",
+        "Atlanta, GA | (404) 555-0100 | [candidate@example.com](mailto:candidate@example.com)  \n"
+        "LinkedIn: [candidate](https://www.linkedin.com/in/candidate/) | GitHub: [candidate](https://github.com/candidate)\n",
+    ]
+    for i in range(sections):
+        parts.append(f"## Filler Section {i}\n\n{bullets(lines_per_section)}\n")
+    parts.append("## Professional Summary\n\n" + bullets(3) + "\n")
+    parts.append("## Technical Skills\n\n- **Languages:** Python, Go, Swift\n"
+                 "- **Frameworks & Tools:** Django, React\n- **Cloud & DevOps:** AWS, Docker\n"
+                 "- **Specializations:** Automation\n")
+    jobs = ''.join(f"**Engineer {i}**\n*Company {i}* | 20{i % 25:02d} – Present\n{bullets(4)}\n\n"
+                   for i in range(lines_per_section))
+    parts.append("## Experience\n\n" + jobs)
+    parts.append("## Projects\n\n" + ''.join(f"**Project {i}**\n{bullets(2)}\n\n" for i in range(10)))
+    parts.append("## Education\n\n**MS in Computer Science**\nSome University, 2020\n")
+    return '\n'.join(parts)
+
+
+def legacy_parse(parser, content):
+    """Parse with one whole-document regex search per section, as the parser used to."""
+    data = {}
+    for field, (method, title) in ResumeParser.FIELDS.items():
+        if title is None:
+            text = content
+        else:
+            match = re.search(r'## ' + re.escape(title) + r'\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
+            text = match.group(1) if match else ''
+        data[field] = getattr(parser, method)(text)
+    return data
+
+
+def benchmark_parse_large_resume(sections=2000, lines_per_section=20):
+    """Compare the single-pass tokenizer against per-section regex scans on a large resume."""
+    content = synthetic_resume(sections, lines_per_section)
+    with tempfile.NamedTemporaryFile('w', suffix='.md', delete=False, encoding='utf-8') as f:
+        f.write(content)
+    try:
+        parser = ResumeParser(f.name, cache=False)
+        assert legacy_parse(parser, content) == parser.data
+        
+        legacy = _time(lambda: legacy_parse(parser, content))
+        tokenized = _time(lambda: parser._parse_content(content, tokenize_sections(content)))
+    finally:
+        os.unlink(f.name)
+    return {
+        'name': f'parse ({sections} sections, {len(content) // 1024} KB)',
+        'baseline_seconds': legacy,
+        'seconds': tokenized,
+    }
+
+
+def benchmark_async_send(messages=200, concurrency=8, latency=0.01):
+    """Compare sequential sends against AsyncEmailSender on a local server with simulated latency."""
+    server = LocalSMTPServer(delay=latency)
+    batch = [{
+        'recipient_email': f'hiring{i}@example.com',
+        'subject': f'Application {i}',
+        'cover_letter': 'Dear Hiring Manager,\n\nHello.\n',
+    } for i in range(messages)]
+    
+    def send_sequential():
+        with EmailSender(config_path='missing_email_config.json') as sender:
+            sender.config.update(server.config())
+            assert all(success for success, _ in sender.send_many(batch))
+    
+    async def send_concurrent():
+        async with AsyncEmailSender('missing_email_config.json', concurrency=concurrency) as sender:
+            sender.config.update(server.config())
+            assert all(success for success, _ in await sender.send_many(batch))
+    
+    try:
+        sequential = _time(send_sequential, repeat=1)
+        concurrent = _time(lambda: asyncio.run(send_concurrent()), repeat=1)
+    finally:
+        server.stop()
+    return {
+        'name': f'send ({messages} messages, {concurrency} in flight, {latency * 1000:.0f} ms server latency)',
+        'baseline_seconds': sequential,
+        'seconds': concurrent,
+    }
+
+
+def legacy_build_message(config, recipient_email, subject, cover_letter, resume_path):
+    """Build a message the way send_resume used to: read and re-encode the PDF every time."""
+    from email import encoders
+    from email.mime.base import MIMEBase
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    
+    msg = MIMEMultipart()
+    msg['From'] = config['sender_email']
+    msg['To'] = recipient_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(cover_letter, 'plain'))
+    with open(resume_path, 'rb') as f:
+        part = MIMEBase('application', 'octet-stream')
+        part.set_payload(f.read())
+        encoders.encode_base64(part)
+        part.add_header('Content-Disposition', f'attachment; filename= {os.path.basename(resume_path)}')
+        msg.attach(part)
+    return msg
+
+
+def _peak_allocation(func):
+    """Return the peak traced allocation of one call to func, in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_build_message(messages=500, resume_path='resume.pdf'):
+    """Compare per-message MIME building with and without the attachment cache."""
+    sender = EmailSender(config_path='missing_email_config.json')
+    args = ('hiring@example.com', 'Application', 'Dear Hiring Manager,\n\nHello.\n', resume_path)
+    sender._build_message(*args)
+    
+    legacy = _time(lambda: [legacy_build_message(sender.config, *args) for _ in range(messages)])
+    cached = _time(lambda: [sender._build_message(*args) for _ in range(messages)])
+    return {
+        'name': f'build message ({messages} messages, {os.path.getsize(resume_path) // 1024} KB attachment)',
+        'baseline_seconds': legacy,
+        'seconds': cached,
+        'baseline_peak_bytes': _peak_allocation(lambda: legacy_build_message(sender.config, *args)),
+        'peak_bytes': _peak_allocation(lambda: sender._build_message(*args)),
+    }
+
+
+def legacy_generate(generator, company_info, assessment_result):
+    """Build a cover letter by string concatenation, as CoverLetterGenerator.generate used to."""
+    resume_data = generator.resume_data
+    name = resume_data['name']
+    email = resume_data['contact'].get('email', '')
+    phone = resume_data['contact'].get('phone', '')
+    date = datetime.now().strftime("%B %d, %Y")
+    
+    letter = f"{name}\n"
+    if email:
+        letter += f"{email}"
+    if phone:
+        letter += f" | {phone}"
+    letter += f"\n\n{date}\n\n"
+    letter += "Hiring Manager\n"
+    letter += f"{company_info.get('company_name', '[Company Name]')}\n\n"
+    letter += "Dear Hiring Manager,\n\n"
+    letter += f"I am writing to express my strong interest in the {company_info.get('position', '[Position]')} "
+    letter += f"position at {company_info.get('company_name', '[Company Name]')}. "
+    most_recent = resume_data['experience'][0] if resume_data['experience'] else None
+    if most_recent:
+        letter += f"As a {most_recent['title']} with a proven track record in {company_info.get('industry', 'technology')}, "
+    else:
+        letter += "With my background in software engineering and "
+    letter += "I am excited about the opportunity to contribute to your team.\n\n"
+    letter += "My technical expertise aligns well with your requirements. "
+    if company_info.get('required_skills'):
+        skills_mentioned = company_info['required_skills'][:3]
+        letter += f"I bring extensive experience in {', '.join(skills_mentioned[:-1])}"
+        if len(skills_mentioned) > 1:
+            letter += f", and {skills_mentioned[-1]}"
+        letter += ". "
+    if resume_data['experience']:
+        letter += generator._add_relevant_accomplishments(company_info)
+    letter += "\n\n"
+    emphasis_areas = assessment_result['areas_to_emphasize']
+    if emphasis_areas:
+        letter += "I am particularly drawn to this opportunity because of my "
+        letter += emphasis_areas[0].lower()
+        if len(emphasis_areas) > 1:
+            letter += f", as well as my {emphasis_areas[1].lower()}"
+        letter += ". "
+    letter += "I am confident that my background and skills make me a strong candidate for this role"
+    if company_info.get('company_size') == 'startup':
+        letter += ", and I thrive in dynamic, fast-paced environments where I can make an immediate impact"
+    elif company_info.get('company_size') == 'enterprise':
+        letter += ", and I excel in collaborative environments with established processes"
+    letter += ".\n\n"
+    letter += "I would welcome the opportunity to discuss how my experience and skills can contribute to "
+    letter += f"{company_info.get('company_name', 'your organization')}'s success. "
+    letter += "Thank you for considering my application.\n\n"
+    letter += "Sincerely,\n"
+    letter += f"{name}\n"
+    return letter
+
+
+def benchmark_cover_letters(letters=100000):
+    """Compare the compiled cover letter template against string concatenation."""
+    resume_data = ResumeParser().data
+    assessment = CompanyAssessment(resume_data)
+    generator = CoverLetterGenerator(resume_data)
+    catalog = synthetic_postings(1000)
+    pairs = [(info, assessment.calculate_success_score(info)) for info in catalog]
+    pairs = (pairs * (letters // len(pairs) + 1))[:letters]
+    
+    assert all(generator.generate(*pair) == legacy_generate(generator, *pair) for pair in pairs[:1000])
+    
+    concatenated = _time(lambda: [legacy_generate(generator, *pair) for pair in pairs], repeat=1)
+    compiled = _time(lambda: [generator.generate(*pair) for pair in pairs], repeat=1)
+    return {
+        'name': f'cover letters ({letters} letters)',
+        'baseline_seconds': concatenated,
+        'seconds': compiled,
+    }
+
+
+def benchmark_reposted_postings(postings=20000, distinct=1000, seed=0):
+    """Compare uncached scoring against the LRU cache on a feed full of reposts."""
+    rng = random.Random(seed)
+    resume_data = ResumeParser().data
+    originals = synthetic_postings(distinct)
+    feed = []
+    for i in range(postings):
+        info = dict(rng.choice(originals), company_name=f'Repost {i}')
+        skills = [rng.choice([skill, skill.upper(), skill.lower()]) for skill in info['required_skills']]
+        rng.shuffle(skills)
+        info['required_skills'] = skills
+        feed.append(info)
+    
+    uncached = CompanyAssessment(resume_data, cache_size=0)
+    baseline = _time(lambda: [uncached.calculate_success_score(info) for info in feed])
+    
+    def score_cached():
+        assessment = CompanyAssessment(resume_data)
+        return [assessment.calculate_success_score(info) for info in feed]
+    
+    cached = _time(score_cached)
+    return {
+        'name': f'reposted postings ({postings} postings, {distinct} distinct)',
+        'baseline_seconds': baseline,
+        'seconds': cached,
+    }
+
+
+def benchmark_top_k(postings=50000, k=50):
+    """Compare top_k against scoring every posting and sorting."""
+    assessment = CompanyAssessment(ResumeParser().data, cache_size=0)
+    catalog = synthetic_postings(postings)
+    
+    def full_sort():
+        results = [assessment.calculate_success_score(info) for info in catalog]
+        return sorted(range(len(results)), key=lambda i: -results[i]['total_score'])[:k]
+    
+    return {
+        'name': f'top {k} of {postings} postings',
+        'baseline_seconds': _time(full_sort),
+        'seconds': _time(lambda: assessment.top_k(catalog, k)),
+    }
+
+
+def benchmark_posting_index(postings=1000000):
+    """Compare finding a resume's candidate postings via the inverted index against a full scan."""
+    resume_data = ResumeParser().data
+    catalog = synthetic_postings(postings)
+    skill_index = CompanyAssessment(resume_data).skill_index
+    fd, path = tempfile.mkstemp(suffix='.idx')
+    os.close(fd)
+    
+    build_seconds = _time(lambda: PostingIndex.build(catalog).write(path), repeat=1)
+    try:
+        with PostingIndex.open(path) as index:
+            query = _time(lambda: index.candidates(resume_data))
+        scan = _time(lambda: [i for i, info in enumerate(catalog)
+                              if skill_index.count_matches(info['required_skills'])], repeat=1)
+    finally:
+        os.remove(path)
+    return {
+        'name': f'candidate postings for a resume ({postings} postings)',
+        'baseline_seconds': scan,
+        'seconds': query,
+        'build_seconds': build_seconds,
+    }
+
+
+def benchmark_parse_resume(sections=2000, lines_per_section=20):
+    """Time ResumeParser._parse_resume on a large resume file, without the parse cache."""
+    content = synthetic_resume(sections, lines_per_section)
+    with tempfile.NamedTemporaryFile('w', suffix='.md', delete=False, encoding='utf-8') as f:
+        f.write(content)
+    try:
+        parser = ResumeParser(f.name, cache=False)
+        seconds = _time(parser._parse_resume)
+    finally:
+        os.unlink(f.name)
+    return {
+        'name': f'ResumeParser._parse_resume ({len(content) // 1024} KB file)',
+        'seconds': seconds,
+    }
+
+
+def benchmark_calculate_success_score(postings=20000):
+    """Time calculate_success_score over a posting catalog, with the score cache off."""
+    assessment = CompanyAssessment(ResumeParser().data, cache_size=0)
+    catalog = synthetic_postings(postings)
+    return {
+        'name': f'calculate_success_score ({postings} postings)',
+        'seconds': _time(lambda: [assessment.calculate_success_score(info) for info in catalog]),
+    }
+
+
+def benchmark_generate(letters=20000):
+    """Time CoverLetterGenerator.generate over scored postings."""
+    resume_data = ResumeParser().data
+    assessment = CompanyAssessment(resume_data)
+    generator = CoverLetterGenerator(resume_data)
+    pairs = [(info, assessment.calculate_success_score(info)) for info in synthetic_postings(letters)]
+    return {
+        'name': f'CoverLetterGenerator.generate ({letters} letters)',
+        'seconds': _time(lambda: [generator.generate(*pair) for pair in pairs]),
+    }
+
+
+def benchmark_send_resume(messages=200, resume_path='resume.pdf'):
+    """Time send_resume (MIME building and delivery) against a local SMTP sink."""
+    server = LocalSMTPServer()
+    
+    def send_all():
+        with EmailSender(config_path='missing_email_config.json') as sender:
+            sender.config.update(server.config())
+            for i in range(messages):
+                success, message = sender.send_resume(f'hiring{i}@example.com', f'Application {i}',
+                                                      'Dear Hiring Manager,\n\nHello.\n', resume_path)
+                assert success, message
+    
+    try:
+        seconds = _time(send_all)
+    finally:
+        server.stop()
+    return {
+        'name': f'EmailSender.send_resume ({messages} messages to a local sink)',
+        'seconds': seconds,
+    }
+
+
+def benchmark_posting_memory(postings=100000):
+    """Compare loading a JSONL catalog into dicts against compact Posting records."""
+    lines = [json.dumps(info) for info in synthetic_postings(postings)]
+    load_dicts = lambda: [json.loads(line) for line in lines]
+    load_catalog = lambda: PostingCatalog(json.loads(line) for line in lines)
+    return {
+        'name': f'load posting catalog ({postings} postings)',
+        'baseline_seconds': _time(load_dicts),
+        'seconds': _time(load_catalog),
+        'baseline_peak_bytes': _peak_allocation(load_dicts),
+        'peak_bytes': _peak_allocation(load_catalog),
+    }
+
+
+def benchmark_columnar_catalog(postings=100000):
+    """Compare scoring a mapped ColumnarCatalog against loading and scoring a JSONL file."""
+    assessment = CompanyAssessment(ResumeParser().data)
+    workdir = tempfile.mkdtemp()
+    jsonl_path = os.path.join(workdir, 'postings.jsonl')
+    catalog_path = os.path.join(workdir, 'postings.catalog')
+    with open(jsonl_path, 'w', encoding='utf-8') as f:
+        for info in synthetic_postings(postings):
+            f.write(json.dumps(info) + '\n')
+    
+    def from_jsonl():
+        with open(jsonl_path, encoding='utf-8') as f:
+            return assessment.score_many([json.loads(line) for line in f])
+    
+    def from_catalog():
+        with ColumnarCatalog.open(catalog_path) as catalog:
+            return assessment.score_many(catalog)
+    
+    try:
+        with open(jsonl_path, encoding='utf-8') as f:
+            build_seconds = _time(lambda: ColumnarCatalog.write(catalog_path, map(json.loads, f)), repeat=1)
+        baseline = _time(from_jsonl)
+        seconds = _time(from_catalog)
+    finally:
+        shutil.rmtree(workdir)
+    return {
+        'name': f'score a posting file ({postings} postings, JSONL vs columnar catalog)',
+        'baseline_seconds': baseline,
+        'seconds': seconds,
+        'build_seconds': build_seconds,
+    }
+
+
+def benchmark_assessment_profile(postings=20000):
+    """Compare experience and culture scoring from the resume profile against the original per-job loops."""
+    resume_data = ResumeParser().data
+    assessment = CompanyAssessment(resume_data, cache_size=0)
+    keys = [(info['industry'], info['position'], info['company_size'], info['work_culture'])
+            for info in synthetic_postings(postings)]
+    
+    def legacy():
+        for industry, position, company_size, work_culture in keys:
+            reference_experience_relevance(resume_data, industry, position)
+            reference_culture_fit(resume_data, company_size, work_culture)
+    
+    def profiled():
+        for industry, position, company_size, work_culture in keys:
+            assessment._assess_experience_relevance(industry, position)
+            assessment._assess_culture_fit(company_size, work_culture)
+    
+    return {
+        'name': f'experience + culture fit ({postings} postings)',
+        'baseline_seconds': _time(legacy),
+        'seconds': _time(profiled),
+    }
+
+
+BENCHMARKS = [
+    benchmark_skills_match,
+    benchmark_score_many,
+    benchmark_parse_large_resume,
+    benchmark_async_send,
+    benchmark_build_message,
+    benchmark_cover_letters,
+    benchmark_reposted_postings,
+    benchmark_top_k,
+    benchmark_posting_index,
+    benchmark_parse_resume,
+    benchmark_calculate_success_score,
+    benchmark_generate,
+    benchmark_send_resume,
+    benchmark_posting_memory,
+    benchmark_columnar_catalog,
+    benchmark_assessment_profile,
+]
+
+
+def benchmark_id(benchmark):
+    """Stable key for a benchmark in saved results."""
+    return benchmark.__name__[len('benchmark_'):]
+
+
+def run_benchmarks(benchmarks):
+    """Run benchmarks, print each result and return them keyed by benchmark_id."""
+    results = {}
+    for benchmark in benchmarks:
+        result = benchmark()
+        results[benchmark_id(benchmark)] = result
+        print(f"\n{result['name']}")
+        if 'baseline_seconds' in result:
+            print(f"  baseline: {result['baseline_seconds'] * 1000:10.2f} ms")
+        print(f"  current:  {result['seconds'] * 1000:10.2f} ms")
+        if 'baseline_seconds' in result:
+            print(f"  speedup:  {result['baseline_seconds'] / result['seconds']:10.1f}x")
+        if 'build_seconds' in result:
+            print(f"  build:        {result['build_seconds'] * 1000:8.2f} ms")
+        if 'peak_bytes' in result:
+            print(f"  peak allocation: {result['baseline_peak_bytes'] / 1024:.1f} KB -> {result['peak_bytes'] / 1024:.1f} KB")
+    return results
+
+
+def find_regressions(previous, results, threshold):
+    """
+    Compare results against a saved run.
+    
+    Args:
+        previous: Saved results, as written by --json
+        results: Results of this run, keyed by benchmark_id
+        threshold: Allowed slowdown as a fraction (0.2 = 20% slower)
+    
+    Returns:
+        List of (benchmark_id, previous_seconds, seconds) for each regression
+    """
+    regressions = []
+    for key, result in results.items():
+        saved = previous['results'].get(key)
+        if saved and result['seconds'] > saved['seconds'] * (1 + threshold):
+            regressions.append((key, saved['seconds'], result['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    """Run the benchmarks, optionally saving results or checking them against a saved run."""
+    parser = argparse.ArgumentParser(description="Resume Mailer benchmarks")
+    parser.add_argument('-k', dest='select', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--json', metavar='PATH', help='Save the results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='Fail if slower than the results saved in PATH')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed slowdown for --compare, as a fraction (default: 0.2)')
+    args = parser.parse_args(argv)
+    
+    benchmarks = [b for b in BENCHMARKS if not args.select or args.select in benchmark_id(b)]
+    
+    print("=" * 60)
+    print("Resume Mailer - Benchmarks")
+    print("=" * 60)
+    
+    results = run_benchmarks(benchmarks)
+    print()
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results,
+            }, f, indent=2)
+        print(f"Saved results to {args.json}")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        regressions = find_regressions(previous, results, args.threshold)
+        for key, saved, seconds in regressions:
+            print(f"✗ {key}: {saved * 1000:.2f} ms -> {seconds * 1000:.2f} ms "
+                  f"({seconds / saved - 1:+.0%}, threshold {args.threshold:.0%})")
+        if regressions:
+            return 1
+        print(f"✓ No regressions beyond {args.threshold:.0%} against {args.compare}")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,69 +3,155 @@
 Resume Mailer - A system to assess company fit and send customized resumes with cover letters.
 """
 
-import argparse
+# Only modules the scoring path needs are imported here. Email, asyncio,
+# process pools, SQLite, archives, argparse and datetime are imported where
+# they are used, so a `score` run started from a shell loop does not pay for them.
+import csv
+import functools
+import hashlib
+import heapq
+import io
 import json
+import mmap
 import os
+import pickle
 import re
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from datetime import datetime
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from itertools import islice
+from string import Formatter
+
+
+# Precompiled resume patterns, shared by every ResumeParser.
+_NAME_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_EMAIL_RE = re.compile(r'\[([^\]]+@[^\]]+)\]')
+_PHONE_RE = re.compile(r'\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+_LINKEDIN_RE = re.compile(r'linkedin\.com/in/([^\s)]+)', re.IGNORECASE)
+_GITHUB_RE = re.compile(r'github\.com/([^\s)]+)', re.IGNORECASE)
+_LANGUAGES_RE = re.compile(r'-\s*\*\*Languages:\*\*\s+([^\n]+)')
+_FRAMEWORKS_RE = re.compile(r'-\s*\*\*Frameworks[^:]*:\*\*\s+([^\n]+)')
+_CLOUD_RE = re.compile(r'-\s*\*\*Cloud[^:]*:\*\*\s+([^\n]+)')
+_SPECIALIZATIONS_RE = re.compile(r'-\s*\*\*Specializations:\*\*\s+([^\n]+)')
+_JOB_RE = re.compile(r'\*\*([^\*]+)\*\*\s*\n\s*\*([^\*]+)\*\s*\|\s*([^\n]+)')
+_DEGREE_RE = re.compile(r'\*\*([^\*]+)\*\*\s*\n\s*([^\n]+)')
+_PROJECT_RE = re.compile(r'\*\*([^\*]+)\*\*')
+_LEADING_BLANK_RE = re.compile(r'\s*')
+
+
+def tokenize_sections(content):
+    """
+    Split resume markdown into its sections in a single pass.
+    
+    Every line starting with '##' opens a section, which runs up to the next such
+    line. Leading blank lines of a section body are skipped, matching the
+    original per-section pattern.
+    
+    Returns:
+        Dict mapping each heading title to its body text (the first occurrence
+        wins when a title repeats)
+    """
+    sections = {}
+    find = content.find
+    length = len(content)
+    
+    heading_start = 0 if content.startswith('##') else find('\n##')
+    if heading_start > 0:
+        heading_start += 1
+    while heading_start != -1:
+        heading_end = find('\n', heading_start)
+        if heading_end == -1:
+            heading_end = length
+        next_heading = find('\n##', heading_end)
+        body_end = next_heading if next_heading != -1 else length
+        
+        body_start = min(heading_end + 1, body_end)
+        blank_end = _LEADING_BLANK_RE.match(content, body_start, body_end).end()
+        last_newline = content.rfind('\n', body_start, blank_end)
+        if last_newline != -1:
+            body_start = last_newline + 1
+        
+        title = content[heading_start:heading_end].lstrip('#').strip()
+        if title not in sections:
+            sections[title] = content[body_start:body_end]
+        heading_start = next_heading + 1 if next_heading != -1 else -1
+    return sections
 
 
 class ResumeParser:
     """Parse resume.md to extract key information."""
     
-    def __init__(self, resume_path="resume.md"):
+    # Field name -> (extractor method, '## ' section it reads, or None for the whole document)
+    FIELDS = {
+        'name': ('_extract_name', None),
+        'contact': ('_extract_contact', None),
+        'skills': ('_extract_skills', 'Technical Skills'),
+        'experience': ('_extract_experience', 'Experience'),
+        'education': ('_extract_education', 'Education'),
+        'projects': ('_extract_projects', 'Projects'),
+        'summary': ('_extract_summary', 'Professional Summary'),
+    }
+    
+    def __init__(self, resume_path="resume.md", cache=True):
+        """
+        Args:
+            resume_path: Path to the resume markdown file
+            cache: True to use the shared in-memory ParseCache, False to always
+                parse from scratch, or a ParseCache instance
+        """
         self.resume_path = resume_path
-        self.data = self._parse_resume()
+        self.content_hash = None
+        if cache is True:
+            cache = DEFAULT_PARSE_CACHE
+        self.data = cache.load(self) if cache else self._parse_resume()
     
     def _parse_resume(self):
         """Extract structured data from resume markdown."""
         with open(self.resume_path, 'r', encoding='utf-8') as f:
             content = f.read()
-        
-        data = {
-            'name': self._extract_name(content),
-            'contact': self._extract_contact(content),
-            'skills': self._extract_skills(content),
-            'experience': self._extract_experience(content),
-            'education': self._extract_education(content),
-            'projects': self._extract_projects(content),
-            'summary': self._extract_summary(content)
-        }
+        self.content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return self._parse_content(content, tokenize_sections(content))
+    
+    def _parse_content(self, content, sections):
+        """Run every extractor over the document or its tokenized sections."""
+        data = {}
+        for field, (method, title) in self.FIELDS.items():
+            text = content if title is None else sections.get(title, '')
+            data[field] = getattr(self, method)(text)
         return data
     
     def _extract_name(self, content):
         """Extract name from the first heading."""
-        match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        match = _NAME_RE.search(content)
         return match.group(1).strip() if match else "Candidate"
     
     def _extract_contact(self, content):
         """Extract contact information."""
         contact = {}
-        email_match = re.search(r'\[([^\]]+@[^\]]+)\]', content)
+        email_match = _EMAIL_RE.search(content)
         if email_match:
             contact['email'] = email_match.group(1)
         
-        phone_match = re.search(r'\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}', content)
+        phone_match = _PHONE_RE.search(content)
         if phone_match:
             contact['phone'] = phone_match.group(0)
         
-        linkedin_match = re.search(r'linkedin\.com/in/([^\s)]+)', content, re.IGNORECASE)
+        linkedin_match = _LINKEDIN_RE.search(content)
         if linkedin_match:
             contact['linkedin'] = linkedin_match.group(1)
         
-        github_match = re.search(r'github\.com/([^\s)]+)', content, re.IGNORECASE)
+        github_match = _GITHUB_RE.search(content)
         if github_match:
             contact['github'] = github_match.group(1)
         
         return contact
     
-    def _extract_skills(self, content):
-        """Extract technical skills."""
+    def _extract_skills(self, section_text):
+        """Extract technical skills from the Technical Skills section."""
         skills = {
             'languages': [],
             'frameworks': [],
@@ -73,86 +159,703 @@ class ResumeParser:
             'specializations': []
         }
         
-        skills_section = re.search(r'## Technical Skills\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if skills_section:
-            section_text = skills_section.group(1)
-            
-            if 'Languages:' in section_text:
-                lang_match = re.search(r'-\s*\*\*Languages:\*\*\s+([^\n]+)', section_text)
-                if lang_match:
-                    skills['languages'] = [s.strip() for s in lang_match.group(1).split(',')]
-            
-            if 'Frameworks' in section_text:
-                fw_match = re.search(r'-\s*\*\*Frameworks[^:]*:\*\*\s+([^\n]+)', section_text)
-                if fw_match:
-                    skills['frameworks'] = [s.strip() for s in fw_match.group(1).split(',')]
-            
-            if 'Cloud' in section_text:
-                cloud_match = re.search(r'-\s*\*\*Cloud[^:]*:\*\*\s+([^\n]+)', section_text)
-                if cloud_match:
-                    skills['cloud'] = [s.strip() for s in cloud_match.group(1).split(',')]
-            
-            if 'Specializations:' in section_text:
-                spec_match = re.search(r'-\s*\*\*Specializations:\*\*\s+([^\n]+)', section_text)
-                if spec_match:
-                    skills['specializations'] = [s.strip() for s in spec_match.group(1).split(',')]
+        if 'Languages:' in section_text:
+            lang_match = _LANGUAGES_RE.search(section_text)
+            if lang_match:
+                skills['languages'] = [s.strip() for s in lang_match.group(1).split(',')]
+        
+        if 'Frameworks' in section_text:
+            fw_match = _FRAMEWORKS_RE.search(section_text)
+            if fw_match:
+                skills['frameworks'] = [s.strip() for s in fw_match.group(1).split(',')]
+        
+        if 'Cloud' in section_text:
+            cloud_match = _CLOUD_RE.search(section_text)
+            if cloud_match:
+                skills['cloud'] = [s.strip() for s in cloud_match.group(1).split(',')]
+        
+        if 'Specializations:' in section_text:
+            spec_match = _SPECIALIZATIONS_RE.search(section_text)
+            if spec_match:
+                skills['specializations'] = [s.strip() for s in spec_match.group(1).split(',')]
         
         return skills
     
-    def _extract_experience(self, content):
-        """Extract work experience."""
+    def _extract_experience(self, section_text):
+        """Extract work experience from the Experience section."""
         experience = []
-        exp_section = re.search(r'## Experience\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if exp_section:
-            section_text = exp_section.group(1)
-            # Extract job titles and companies
-            jobs = re.findall(r'\*\*([^\*]+)\*\*\s*\n\s*\*([^\*]+)\*\s*\|\s*([^\n]+)', section_text)
-            for title, company, dates in jobs:
-                experience.append({
-                    'title': title.strip(),
-                    'company': company.strip(),
-                    'dates': dates.strip()
-                })
+        # Extract job titles and companies
+        for title, company, dates in _JOB_RE.findall(section_text):
+            experience.append({
+                'title': title.strip(),
+                'company': company.strip(),
+                'dates': dates.strip()
+            })
         return experience
     
-    def _extract_education(self, content):
-        """Extract education information."""
+    def _extract_education(self, section_text):
+        """Extract education information from the Education section."""
         education = []
-        edu_section = re.search(r'## Education\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if edu_section:
-            section_text = edu_section.group(1)
-            degrees = re.findall(r'\*\*([^\*]+)\*\*\s*\n\s*([^\n]+)', section_text)
-            for degree, details in degrees:
-                education.append({
-                    'degree': degree.strip(),
-                    'details': details.strip()
-                })
+        for degree, details in _DEGREE_RE.findall(section_text):
+            education.append({
+                'degree': degree.strip(),
+                'details': details.strip()
+            })
         return education
     
-    def _extract_projects(self, content):
-        """Extract projects."""
-        projects = []
-        proj_section = re.search(r'## Projects\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if proj_section:
-            section_text = proj_section.group(1)
-            proj_list = re.findall(r'\*\*([^\*]+)\*\*', section_text)
-            projects = [p.strip() for p in proj_list]
-        return projects
-    
-    def _extract_summary(self, content):
-        """Extract professional summary."""
-        summary_section = re.search(r'## Professional Summary\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if summary_section:
-            return summary_section.group(1).strip()
-        return ""
+    def _extract_projects(self, section_text):
+        """Extract project names from the Projects section."""
+        return [p.strip() for p in _PROJECT_RE.findall(section_text)]
+    
+    def _extract_summary(self, section_text):
+        """Extract the professional summary."""
+        return section_text.strip()
+
+
+class ParseCache:
+    """
+    Cache of parsed resumes, keyed on file path, mtime and content hash.
+    
+    Unchanged files are served from memory without being read. A file whose
+    mtime changed but whose content did not is only hashed. When the content
+    did change, only the fields whose '## ' section changed are re-extracted
+    (plus name and contact, which are searched for across the whole document).
+    With sidecar=True the cache entry is also written next to the resume as
+    '<resume>.parsecache' (JSON), so new processes start warm.
+    """
+    
+    VERSION = 2
+    
+    def __init__(self, sidecar=False):
+        self.sidecar = sidecar
+        self._entries = {}
+    
+    def clear(self):
+        """Drop all in-memory entries."""
+        self._entries.clear()
+    
+    def sidecar_path(self, resume_path):
+        """Return the sidecar file path for a resume."""
+        return resume_path + '.parsecache'
+    
+    def load(self, parser):
+        """
+        Return parsed data for parser.resume_path, parsing only what changed.
+        
+        Args:
+            parser: ResumeParser whose file should be loaded; its content_hash is set
+        
+        Returns:
+            A fresh copy of the parsed resume data
+        """
+        path = os.path.abspath(parser.resume_path)
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is None and self.sidecar:
+            entry = self._read_sidecar(path)
+        
+        if entry is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            if path not in self._entries:
+                self._remember(path, entry)
+            parser.content_hash = entry['sha256']
+            return pickle.loads(entry['blob'])
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        
+        if entry is None or entry['sha256'] != content_hash:
+            entry = self._extract(parser, content, content_hash, entry)
+        entry['mtime_ns'] = stat.st_mtime_ns
+        entry['size'] = stat.st_size
+        self._remember(path, entry)
+        if self.sidecar:
+            self._write_sidecar(path, entry)
+        
+        parser.content_hash = content_hash
+        return pickle.loads(entry['blob'])
+    
+    def _remember(self, path, entry):
+        """Store an entry in memory along with a pickled copy of its data."""
+        entry['blob'] = pickle.dumps(entry['data'], pickle.HIGHEST_PROTOCOL)
+        self._entries[path] = entry
+    
+    def _extract(self, parser, content, content_hash, previous):
+        """Extract every field whose inputs changed since the previous entry."""
+        sections = tokenize_sections(content)
+        section_hashes = {title: hashlib.sha256(body.encode('utf-8')).hexdigest()
+                          for title, body in sections.items()}
+        
+        if previous is None:
+            data = parser._parse_content(content, sections)
+        else:
+            data = {}
+            old_hashes = previous['sections']
+            for field, (method, title) in ResumeParser.FIELDS.items():
+                # Header fields search the whole document, so any change can affect them.
+                if title is None:
+                    data[field] = getattr(parser, method)(content)
+                elif old_hashes.get(title) != section_hashes.get(title):
+                    data[field] = getattr(parser, method)(sections.get(title, ''))
+                else:
+                    data[field] = previous['data'][field]
+        
+        return {
+            'version': self.VERSION,
+            'sha256': content_hash,
+            'sections': section_hashes,
+            'data': data,
+        }
+    
+    def _read_sidecar(self, path):
+        """Load a sidecar entry, or None if it is missing, stale or unreadable."""
+        try:
+            with open(self.sidecar_path(path), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('version') != self.VERSION:
+            return None
+        return entry
+    
+    def _write_sidecar(self, path, entry):
+        """Write a sidecar entry atomically; failures only cost a warm start."""
+        sidecar = self.sidecar_path(path)
+        temp_path = f"{sidecar}.{os.getpid()}.tmp"
+        record = {key: value for key, value in entry.items() if key != 'blob'}
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(record, f)
+            os.replace(temp_path, sidecar)
+        except OSError:
+            pass
+
+
+DEFAULT_PARSE_CACHE = ParseCache()
+
+
+class SkillIndex:
+    """
+    Precompiled matcher for a resume's skills.
+    
+    A required skill matches when it is a substring of a candidate skill, or a
+    candidate skill is a substring of it (both lowercased). The first case is a
+    dict lookup over every substring of the candidate skills; the second is a
+    single Aho-Corasick scan of the required skill. Answers are memoized per
+    required skill, since postings repeat the same skills over and over.
+    """
+    
+    MAX_MEMO_SIZE = 65536
+    
+    def __init__(self, candidate_skills):
+        """
+        Args:
+            candidate_skills: List of candidate skill strings, in resume order
+        """
+        self.candidates = [s.lower() for s in candidate_skills]
+        self._substrings = self._build_substrings(self.candidates)
+        self._goto, self._fail, self._output = self._build_automaton(self.candidates)
+        self._memo = {}
+    
+    @classmethod
+    def from_resume_data(cls, resume_data):
+        """Build the index from ResumeParser.data."""
+        candidate_skills = []
+        for skill_category in resume_data['skills'].values():
+            candidate_skills.extend(skill_category)
+        return cls(candidate_skills)
+    
+    @staticmethod
+    def _build_substrings(candidates):
+        """Map every substring of every candidate to the first candidate containing it."""
+        substrings = {}
+        for index, candidate in enumerate(candidates):
+            substrings.setdefault('', index)
+            length = len(candidate)
+            for start in range(length):
+                for end in range(start + 1, length + 1):
+                    substrings.setdefault(candidate[start:end], index)
+        return substrings
+    
+    @staticmethod
+    def _build_automaton(candidates):
+        """Build an Aho-Corasick automaton over the candidates."""
+        no_match = len(candidates)
+        goto = [{}]
+        output = [no_match]
+        
+        for index, candidate in enumerate(candidates):
+            node = 0
+            for char in candidate:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    output.append(no_match)
+                node = next_node
+            output[node] = min(output[node], index)
+        
+        # Breadth-first pass to set failure links; each node's output becomes the
+        # first candidate ending at it or at any of its proper suffixes.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                output[child] = min(output[child], output[fail[child]])
+                queue.append(child)
+        
+        return goto, fail, output
+    
+    def _first_match(self, skill):
+        """Return the index of the first candidate matching a lowercased skill, or None."""
+        best = self._substrings.get(skill, len(self.candidates))
+        
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        best = min(best, output[0])
+        for char in skill:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] < best:
+                best = output[state]
+        
+        return best if best < len(self.candidates) else None
+    
+    def find(self, required_skill):
+        """
+        Find the candidate skill that a required skill matches.
+        
+        Returns:
+            The first matching candidate skill (lowercased), or None
+        """
+        skill = required_skill.lower()
+        try:
+            index = self._memo[skill]
+        except KeyError:
+            if len(self._memo) >= self.MAX_MEMO_SIZE:
+                self._memo.clear()
+            index = self._memo[skill] = self._first_match(skill)
+        return None if index is None else self.candidates[index]
+    
+    def match(self, required_skills):
+        """
+        Match required skills against the resume.
+        
+        Returns:
+            List of (required_skill, candidate_skill) pairs for the skills that matched
+        """
+        pairs = []
+        for required_skill in required_skills:
+            candidate = self.find(required_skill)
+            if candidate is not None:
+                pairs.append((required_skill, candidate))
+        return pairs
+    
+    def count_matches(self, required_skills):
+        """Count how many required skills match the resume."""
+        find = self.find
+        return sum(1 for required_skill in required_skills if find(required_skill) is not None)
+
+
+# Scoring rules used when no rules file is given. A rules file (JSON, YAML or
+# TOML) may set any of these keys; the ones it leaves out keep these values.
+DEFAULT_SCORING_RULES = {
+    # Maximum points for each criterion; together they make up the total score.
+    'weights': {'skills_match': 40, 'experience': 30, 'culture_fit': 15, 'growth_potential': 15},
+    # Job title/company keywords that count a job as experience in an industry.
+    'industry_keywords': {
+        'tech': ['software', 'developer', 'engineer', 'devops'],
+        'ecommerce': ['ecommerce', 'e-commerce', 'shopify', 'retail', 'online'],
+        'finance': ['financial', 'banking', 'fintech'],
+        'automotive': ['automotive', 'cars', 'vehicle'],
+    },
+    # Job title/company keywords that count toward senior positions.
+    'seniority_terms': ['lead', 'senior', 'engineer'],
+    # Job title/company keywords that, with a recent date, suggest startup experience.
+    'startup_keywords': ['mobile', 'app', 'ios', 'android', 'tech', 'software'],
+    # Recommendation for a total score: the first entry whose min_score it reaches.
+    'recommendations': [
+        {'min_score': 85, 'label': 'Excellent Fit - Highly Recommended'},
+        {'min_score': 70, 'label': 'Strong Fit - Recommended'},
+        {'min_score': 55, 'label': 'Good Fit - Worth Pursuing'},
+        {'min_score': 40, 'label': 'Moderate Fit - Consider Carefully'},
+        {'min_score': 0, 'label': 'Low Fit - May Not Be Ideal'},
+    ],
+}
+
+
+class ScoringRules:
+    """
+    Scoring rules compiled into lookup tables and matchers.
+    
+    Each criterion is scored on its built-in scale (COMPONENT_SCALES) and
+    mapped onto its configured weight through a precomputed table, so the
+    default weights cost one list lookup. Keyword lists become single
+    precompiled regular expressions, and the recommendation thresholds a table
+    indexed by total score.
+    
+    Rules loaded with from_file() can be reloaded while a long run is going:
+    refresh() checks the file's modification time (at most every
+    check_interval seconds) and recompiles it when it changed, bumping
+    version. CompanyAssessment calls refresh() as it scores.
+    """
+    
+    # Points each criterion is scored out of before weighting.
+    COMPONENT_SCALES = {'skills_match': 40, 'experience': 30, 'culture_fit': 15, 'growth_potential': 15}
+    # Strengths are reported at these points on the built-in scales.
+    STRENGTH_THRESHOLDS = {'skills_match': 30, 'experience': 20, 'culture_fit': 12, 'growth_potential': 12}
+    
+    def __init__(self, rules=None, path=None, check_interval=1.0):
+        """
+        Args:
+            rules: Dict of rules overriding DEFAULT_SCORING_RULES key by key (None for the defaults)
+            path: Rules file that refresh() watches, if the rules came from one
+            check_interval: Minimum seconds between checks of the file's modification time
+        
+        Raises:
+            ValueError: If the rules are malformed
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self.version = 0
+        self._next_check = 0.0
+        self._stamp = self._file_stamp(path) if path else None
+        self._compile(rules or {})
+    
+    @classmethod
+    def from_file(cls, path, check_interval=1.0):
+        """
+        Load rules from a .json, .yaml/.yml or .toml file.
+        
+        YAML needs the optional 'PyYAML' package, and TOML on Python before 3.11
+        the 'tomli' package.
+        
+        Raises:
+            ValueError: If the file cannot be parsed or the rules are malformed
+        """
+        return cls(cls._read(path), path, check_interval)
+    
+    @staticmethod
+    def _read(path):
+        """Parse a rules file by its extension."""
+        ext = os.path.splitext(path)[1].lower()
+        if ext in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(
+                    f"{path} is a YAML rules file; install the 'PyYAML' package to read it "
+                    "(pip install pyyaml), or use JSON or TOML"
+                ) from None
+            with open(path, 'r', encoding='utf-8') as f:
+                try:
+                    return yaml.safe_load(f) or {}
+                except yaml.YAMLError as e:
+                    raise ValueError(f"{path}: {e}") from None
+        if ext == '.toml':
+            try:
+                import tomllib
+            except ImportError:
+                import tomli as tomllib
+            with open(path, 'rb') as f:
+                return tomllib.load(f)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _file_stamp(path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    @staticmethod
+    def _matcher(keywords):
+        """Compile keywords into one regex that finds any of them as a substring."""
+        if not keywords:
+            return re.compile(r'(?!)')
+        return re.compile('|'.join(map(re.escape, sorted({keyword.lower() for keyword in keywords}))))
+    
+    def _compile(self, rules):
+        """Validate rules merged over the defaults and build the lookup tables."""
+        if not isinstance(rules, dict):
+            raise ValueError("Scoring rules must be a mapping")
+        unknown = set(rules) - set(DEFAULT_SCORING_RULES)
+        if unknown:
+            raise ValueError(f"Unknown scoring rules: {', '.join(sorted(unknown))}")
+        merged = dict(DEFAULT_SCORING_RULES, **rules)
+        
+        if not isinstance(merged['weights'], dict):
+            raise ValueError("weights must map criteria to points")
+        weights = dict(DEFAULT_SCORING_RULES['weights'], **merged['weights'])
+        if set(weights) != set(self.COMPONENT_SCALES):
+            raise ValueError(f"Unknown weights: {', '.join(sorted(set(weights) - set(self.COMPONENT_SCALES)))}")
+        for component, weight in weights.items():
+            if not isinstance(weight, int) or isinstance(weight, bool) or weight < 0:
+                raise ValueError(f"Weight for {component} must be a non-negative integer, got {weight!r}")
+        
+        for key in ('seniority_terms', 'startup_keywords'):
+            if not self._is_keyword_list(merged[key]):
+                raise ValueError(f"{key} must be a list of keywords")
+        industry_keywords = merged['industry_keywords']
+        if not isinstance(industry_keywords, dict) or \
+                not all(isinstance(industry, str) and self._is_keyword_list(keywords)
+                        for industry, keywords in industry_keywords.items()):
+            raise ValueError("industry_keywords must map each industry to a list of keywords")
+        
+        if not isinstance(merged['recommendations'], list):
+            raise ValueError("recommendations must be a list of min_score/label entries")
+        thresholds = []
+        for entry in merged['recommendations']:
+            if not isinstance(entry, dict) or not isinstance(entry.get('min_score'), int) or \
+                    not isinstance(entry.get('label'), str):
+                raise ValueError(f"Each recommendation needs an integer min_score and a label, got {entry!r}")
+            thresholds.append((entry['min_score'], entry['label']))
+        thresholds.sort(key=lambda threshold: threshold[0], reverse=True)
+        if not thresholds or thresholds[-1][0] > 0:
+            raise ValueError("recommendations must include an entry with min_score 0 or lower")
+        
+        # Build every table before assigning any, so a failure leaves the
+        # previous rules intact
+        max_score = sum(weights.values())
+        scales = {
+            component: [round(points * weights[component] / scale) for points in range(scale + 1)]
+            for component, scale in self.COMPONENT_SCALES.items()
+        }
+        strength_thresholds = {
+            component: -(-points * weights[component] // self.COMPONENT_SCALES[component])
+            for component, points in self.STRENGTH_THRESHOLDS.items()
+        }
+        industry_matchers = {
+            industry.lower(): self._matcher(keywords) for industry, keywords in industry_keywords.items()
+        }
+        seniority_matcher = self._matcher(merged['seniority_terms'])
+        startup_matcher = self._matcher(merged['startup_keywords'])
+        recommendations = [self._label(thresholds, score) for score in range(max_score + 1)]
+        
+        self.rules = merged
+        self.weights = weights
+        self.max_score = max_score
+        self.scales = scales
+        self.strength_thresholds = strength_thresholds
+        self.industry_matchers = industry_matchers
+        self.seniority_matcher = seniority_matcher
+        self.startup_matcher = startup_matcher
+        self._thresholds = thresholds
+        self.recommendations = recommendations
+    
+    @staticmethod
+    def _is_keyword_list(keywords):
+        return isinstance(keywords, list) and all(isinstance(keyword, str) for keyword in keywords)
+    
+    @staticmethod
+    def _label(thresholds, score):
+        for min_score, label in thresholds:
+            if score >= min_score:
+                return label
+        return thresholds[-1][1]
+    
+    def _recommend(self, score):
+        return self._label(self._thresholds, score)
+    
+    def recommendation(self, score):
+        """Return the recommendation label for a total score."""
+        if 0 <= score <= self.max_score:
+            return self.recommendations[score]
+        return self._recommend(score)
+    
+    def refresh(self):
+        """
+        Recompile the rules if their file changed since it was last read.
+        
+        Checks at most once per check_interval seconds. A file that fails to
+        parse or validate is reported with a warning and the previous rules
+        stay in force until the file changes again.
+        
+        Returns:
+            True if new rules were loaded
+        """
+        if self.path is None:
+            return False
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+        try:
+            stamp = self._file_stamp(self.path)
+        except OSError:
+            return False
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        
+        try:
+            self._compile(self._read(self.path))
+        except (ValueError, OSError) as e:
+            import warnings
+            warnings.warn(f"Keeping previous scoring rules, {self.path} is invalid: {e}")
+            return False
+        self.version += 1
+        return True
 
 
 class CompanyAssessment:
     """Assess fit between candidate and company."""
     
-    def __init__(self, resume_data):
+    def __init__(self, resume_data, cache_size=4096, rules=None):
+        """
+        Args:
+            resume_data: Parsed resume data from ResumeParser
+            cache_size: Most score breakdowns kept in the LRU cache (0 disables it)
+            rules: ScoringRules, a dict of rules, or the path of a rules file
+                (default: DEFAULT_SCORING_RULES). Rules from a file are reloaded
+                when the file changes.
+        """
+        if not isinstance(rules, ScoringRules):
+            rules = ScoringRules.from_file(rules) if isinstance(rules, str) else ScoringRules(rules)
+        self.rules = rules
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
         self.resume_data = resume_data
     
+    @property
+    def resume_data(self):
+        return self._resume_data
+    
+    @resume_data.setter
+    def resume_data(self, resume_data):
+        self._resume_data = resume_data
+        self.invalidate()
+    
+    def invalidate(self):
+        """
+        Rebuild everything derived from resume_data and drop cached scores.
+        
+        Runs whenever resume_data is assigned or the scoring rules are
+        reloaded; call it after modifying resume_data in place.
+        """
+        self.skill_index = SkillIndex.from_resume_data(self._resume_data)
+        self._rules_version = self.rules.version
+        self.profile = self._build_profile(self._resume_data)
+        self._compile_scores()
+        self._cache.clear()
+    
+    def _check_rules(self):
+        """Pick up reloaded scoring rules, dropping everything computed with the old ones."""
+        if self.rules.refresh() or self.rules.version != self._rules_version:
+            self.invalidate()
+    
+    def _build_profile(self, resume_data):
+        """
+        Compute the resume features that experience and culture scoring use.
+        
+        None of them depend on the posting, so they are computed once per resume
+        and each posting's experience and culture fit become lookups.
+        
+        Returns:
+            Dict with:
+                - jobs: number of jobs
+                - relevant_jobs: {industry: jobs matching the industry's keywords}
+                - senior_jobs: jobs whose title or company mentions a seniority term
+                - has_startup_exp, has_enterprise_exp, has_small_business_exp: bool
+                - has_ci_cd: whether 'CI/CD' appears among the skills
+        """
+        rules = self.rules
+        experience = resume_data['experience']
+        profile = {
+            'jobs': len(experience),
+            'relevant_jobs': dict.fromkeys(rules.industry_matchers, 0),
+            'senior_jobs': 0,
+            'has_startup_exp': False,
+            'has_enterprise_exp': False,
+            'has_small_business_exp': False,
+            'has_ci_cd': 'CI/CD' in str(resume_data['skills']),
+        }
+        
+        for job in experience:
+            company_lower = job['company'].lower()
+            title_lower = job['title'].lower()
+            dates_lower = job['dates'].lower()
+            job_text = title_lower + ' ' + company_lower
+            
+            for industry, matcher in rules.industry_matchers.items():
+                if matcher.search(job_text):
+                    profile['relevant_jobs'][industry] += 1
+            if rules.seniority_matcher.search(job_text):
+                profile['senior_jobs'] += 1
+            
+            # Startup indicators: recent roles, tech/mobile focus, broad multi-disciplinary titles
+            if rules.startup_matcher.search(company_lower) or rules.startup_matcher.search(title_lower):
+                # Recent startups often have current/recent dates
+                if 'present' in dates_lower or any(str(year) in dates_lower for year in [2024, 2025]):
+                    profile['has_startup_exp'] = True
+            
+            # Enterprise indicators: internships often at large companies, well-known brands
+            if 'intern' in title_lower:
+                profile['has_enterprise_exp'] = True
+            
+            # Small business indicators: multi-faceted roles (lead/tech lead), niche industries
+            if 'lead' in title_lower or 'owner' in company_lower:
+                profile['has_small_business_exp'] = True
+        
+        return profile
+    
+    def cache_info(self):
+        """Return the score cache's hits, misses, evictions, current size and bound."""
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'evictions': self._cache_evictions,
+            'size': len(self._cache),
+            'maxsize': self.cache_size,
+        }
+    
+    def _cache_key(self, company_info):
+        """
+        Canonical key of the fields that determine a score breakdown.
+        
+        Skills are lowercased and sorted, the enum-like fields lowercased and the
+        position reduced to its level, so reposts that differ only in order or
+        case share one entry.
+        """
+        return (
+            tuple(sorted(map(str.lower, company_info.get('required_skills') or []))),
+            company_info.get('industry', '').lower(),
+            self._position_level(company_info.get('position', '')),
+            company_info.get('company_size', '').lower(),
+            company_info.get('work_culture', '').lower(),
+        )
+    
+    def _score_breakdown(self, company_info):
+        """Return the four component scores, from the LRU cache when possible."""
+        if self.rules.path is not None:
+            self._check_rules()
+        if not self.cache_size:
+            return self._compute_breakdown(company_info)
+        
+        key = self._cache_key(company_info)
+        scores = self._cache.get(key)
+        if scores is not None:
+            self._cache_hits += 1
+            self._cache.move_to_end(key)
+            return dict(scores)
+        
+        self._cache_misses += 1
+        scores = self._compute_breakdown(company_info)
+        self._cache[key] = scores
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self._cache_evictions += 1
+        return dict(scores)
+    
     def calculate_success_score(self, company_info):
         """
         Calculate a success score based on multiple criteria.
@@ -170,10 +873,23 @@ class CompanyAssessment:
         Returns:
             Dict with score (0-100) and detailed breakdown
         """
+        scores = self._score_breakdown(company_info)
+        total_score = sum(scores.values())
+        
+        return {
+            'total_score': total_score,
+            'breakdown': scores,
+            'recommendation': self._get_recommendation(total_score),
+            'strengths': self._identify_strengths(scores),
+            'areas_to_emphasize': self._identify_emphasis_areas(company_info, scores)
+        }
+    
+    def _compute_breakdown(self, company_info):
+        """Score the four criteria for a posting."""
         scores = {}
         
         # 1. Skills Match (40 points)
-        scores['skills_match'] = self._assess_skills_match(company_info.get('required_skills', []))
+        scores['skills_match'] = self._assess_skills_match(company_info.get('required_skills') or [])
         
         # 2. Experience Relevance (30 points)
         scores['experience'] = self._assess_experience_relevance(
@@ -193,192 +909,1204 @@ class CompanyAssessment:
             company_info.get('company_size', '')
         )
         
-        total_score = sum(scores.values())
+        return scores
+    
+    def iter_scores(self, company_infos):
+        """
+        Score company_info records one at a time, in input order.
+        
+        Args:
+            company_infos: Iterable of company_info dicts
+        
+        Yields:
+            Tuples of (company_info, result from calculate_success_score)
+        """
+        for company_info in company_infos:
+            yield company_info, self.calculate_success_score(company_info)
+    
+    def top_k(self, company_infos, k):
+        """
+        Return the k best-scoring postings without fully scoring the rest.
+        
+        Experience, culture fit and growth potential depend only on a few
+        enum-like fields, so each distinct combination is scored once and looked
+        up afterwards. Adding the skills maximum (full marks, or exactly the
+        no-requirements score with no required skills) gives an upper bound on
+        the total. Once k postings are
+        held in a min-heap, any posting whose bound cannot beat the weakest of
+        them is skipped before its skills are matched.
+        
+        Args:
+            company_infos: Iterable of company_info dicts
+            k: Number of postings to return
+        
+        Returns:
+            List of (index, company_info, result) tuples, best first; ties keep
+            input order, exactly as a stable sort of every result by total_score
+        """
+        self._check_rules()
+        skill_scale = self.rules.scales['skills_match']
+        best_skills, no_skills = skill_scale[-1], skill_scale[35]
+        heap = []
+        experience_table = {}
+        culture_table = {}
+        growth_table = {}
+        
+        for index, company_info in enumerate(company_infos):
+            if k <= 0:
+                break
+            industry = company_info.get('industry', '')
+            position = company_info.get('position', '')
+            company_size = company_info.get('company_size', '')
+            work_culture = company_info.get('work_culture', '')
+            
+            experience_key = (industry.lower(), self._position_level(position))
+            if experience_key not in experience_table:
+                experience_table[experience_key] = self._assess_experience_relevance(industry, position)
+            culture_key = (company_size.lower(), work_culture.lower())
+            if culture_key not in culture_table:
+                culture_table[culture_key] = self._assess_culture_fit(company_size, work_culture)
+            if culture_key[0] not in growth_table:
+                growth_table[culture_key[0]] = self._assess_growth_potential(position, company_size)
+            
+            required_skills = company_info.get('required_skills') or []
+            partial = experience_table[experience_key] + culture_table[culture_key] + growth_table[culture_key[0]]
+            # A later posting only displaces the weakest entry with a strictly higher score.
+            if len(heap) == k and partial + (best_skills if required_skills else no_skills) <= heap[0][0]:
+                continue
+            
+            scores = {
+                'skills_match': self._assess_skills_match(required_skills),
+                'experience': experience_table[experience_key],
+                'culture_fit': culture_table[culture_key],
+                'growth_potential': growth_table[culture_key[0]],
+            }
+            entry = (sum(scores.values()), -index, company_info, scores)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+        
+        ranked = []
+        for total_score, negative_index, company_info, scores in sorted(heap, key=lambda e: e[:2], reverse=True):
+            ranked.append((-negative_index, company_info, {
+                'total_score': total_score,
+                'breakdown': scores,
+                'recommendation': self._get_recommendation(total_score),
+                'strengths': self._identify_strengths(scores),
+                'areas_to_emphasize': self._identify_emphasis_areas(company_info, scores)
+            }))
+        return ranked
+    
+    @classmethod
+    def encode_postings(cls, company_infos):
+        """
+        Encode postings into integer feature columns.
+        
+        Skills are stored CSR-style (an offsets column into a flat column of skill
+        ids) and the enum-like fields as codes into small key tables, so scoring
+        only has to evaluate each distinct skill and key once. The encoding does not
+        depend on the resume, so one encoding can be scored against many resumes.
+        
+        Args:
+            company_infos: Iterable of company_info dicts or Posting records, or a
+                ColumnarCatalog (whose stored columns are returned as they are)
+        
+        Returns:
+            Dict of columns and key tables
+        """
+        if isinstance(company_infos, ColumnarCatalog):
+            return company_infos.encoded()
+        
+        skill_ids = {}
+        experience_keys = {}
+        culture_keys = {}
+        growth_keys = {}
+        
+        skill_offsets = array('l', [0])
+        skill_values = array('l')
+        experience_codes = array('l')
+        culture_codes = array('l')
+        growth_codes = array('l')
+        
+        translations = {}
+        
+        for company_info in company_infos:
+            if type(company_info) is Posting:
+                # Map each vocabulary id to a column id once, rather than decoding every posting's skills.
+                skills = company_info.vocabulary.skills
+                translation = translations.setdefault(company_info.vocabulary, [])
+                for skill in skills[len(translation):]:
+                    translation.append(skill_ids.setdefault(skill.lower(), len(skill_ids)))
+                skill_values.extend(map(translation.__getitem__, getattr(company_info, 'skill_ids', ())))
+            else:
+                for skill in company_info.get('required_skills') or []:
+                    skill = skill.lower()
+                    skill_values.append(skill_ids.setdefault(skill, len(skill_ids)))
+            skill_offsets.append(len(skill_values))
+            
+            position_level = cls._position_level(company_info.get('position', ''))
+            industry = company_info.get('industry', '').lower()
+            company_size = company_info.get('company_size', '').lower()
+            work_culture = company_info.get('work_culture', '').lower()
+            
+            experience_key = (industry, position_level)
+            experience_codes.append(experience_keys.setdefault(experience_key, len(experience_keys)))
+            culture_key = (company_size, work_culture)
+            culture_codes.append(culture_keys.setdefault(culture_key, len(culture_keys)))
+            growth_codes.append(growth_keys.setdefault(company_size, len(growth_keys)))
+        
+        return {
+            'count': len(experience_codes),
+            'skill_offsets': skill_offsets,
+            'skill_values': skill_values,
+            'experience_codes': experience_codes,
+            'culture_codes': culture_codes,
+            'growth_codes': growth_codes,
+            'skills': list(skill_ids),
+            'experience_keys': list(experience_keys),
+            'culture_keys': list(culture_keys),
+            'growth_keys': list(growth_keys),
+        }
+    
+    def score_many(self, company_infos):
+        """
+        Score a batch of postings column-wise.
+        
+        Each distinct skill, (industry, position level), (company size, work culture)
+        and company size is scored once; the per-posting work is then table lookups
+        over the encoded columns. Scores are identical to calculate_success_score.
+        
+        Args:
+            company_infos: Iterable of company_info dicts, a ColumnarCatalog, or the
+                output of encode_postings
+        
+        Returns:
+            Dict of columns, one entry per posting in input order:
+                - skills_match, experience, culture_fit, growth_potential, total_score: array of int
+                - recommendation: list of str
+        """
+        self._check_rules()
+        encoded = company_infos if isinstance(company_infos, dict) else self.encode_postings(company_infos)
+        
+        skill_matched = bytearray(
+            self.skill_index.find(skill) is not None for skill in encoded['skills']
+        )
+        experience_table = [self._assess_experience_relevance(industry, level)
+                            for industry, level in encoded['experience_keys']]
+        culture_table = [self._assess_culture_fit(size, culture)
+                         for size, culture in encoded['culture_keys']]
+        growth_table = [self._assess_growth_potential('', size) for size in encoded['growth_keys']]
+        
+        offsets = encoded['skill_offsets']
+        values = encoded['skill_values']
+        skill_scale = self.rules.scales['skills_match']
+        skills_match = array('l')
+        for start, end in zip(offsets, offsets[1:]):
+            if start == end:
+                skills_match.append(skill_scale[35])
+            else:
+                matched = sum(skill_matched[value] for value in values[start:end])
+                skills_match.append(skill_scale[int(matched / (end - start) * 40)])
+        
+        experience = array('l', [experience_table[code] for code in encoded['experience_codes']])
+        culture_fit = array('l', [culture_table[code] for code in encoded['culture_codes']])
+        growth_potential = array('l', [growth_table[code] for code in encoded['growth_codes']])
+        total_score = array('l', map(sum, zip(skills_match, experience, culture_fit, growth_potential)))
+        
+        recommendations = {}
+        recommendation = []
+        for score in total_score:
+            if score not in recommendations:
+                recommendations[score] = self._get_recommendation(score)
+            recommendation.append(recommendations[score])
         
         return {
+            'skills_match': skills_match,
+            'experience': experience,
+            'culture_fit': culture_fit,
+            'growth_potential': growth_potential,
             'total_score': total_score,
-            'breakdown': scores,
-            'recommendation': self._get_recommendation(total_score),
-            'strengths': self._identify_strengths(scores),
-            'areas_to_emphasize': self._identify_emphasis_areas(company_info, scores)
+            'recommendation': recommendation,
         }
     
     def _assess_skills_match(self, required_skills):
-        """Calculate skills match score (0-40)."""
+        """Calculate skills match score (0-40, scaled to the skills_match weight)."""
+        scale = self._skills_scale
         if not required_skills:
-            return 35  # Default good score if no specific requirements
-        
-        all_candidate_skills = []
-        for skill_category in self.resume_data['skills'].values():
-            all_candidate_skills.extend([s.lower() for s in skill_category])
+            return scale[35]  # Default good score if no specific requirements
         
-        matched_skills = 0
-        for req_skill in required_skills:
-            req_skill_lower = req_skill.lower()
-            if any(req_skill_lower in candidate_skill or candidate_skill in req_skill_lower 
-                   for candidate_skill in all_candidate_skills):
-                matched_skills += 1
+        matched_skills = self.skill_index.count_matches(required_skills)
         
         if len(required_skills) > 0:
             match_percentage = matched_skills / len(required_skills)
-            return int(match_percentage * 40)
-        return 35
+            return scale[int(match_percentage * 40)]
+        return scale[35]
     
-    def _assess_experience_relevance(self, industry, position):
-        """Calculate experience relevance score (0-30)."""
-        score = 0
-        experience = self.resume_data['experience']
-        
-        # Check for relevant industry experience
-        industry_keywords = {
-            'tech': ['software', 'developer', 'engineer', 'devops'],
-            'ecommerce': ['ecommerce', 'e-commerce', 'shopify', 'retail', 'online'],
-            'finance': ['financial', 'banking', 'fintech'],
-            'automotive': ['automotive', 'cars', 'vehicle']
-        }
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _position_level(position):
+        """Classify a position title as 'senior', 'junior' or '' (neither); memoized, as titles repeat."""
+        position_lower = position.lower()
+        if any(term in position_lower for term in ['senior', 'lead', 'principal']):
+            return 'senior'
+        elif 'junior' in position_lower or 'entry' in position_lower:
+            return 'junior'
+        return ''
+    
+    def matched_skills(self, required_skills):
+        """Return (required_skill, candidate_skill) pairs behind the skills match, for auditing."""
+        return self.skill_index.match(required_skills)
+    
+    def _compile_scores(self):
+        """
+        Tabulate experience, culture fit and growth scores for this resume and rules.
         
-        relevant_jobs = 0
-        for job in experience:
-            job_text = (job['title'] + ' ' + job['company']).lower()
-            
-            # Check industry match
-            if industry.lower() in industry_keywords:
-                if any(keyword in job_text for keyword in industry_keywords[industry.lower()]):
-                    relevant_jobs += 1
+        Only a few posting fields matter for each criterion (industry and position
+        level; company size and whether the culture is fast-paced; company size),
+        so every score the resume can get is computed here, already weighted, and
+        the _assess_* methods just look them up.
+        """
+        profile = self.profile
+        scales = self.rules.scales
+        self._skills_scale = scales['skills_match']
+        
+        self._experience_scores = {}
+        for position_level in ('senior', 'junior', ''):
+            # Position level match: senior roles credit senior-sounding jobs, junior roles every job
+            if position_level == 'senior':
+                level_score = 5 * profile['senior_jobs']
+            elif position_level == 'junior':
+                level_score = 8 * profile['jobs']  # Good fit regardless
+            else:
+                level_score = 0
             
-            # Check position level match
-            position_lower = position.lower()
-            if any(term in position_lower for term in ['senior', 'lead', 'principal']):
-                if any(term in job_text for term in ['lead', 'senior', 'engineer']):
-                    score += 5
-            elif 'junior' in position_lower or 'entry' in position_lower:
-                score += 8  # Good fit regardless
-        
-        # Base score on relevant experience
-        if relevant_jobs > 0:
-            score += min(relevant_jobs * 8, 20)
-        else:
-            score += 10  # Still some credit for general experience
+            # Base score on relevant industry experience; 10 is still some credit for general experience
+            self._experience_scores[position_level] = (
+                {industry: scales['experience'][min(level_score + (min(relevant_jobs * 8, 20) if relevant_jobs else 10), 30)]
+                 for industry, relevant_jobs in profile['relevant_jobs'].items()},
+                scales['experience'][min(level_score + 10, 30)],
+            )
         
-        return min(score, 30)
+        # Company size match; 5 is the base score, as experience is somewhat transferable
+        size_scores = {
+            'startup': 8 if profile['has_startup_exp'] else 5,
+            'enterprise': 8 if profile['has_enterprise_exp'] else 5,
+            'medium': 7 if profile['has_small_business_exp'] or profile['has_enterprise_exp'] else 5,
+        }
+        # Work culture: startup experience or automation skills suit fast-paced teams, otherwise a neutral fit
+        self._culture_scores = {}
+        for fast_paced, culture_score in [(True, 7 if profile['has_startup_exp'] or profile['has_ci_cd'] else 5),
+                                          (False, 6)]:
+            self._culture_scores[fast_paced] = (
+                {size: scales['culture_fit'][min(score + culture_score, 15)] for size, score in size_scores.items()},
+                scales['culture_fit'][min(5 + culture_score, 15)],
+            )
+        
+        # Higher growth potential in smaller companies
+        self._growth_scores = (
+            {'startup': scales['growth_potential'][15], 'medium': scales['growth_potential'][15]},
+            scales['growth_potential'][13],
+        )
+    
+    def _assess_experience_relevance(self, industry, position):
+        """Calculate experience relevance score (0-30, scaled to the experience weight)."""
+        scores, default = self._experience_scores[self._position_level(position)]
+        return scores.get(industry.lower(), default)
     
     def _assess_culture_fit(self, company_size, work_culture):
-        """Calculate culture fit score (0-15)."""
-        score = 0
-        experience = self.resume_data['experience']
+        """Calculate culture fit score (0-15, scaled to the culture_fit weight)."""
+        scores, default = self._culture_scores[work_culture.lower() == 'fast-paced']
+        return scores.get(company_size.lower(), default)
+    
+    def _assess_growth_potential(self, position, company_size):
+        """Calculate growth potential score (0-15, scaled to the growth_potential weight)."""
+        scores, default = self._growth_scores
+        return scores.get(company_size.lower(), default)
+    
+    def _get_recommendation(self, score):
+        """Generate recommendation based on score."""
+        recommendations = self.rules.recommendations
+        if 0 <= score < len(recommendations):
+            return recommendations[score]
+        return self.rules.recommendation(score)
+    
+    def _identify_strengths(self, scores):
+        """Identify top strengths based on scores."""
+        strengths = []
+        thresholds = self.rules.strength_thresholds
         
-        # Analyze past company sizes based on general patterns
-        # We use multiple signals to infer company type rather than specific names
-        has_startup_exp = False
-        has_enterprise_exp = False
-        has_small_business_exp = False
+        if scores['skills_match'] >= thresholds['skills_match']:
+            strengths.append("Strong technical skills alignment")
+        if scores['experience'] >= thresholds['experience']:
+            strengths.append("Highly relevant industry experience")
+        if scores['culture_fit'] >= thresholds['culture_fit']:
+            strengths.append("Excellent cultural fit")
+        if scores['growth_potential'] >= thresholds['growth_potential']:
+            strengths.append("Great growth opportunities")
         
-        for job in experience:
-            company_lower = job['company'].lower()
-            title_lower = job['title'].lower()
-            dates_lower = job['dates'].lower()
+        return strengths if strengths else ["Transferable skills and adaptability"]
+    
+    def _identify_emphasis_areas(self, company_info, scores):
+        """Identify what to emphasize in cover letter."""
+        areas = []
+        thresholds = self.rules.strength_thresholds
+        
+        if scores['skills_match'] >= thresholds['skills_match']:
+            areas.append(f"Technical expertise in {', '.join((company_info.get('required_skills') or [])[:3])}")
+        
+        if 'ecommerce' in company_info.get('industry', '').lower():
+            areas.append("E-commerce platform experience and automation skills")
+        
+        if scores['experience'] >= thresholds['experience']:
+            areas.append("Proven track record in similar roles")
+        
+        if 'startup' in company_info.get('company_size', '').lower():
+            areas.append("Ability to work independently and wear multiple hats")
+        
+        return areas if areas else ["Strong problem-solving skills and adaptability"]
+
+
+def _json_default(obj):
+    """json.dumps default: encode Posting and other Mappings as plain dicts."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def canonical_hash(obj):
+    """
+    SHA-256 of an object's canonical JSON form (sorted keys, compact separators).
+    
+    A Posting hashes the same as the company_info dict it was built from.
+    """
+    text = json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def resume_fingerprint(resume_data):
+    """Hash of parsed resume data; changes whenever the scoring inputs change."""
+    return canonical_hash(resume_data)
+
+
+def scoring_fingerprint(resume_hash, rules=None):
+    """
+    Store key for results of one resume scored with one set of rules.
+    
+    Args:
+        resume_hash: resume_fingerprint() of the resume data
+        rules: ScoringRules the results were scored with (None for the defaults)
+    
+    Returns:
+        resume_hash itself under the default rules, so stores written before
+        rules existed stay valid, else a hash of the resume and the rules
+    """
+    if rules is None or rules.rules == DEFAULT_SCORING_RULES:
+        return resume_hash
+    return canonical_hash([resume_hash, rules.rules])
+
+
+def _to_epoch(value):
+    """Convert a datetime (naive means local time) or a number to epoch seconds."""
+    from datetime import datetime
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class ResultStore:
+    """
+    SQLite store of past assessments.
+    
+    Each row records the posting, its breakdown, total score, recommendation
+    and when it was first and last scored. Rows are unique per (company_info
+    hash, resume hash), so re-scoring an unchanged posting against an unchanged
+    resume returns the stored result instead of recomputing it. Company name,
+    total score and creation time are indexed for lookups.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS assessments (
+            id INTEGER PRIMARY KEY,
+            info_hash TEXT NOT NULL,
+            resume_hash TEXT NOT NULL,
+            company_name TEXT NOT NULL,
+            company_info TEXT NOT NULL,
+            breakdown TEXT NOT NULL,
+            total_score INTEGER NOT NULL,
+            recommendation TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            UNIQUE (info_hash, resume_hash)
+        );
+        CREATE INDEX IF NOT EXISTS assessments_company_name ON assessments (company_name);
+        CREATE INDEX IF NOT EXISTS assessments_total_score ON assessments (total_score);
+        CREATE INDEX IF NOT EXISTS assessments_created_at ON assessments (created_at);
+    """
+    
+    def __init__(self, path='assessments.db', batch_size=500):
+        """
+        Args:
+            path: SQLite database file (':memory:' for a throwaway store)
+            batch_size: Postings looked up and committed together by iter_scores
+        """
+        import sqlite3
+        
+        self.path = path
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(self.SCHEMA)
+    
+    def get(self, company_info, resume_hash):
+        """Return the stored result for a posting and resume, or None."""
+        row = self._conn.execute(
+            'SELECT result FROM assessments WHERE info_hash = ? AND resume_hash = ?',
+            (canonical_hash(company_info), resume_hash)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def _lookup(self, info_hashes, resume_hash):
+        """Map each stored info hash in a batch to its result."""
+        placeholders = ','.join('?' * len(info_hashes))
+        rows = self._conn.execute(
+            f'SELECT info_hash, result FROM assessments WHERE resume_hash = ? AND info_hash IN ({placeholders})',
+            [resume_hash] + info_hashes
+        )
+        return {info_hash: json.loads(result) for info_hash, result in rows}
+    
+    def put(self, company_info, resume_hash, result):
+        """Record a result, refreshing updated_at if the pair was already stored."""
+        self._insert(canonical_hash(company_info), company_info, resume_hash, result)
+        self._conn.commit()
+    
+    def _insert(self, info_hash, company_info, resume_hash, result):
+        now = time.time()
+        self._conn.execute(
+            """
+            INSERT INTO assessments (info_hash, resume_hash, company_name, company_info, breakdown,
+                                     total_score, recommendation, result, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (info_hash, resume_hash) DO UPDATE SET
+                result = excluded.result,
+                breakdown = excluded.breakdown,
+                total_score = excluded.total_score,
+                recommendation = excluded.recommendation,
+                updated_at = excluded.updated_at
+            """,
+            (info_hash, resume_hash, company_info.get('company_name', ''),
+             json.dumps(company_info, default=_json_default), json.dumps(result['breakdown']),
+             result['total_score'], result['recommendation'], json.dumps(result), now, now)
+        )
+    
+    def iter_scores(self, assessment, company_infos, resume_hash=None):
+        """
+        Score postings, reusing stored results and storing new ones.
+        
+        Postings are handled in batches: stored results are looked up first and
+        only the misses are passed to the assessment (which may be a
+        ParallelAssessment), then the batch's new results are committed together.
+        
+        Args:
+            assessment: CompanyAssessment or ParallelAssessment
+            company_infos: Iterable of company_info dicts
+            resume_hash: resume_fingerprint() of the assessment's resume data
+                (computed from the assessment when omitted); it is combined with
+                the assessment's scoring rules, checked for reloads every batch
+        
+        Yields:
+            Tuples of (company_info, result), in input order
+        """
+        if resume_hash is None:
+            resume_hash = resume_fingerprint(assessment.resume_data)
+        rules = getattr(assessment, 'rules', None)
+        key = scoring_fingerprint(resume_hash, rules)
+        version = rules.version if rules is not None else None
+        company_infos = iter(company_infos)
+        while True:
+            batch = list(islice(company_infos, self.batch_size))
+            if not batch:
+                return
+            if rules is not None and (rules.refresh() or rules.version != version):
+                key = scoring_fingerprint(resume_hash, rules)
+                version = rules.version
+            hashes = [canonical_hash(company_info) for company_info in batch]
+            stored = self._lookup(hashes, key)
+            results = [stored.get(info_hash) for info_hash in hashes]
+            missing = [company_info for company_info, result in zip(batch, results) if result is None]
+            self.hits += len(batch) - len(missing)
+            self.misses += len(missing)
             
-            # Startup indicators: recent roles, tech/mobile focus, broad multi-disciplinary titles
-            startup_keywords = ['mobile', 'app', 'ios', 'android', 'tech', 'software']
-            if any(keyword in company_lower or keyword in title_lower for keyword in startup_keywords):
-                # Recent startups often have current/recent dates
-                if 'present' in dates_lower or any(str(year) in dates_lower for year in [2024, 2025]):
-                    has_startup_exp = True
+            scored = list(assessment.iter_scores(missing))
+            # Rules reloaded while the batch was scored: its results may mix
+            # both rule sets, so they are returned but not stored
+            keep = rules is None or rules.version == version
+            scored = iter(scored)
+            for i, result in enumerate(results):
+                if result is None:
+                    _, result = next(scored)
+                    if keep:
+                        self._insert(hashes[i], batch[i], key, result)
+                    results[i] = result
+            self._conn.commit()
+            yield from zip(batch, results)
+    
+    def find(self, company_name=None, min_score=None, max_score=None, since=None, until=None, limit=None):
+        """
+        Look up stored assessments.
+        
+        Args:
+            company_name: Exact company name
+            min_score, max_score: Inclusive total_score range
+            since, until: Inclusive range on when the assessment was first stored
+                (datetime or epoch seconds)
+            limit: Maximum number of records
+        
+        Returns:
+            List of dicts with company_info, breakdown, total_score, recommendation,
+            created_at and updated_at (datetimes), best scores first
+        """
+        from datetime import datetime
+        
+        clauses = []
+        params = []
+        if company_name is not None:
+            clauses.append('company_name = ?')
+            params.append(company_name)
+        if min_score is not None:
+            clauses.append('total_score >= ?')
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append('total_score <= ?')
+            params.append(max_score)
+        if since is not None:
+            clauses.append('created_at >= ?')
+            params.append(_to_epoch(since))
+        if until is not None:
+            clauses.append('created_at <= ?')
+            params.append(_to_epoch(until))
+        
+        query = ('SELECT company_info, breakdown, total_score, recommendation, created_at, updated_at '
+                 'FROM assessments')
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        query += ' ORDER BY total_score DESC, id'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        return [{
+            'company_info': json.loads(company_info),
+            'breakdown': json.loads(breakdown),
+            'total_score': total_score,
+            'recommendation': recommendation,
+            'created_at': datetime.fromtimestamp(created_at),
+            'updated_at': datetime.fromtimestamp(updated_at),
+        } for company_info, breakdown, total_score, recommendation, created_at, updated_at
+            in self._conn.execute(query, params)]
+    
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PostingIndex:
+    """
+    Inverted index from required skill to the postings that list it.
+    
+    Posting ids are positions in the catalog the index was built from. Each
+    skill's postings list is a sorted array of uint32 ids. On disk the lists are
+    stored back to back after a JSON header (the skill vocabulary) and an offsets
+    table; an opened index reads them straight out of a memory map, so opening
+    only parses the header and a query touches only the lists it needs.
+    """
+    
+    MAGIC = b'RMPIDX01'
+    VERSION = 1
+    
+    def __init__(self, terms, offsets, postings, count, mapping=None):
+        """
+        Use PostingIndex.build() or PostingIndex.open() rather than calling this directly.
+        
+        Args:
+            terms: Sorted list of normalized skills
+            offsets: Start of each term's postings list in postings, plus the end
+            postings: Flat sequence of posting ids
+            count: Number of postings indexed
+            mapping: mmap backing offsets and postings, if opened from disk
+        """
+        self.terms = terms
+        self.count = count
+        self._term_ids = {term: i for i, term in enumerate(terms)}
+        self._offsets = offsets
+        self._postings = postings
+        self._mmap = mapping
+    
+    @staticmethod
+    def normalize(skill):
+        """Normalize a required skill into an index term."""
+        return skill.strip().lower()
+    
+    @classmethod
+    def build(cls, company_infos):
+        """
+        Index postings by required skill.
+        
+        Args:
+            company_infos: Iterable of company_info dicts; ids follow iteration order
+        
+        Returns:
+            An in-memory PostingIndex
+        """
+        lists = {}
+        count = 0
+        for posting_id, company_info in enumerate(company_infos):
+            for term in set(map(cls.normalize, company_info.get('required_skills') or [])):
+                ids = lists.get(term)
+                if ids is None:
+                    ids = lists[term] = array('I')
+                ids.append(posting_id)
+            count = posting_id + 1
+        
+        terms = sorted(lists)
+        offsets = array('Q', [0])
+        postings = array('I')
+        for term in terms:
+            postings.extend(lists[term])
+            offsets.append(len(postings))
+        return cls(terms, offsets, postings, count)
+    
+    def write(self, path):
+        """Write the index to a file that PostingIndex.open() can map."""
+        header = json.dumps({
+            'version': self.VERSION,
+            'byteorder': sys.byteorder,
+            'count': self.count,
+            'terms': self.terms,
+        }).encode('utf-8')
+        # Pad the header so the offsets table that follows is 8-byte aligned.
+        header += b' ' * (-(len(self.MAGIC) + 4 + len(header)) % 8)
+        
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(len(header).to_bytes(4, 'little'))
+            f.write(header)
+            f.write(array('Q', self._offsets).tobytes())
+            f.write(array('I', self._postings).tobytes())
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def open(cls, path):
+        """
+        Map an index written by write().
+        
+        Raises:
+            ValueError: If the file is not a posting index this version can read
+        """
+        with open(path, 'rb') as f:
+            prefix = f.read(len(cls.MAGIC) + 4)
+            if prefix[:len(cls.MAGIC)] != cls.MAGIC:
+                raise ValueError(f"{path} is not a posting index")
+            header_size = int.from_bytes(prefix[len(cls.MAGIC):], 'little')
+            header = json.loads(f.read(header_size).decode('utf-8'))
+            if header['version'] != cls.VERSION or header['byteorder'] != sys.byteorder:
+                raise ValueError(f"{path}: unsupported posting index version or byte order")
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        start = len(prefix) + header_size
+        offsets_end = start + 8 * (len(header['terms']) + 1)
+        view = memoryview(mapping)
+        offsets = view[start:offsets_end].cast('Q')
+        postings = view[offsets_end:].cast('I')
+        view.release()
+        return cls(header['terms'], offsets, postings, header['count'], mapping)
+    
+    def postings(self, skill):
+        """Return the sorted ids of postings that list a skill (empty if none do)."""
+        term_id = self._term_ids.get(self.normalize(skill))
+        if term_id is None:
+            return array('I')
+        return self._postings[self._offsets[term_id]:self._offsets[term_id + 1]]
+    
+    def union(self, skills):
+        """Return the sorted ids of postings that list any of the skills."""
+        ids = set()
+        for skill in skills:
+            ids.update(self.postings(skill))
+        return array('I', sorted(ids))
+    
+    def intersection(self, skills):
+        """Return the sorted ids of postings that list every one of the skills."""
+        lists = sorted((self.postings(skill) for skill in skills), key=len)
+        if not lists:
+            return array('I')
+        ids = set(lists[0])
+        for postings in lists[1:]:
+            if not ids:
+                break
+            ids.intersection_update(postings)
+        return array('I', sorted(ids))
+    
+    def matching_terms(self, skill_index):
+        """Return the indexed skills that match a resume, by the same rule as scoring."""
+        return [term for term in self.terms if skill_index.find(term) is not None]
+    
+    def candidates(self, resume_data):
+        """
+        Return the sorted ids of postings that mention any of a resume's skills.
+        
+        Matching uses SkillIndex, so these are exactly the postings where at
+        least one required skill matches; the rest have no skills match at all.
+        """
+        return self.union(self.matching_terms(SkillIndex.from_resume_data(resume_data)))
+    
+    def close(self):
+        """Release the memory map of an opened index."""
+        if self._mmap is not None:
+            self._offsets.release()
+            self._postings.release()
+            self._mmap.close()
+            self._mmap = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Per-process assessment used by ParallelAssessment workers, and the parent's
+# rules version it currently scores with.
+_worker_assessment = None
+_worker_rules_version = None
+
+
+def _init_assessment_worker(resume_data, rules=None, rules_version=None):
+    """Build the worker's CompanyAssessment once, when the worker process starts."""
+    global _worker_assessment, _worker_rules_version
+    _worker_assessment = CompanyAssessment(resume_data, rules=rules)
+    _worker_rules_version = rules_version
+
+
+def _score_chunk(chunk, rules_version=None, rules=None):
+    """
+    Score a chunk of company_info dicts inside a worker process.
+    
+    Args:
+        chunk: company_info dicts
+        rules_version: Version of the parent's ScoringRules the chunk was sent under
+        rules: The parent's rules dict, switched to when rules_version differs
+            from the worker's
+    """
+    global _worker_rules_version
+    if rules is not None and rules_version != _worker_rules_version:
+        _worker_assessment.rules = ScoringRules(rules)
+        _worker_assessment.invalidate()
+        _worker_rules_version = rules_version
+    return [_worker_assessment.calculate_success_score(company_info) for company_info in chunk]
+
+
+class ParallelAssessment:
+    """Score postings across a pool of worker processes."""
+    
+    def __init__(self, resume_data, workers=None, chunk_size=256, rules=None):
+        """
+        Args:
+            resume_data: ResumeParser.data, sent to each worker once at startup
+            workers: Number of worker processes (default: os.cpu_count())
+            chunk_size: Number of postings sent to a worker per task
+            rules: Scoring rules for CompanyAssessment. A rules file is
+                reloaded here, not in the workers: each chunk carries the rules
+                current when it was sent, so every result was scored under
+                the rules that self.rules held at that point
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        self.resume_data = resume_data
+        if not isinstance(rules, ScoringRules):
+            rules = ScoringRules.from_file(rules) if isinstance(rules, str) else ScoringRules(rules)
+        self.rules = rules
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_assessment_worker,
+            initargs=(resume_data, rules.rules, rules.version)
+        )
+    
+    def iter_scores(self, company_infos):
+        """
+        Score company_info records in parallel.
+        
+        Only a few chunks per worker are in flight at a time, so memory stays
+        bounded however long the input is.
+        
+        Args:
+            company_infos: Iterable of company_info dicts
+        
+        Yields:
+            Tuples of (company_info, result), in input order
+        """
+        company_infos = iter(company_infos)
+        max_in_flight = self.workers * 2
+        pending = deque()
+        
+        while True:
+            while len(pending) < max_in_flight:
+                chunk = list(islice(company_infos, self.chunk_size))
+                if not chunk:
+                    break
+                # A pickled Posting would carry its whole SkillVocabulary to
+                # the worker, so records are sent as plain dicts
+                payload = [info if type(info) is dict else dict(info) for info in chunk]
+                self.rules.refresh()
+                future = self._executor.submit(_score_chunk, payload, self.rules.version, self.rules.rules)
+                pending.append((chunk, future))
             
-            # Enterprise indicators: internships often at large companies, well-known brands
-            if 'intern' in title_lower:
-                has_enterprise_exp = True
+            if not pending:
+                return
             
-            # Small business indicators: multi-faceted roles (lead/tech lead), niche industries
-            if 'lead' in title_lower or 'owner' in company_lower:
-                has_small_business_exp = True
-        
-        # Score based on company size match
-        if company_size.lower() == 'startup' and has_startup_exp:
-            score += 8
-        elif company_size.lower() == 'enterprise' and has_enterprise_exp:
-            score += 8
-        elif company_size.lower() == 'medium' and (has_small_business_exp or has_enterprise_exp):
-            score += 7
-        else:
-            score += 5  # Base score - experience is somewhat transferable
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
+    
+    def score(self, company_infos):
+        """Score company_info records in parallel and return the results in input order."""
+        return [result for _, result in self.iter_scores(company_infos)]
+    
+    def close(self):
+        """Shut down the worker processes."""
+        self._executor.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Encoded postings and scoring rules shared by score_matrix workers.
+_worker_encoded_postings = None
+_worker_scoring_rules = None
+
+
+def _init_matrix_worker(encoded, rules=None):
+    """
+    Keep the encoded postings in the worker, sent once when the worker process starts.
+    
+    A ColumnarCatalog is passed by path and mapped by each worker instead.
+    """
+    global _worker_encoded_postings, _worker_scoring_rules
+    if isinstance(encoded, str):
+        encoded = ColumnarCatalog.open(encoded).encoded()
+    _worker_encoded_postings = encoded
+    _worker_scoring_rules = rules
+
+
+def _resume_row(resume_path, encoded, rules=None):
+    """Parse one resume and return its total scores against the encoded postings, one byte each."""
+    assessment = CompanyAssessment(ResumeParser(resume_path, cache=False).data, cache_size=0, rules=rules)
+    return array('B', assessment.score_many(encoded)['total_score']).tobytes()
+
+
+def _score_resume_row(resume_path):
+    """Score one resume inside a worker process."""
+    return _resume_row(resume_path, _worker_encoded_postings, _worker_scoring_rules)
+
+
+class ScoreMatrix:
+    """
+    Resumes x postings matrix of total scores, stored as one byte per score.
+    
+    The file holds a JSON header (resume names and posting labels) followed by
+    one row of scores per resume. Rows are written as they are produced and
+    read back through a memory map, so neither side holds the whole matrix.
+    """
+    
+    MAGIC = b'RMSMAT01'
+    VERSION = 1
+    
+    def __init__(self, header, mapping, offset):
+        """Use ScoreMatrix.open() rather than calling this directly."""
+        self.resumes = header['resumes']
+        self.postings = [tuple(label) for label in header['postings']]
+        self.shape = (len(self.resumes), len(self.postings))
+        self._mmap = mapping
+        self._offset = offset
+    
+    @classmethod
+    def write(cls, path, resume_names, posting_labels, rows):
+        """
+        Stream a score matrix to disk.
         
-        # Work culture assessment based on skills and experience
-        if work_culture.lower() == 'fast-paced':
-            # Check for startup experience and automation skills
-            if has_startup_exp or 'CI/CD' in str(self.resume_data['skills']):
-                score += 7
-            else:
-                score += 5
-        else:
-            score += 6  # Neutral fit
+        Args:
+            path: Output file; written to a temporary file and renamed at the end
+            resume_names: One name per row
+            posting_labels: One (company_name, position) pair per column
+            rows: Iterable of bytes, one per resume, each len(posting_labels) long
+        
+        Returns:
+            Number of rows written
+        """
+        header = json.dumps({
+            'version': cls.VERSION,
+            'resumes': list(resume_names),
+            'postings': [list(label) for label in posting_labels],
+        }).encode('utf-8')
+        columns = len(posting_labels)
+        count = 0
         
-        return min(score, 15)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.MAGIC)
+            f.write(len(header).to_bytes(4, 'little'))
+            f.write(header)
+            for row in rows:
+                if len(row) != columns:
+                    raise ValueError(f"Row {count} has {len(row)} scores, expected {columns}")
+                f.write(row)
+                count += 1
+        if count != len(resume_names):
+            os.remove(tmp_path)
+            raise ValueError(f"Got {count} rows for {len(resume_names)} resumes")
+        os.replace(tmp_path, path)
+        return count
     
-    def _assess_growth_potential(self, position, company_size):
-        """Calculate growth potential score (0-15)."""
-        score = 10  # Base score
+    @classmethod
+    def open(cls, path):
+        """
+        Map a score matrix written by write().
         
-        # Higher growth potential in smaller companies
-        if company_size.lower() in ['startup', 'medium']:
-            score += 5
-        else:
-            score += 3
+        Raises:
+            ValueError: If the file is not a score matrix this version can read
+        """
+        with open(path, 'rb') as f:
+            prefix = f.read(len(cls.MAGIC) + 4)
+            if prefix[:len(cls.MAGIC)] != cls.MAGIC:
+                raise ValueError(f"{path} is not a score matrix")
+            header_size = int.from_bytes(prefix[len(cls.MAGIC):], 'little')
+            header = json.loads(f.read(header_size).decode('utf-8'))
+            if header['version'] != cls.VERSION:
+                raise ValueError(f"{path}: unsupported score matrix version {header['version']}")
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(header, mapping, len(prefix) + header_size)
+    
+    def row(self, resume):
+        """Return one resume's scores, one byte per posting."""
+        start = self._offset + resume * self.shape[1]
+        return self._mmap[start:start + self.shape[1]]
+    
+    def score(self, resume, posting):
+        """Return the total score of one resume against one posting."""
+        return self._mmap[self._offset + resume * self.shape[1] + posting]
+    
+    def close(self):
+        """Release the memory map."""
+        self._mmap.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def score_matrix(resume_paths, company_infos, path, workers=1, rules=None):
+    """
+    Score every resume against every posting and stream the matrix to disk.
+    
+    Postings are encoded once (CompanyAssessment.encode_postings), so skill
+    normalization and the key tables are shared by every resume. With several
+    workers, the encoded postings are sent to each worker process once and
+    resumes are parsed and scored in parallel, a few at a time, in order.
+    
+    Args:
+        resume_paths: List of resume markdown files, one matrix row each
+        company_infos: Iterable of company_info dicts, or a ColumnarCatalog, one
+            matrix column per posting
+        path: Output file for ScoreMatrix
+        workers: Number of worker processes (1 scores in this process)
+        rules: Scoring rules for CompanyAssessment, as a ScoringRules, dict or file path
+    
+    Returns:
+        (rows, columns) written
+    
+    Raises:
+        ValueError: If the rules' weights add up to more than 255, the most a matrix byte holds
+    """
+    if not isinstance(rules, ScoringRules):
+        rules = ScoringRules.from_file(rules) if isinstance(rules, str) else ScoringRules(rules)
+    if rules.max_score > 255:
+        raise ValueError(f"Scoring weights add up to {rules.max_score}; a score matrix holds at most 255")
+    labels = []
+    
+    def labelled(company_infos):
+        for company_info in company_infos:
+            labels.append((company_info.get('company_name', ''), company_info.get('position', '')))
+            yield company_info
+    
+    if isinstance(company_infos, ColumnarCatalog):
+        labels = company_infos.labels()
+        encoded = company_infos.encoded()
+        shared = company_infos.path
+    else:
+        encoded = shared = CompanyAssessment.encode_postings(labelled(company_infos))
+    resume_names = [os.path.basename(resume_path) for resume_path in resume_paths]
+    
+    if workers <= 1:
+        rows = (_resume_row(resume_path, encoded, rules) for resume_path in resume_paths)
+        return ScoreMatrix.write(path, resume_names, labels, rows), len(labels)
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_matrix_worker,
+                             initargs=(shared, rules)) as executor:
+        def rows():
+            pending = deque()
+            remaining = iter(resume_paths)
+            while True:
+                for resume_path in islice(remaining, workers * 2 - len(pending)):
+                    pending.append(executor.submit(_score_resume_row, resume_path))
+                if not pending:
+                    return
+                yield pending.popleft().result()
         
-        return min(score, 15)
+        return ScoreMatrix.write(path, resume_names, labels, rows()), len(labels)
+
+
+DEFAULT_COVER_LETTER_TEMPLATE = """{name}
+{contact_line}
+
+{date}
+
+Hiring Manager
+{company_name}
+
+Dear Hiring Manager,
+
+I am writing to express my strong interest in the {position} position at {company_name}. \
+{experience_hook}I am excited about the opportunity to contribute to your team.
+
+My technical expertise aligns well with your requirements. {skills_sentence}{accomplishments}
+
+{emphasis_sentence}I am confident that my background and skills make me a strong candidate \
+for this role{company_size_clause}.
+
+I would welcome the opportunity to discuss how my experience and skills can contribute to \
+{closing_company}'s success. Thank you for considering my application.
+
+Sincerely,
+{name}
+"""
+
+
+class CoverLetterTemplate:
+    """
+    A cover letter template compiled into static fragments and slots.
     
-    def _get_recommendation(self, score):
-        """Generate recommendation based on score."""
-        if score >= 85:
-            return "Excellent Fit - Highly Recommended"
-        elif score >= 70:
-            return "Strong Fit - Recommended"
-        elif score >= 55:
-            return "Good Fit - Worth Pursuing"
-        elif score >= 40:
-            return "Moderate Fit - Consider Carefully"
-        else:
-            return "Low Fit - May Not Be Ideal"
+    Templates use str.format syntax ('{slot}', '{slot:>20}', '{{' for a literal
+    brace) with the slot names in CoverLetterGenerator.SLOTS. The template is
+    parsed once; rendering fills the slot positions and joins the fragments.
+    """
     
-    def _identify_strengths(self, scores):
-        """Identify top strengths based on scores."""
-        strengths = []
-        
-        if scores['skills_match'] >= 30:
-            strengths.append("Strong technical skills alignment")
-        if scores['experience'] >= 20:
-            strengths.append("Highly relevant industry experience")
-        if scores['culture_fit'] >= 12:
-            strengths.append("Excellent cultural fit")
-        if scores['growth_potential'] >= 12:
-            strengths.append("Great growth opportunities")
+    def __init__(self, text):
+        """
+        Args:
+            text: Template text
         
-        return strengths if strengths else ["Transferable skills and adaptability"]
+        Raises:
+            ValueError: If the template uses an unknown slot
+        """
+        self.text = text
+        self.fragments = []
+        self.slots = []
+        formatter = Formatter()
+        for literal, field_name, format_spec, conversion in formatter.parse(text):
+            if literal:
+                self.fragments.append(literal)
+            if field_name is None:
+                continue
+            if field_name not in CoverLetterGenerator.SLOTS:
+                raise ValueError(f"Unknown cover letter slot: {{{field_name}}}")
+            self.slots.append((len(self.fragments), field_name, format_spec, conversion))
+            self.fragments.append(None)
     
-    def _identify_emphasis_areas(self, company_info, scores):
-        """Identify what to emphasize in cover letter."""
-        areas = []
-        
-        if scores['skills_match'] >= 30:
-            areas.append(f"Technical expertise in {', '.join(company_info.get('required_skills', [])[:3])}")
-        
-        if 'ecommerce' in company_info.get('industry', '').lower():
-            areas.append("E-commerce platform experience and automation skills")
-        
-        if scores['experience'] >= 20:
-            areas.append("Proven track record in similar roles")
-        
-        if 'startup' in company_info.get('company_size', '').lower():
-            areas.append("Ability to work independently and wear multiple hats")
-        
-        return areas if areas else ["Strong problem-solving skills and adaptability"]
+    @classmethod
+    def from_file(cls, path):
+        """Load and compile a template file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read())
 
 
 class CoverLetterGenerator:
     """Generate personalized cover letters."""
     
-    def __init__(self, resume_data):
+    # Slot name -> (method, True if the value depends only on the resume)
+    SLOTS = {
+        'name': ('_slot_name', True),
+        'contact_line': ('_slot_contact_line', True),
+        'date': ('_slot_date', False),
+        'company_name': ('_slot_company_name', False),
+        'position': ('_slot_position', False),
+        'industry': ('_slot_industry', False),
+        'experience_hook': ('_slot_experience_hook', False),
+        'skills_sentence': ('_slot_skills_sentence', False),
+        'accomplishments': ('_slot_accomplishments', False),
+        'emphasis_sentence': ('_slot_emphasis_sentence', False),
+        'company_size_clause': ('_slot_company_size_clause', False),
+        'closing_company': ('_slot_closing_company', False),
+    }
+    
+    def __init__(self, resume_data, template=None):
+        """
+        Args:
+            resume_data: ResumeParser.data
+            template: Template text or CoverLetterTemplate (default: DEFAULT_COVER_LETTER_TEMPLATE)
+        """
         self.resume_data = resume_data
+        self._date = None
+        self._date_expires = 0.0
+        if template is None:
+            template = DEFAULT_COVER_LETTER_TEMPLATE
+        if not isinstance(template, CoverLetterTemplate):
+            template = CoverLetterTemplate(template)
+        self.template = template
+        self._compile()
+    
+    def _compile(self):
+        """Bind the template's slots to this generator, filling resume-only slots once."""
+        formatter = Formatter()
+        self._parts = list(self.template.fragments)
+        self._slots = []
+        for index, slot, format_spec, conversion in self.template.slots:
+            method, static = self.SLOTS[slot]
+            render = getattr(self, method)
+            if static:
+                value = formatter.convert_field(render(None, None), conversion)
+                self._parts[index] = format(value, format_spec)
+            elif format_spec or conversion:
+                self._slots.append((index, self._formatted_slot(render, format_spec, conversion)))
+            else:
+                self._slots.append((index, render))
+    
+    @staticmethod
+    def _formatted_slot(render, format_spec, conversion):
+        """Wrap a slot so its value is converted and formatted like str.format would."""
+        formatter = Formatter()
+        
+        def formatted(company_info, assessment_result):
+            value = formatter.convert_field(render(company_info, assessment_result), conversion)
+            return format(value, format_spec)
+        return formatted
     
     def generate(self, company_info, assessment_result):
         """
@@ -391,81 +2119,95 @@ class CoverLetterGenerator:
         Returns:
             String containing the cover letter
         """
-        name = self.resume_data['name']
-        email = self.resume_data['contact'].get('email', '')
-        phone = self.resume_data['contact'].get('phone', '')
+        parts = self._parts[:]
+        for index, render in self._slots:
+            parts[index] = render(company_info, assessment_result)
+        return ''.join(parts)
+    
+    def generate_many(self, scored):
+        """
+        Lazily generate cover letters for a stream of assessed postings.
         
-        date = datetime.now().strftime("%B %d, %Y")
+        Args:
+            scored: Iterable of (company_info, assessment_result) pairs, e.g.
+                CompanyAssessment.iter_scores()
         
-        # Build the cover letter
-        letter = f"{name}\n"
-        if email:
-            letter += f"{email}"
+        Yields:
+            Tuples of (company_info, cover letter)
+        """
+        for company_info, assessment_result in scored:
+            yield company_info, self.generate(company_info, assessment_result)
+    
+    def _slot_name(self, company_info, assessment_result):
+        return self.resume_data['name']
+    
+    def _slot_contact_line(self, company_info, assessment_result):
+        email = self.resume_data['contact'].get('email', '')
+        phone = self.resume_data['contact'].get('phone', '')
+        line = email
         if phone:
-            letter += f" | {phone}"
-        letter += f"\n\n{date}\n\n"
-        
-        letter += f"Hiring Manager\n"
-        letter += f"{company_info.get('company_name', '[Company Name]')}\n\n"
-        
-        letter += f"Dear Hiring Manager,\n\n"
-        
-        # Opening paragraph
-        letter += f"I am writing to express my strong interest in the {company_info.get('position', '[Position]')} "
-        letter += f"position at {company_info.get('company_name', '[Company Name]')}. "
-        
+            line += f" | {phone}"
+        return line
+    
+    def _slot_date(self, company_info, assessment_result):
+        """Today's date, formatted once per day."""
+        if time.time() >= self._date_expires:
+            from datetime import datetime, timedelta
+            now = datetime.now()
+            self._date = now.strftime("%B %d, %Y")
+            midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            self._date_expires = midnight.timestamp()
+        return self._date
+    
+    def _slot_company_name(self, company_info, assessment_result):
+        return company_info.get('company_name', '[Company Name]')
+    
+    def _slot_position(self, company_info, assessment_result):
+        return company_info.get('position', '[Position]')
+    
+    def _slot_industry(self, company_info, assessment_result):
+        return company_info.get('industry', 'technology')
+    
+    def _slot_experience_hook(self, company_info, assessment_result):
         # Add relevant experience hook
-        most_recent = self.resume_data['experience'][0] if self.resume_data['experience'] else None
-        if most_recent:
-            letter += f"As a {most_recent['title']} with a proven track record in {company_info.get('industry', 'technology')}, "
-        else:
-            letter += f"With my background in software engineering and "
-        
-        letter += "I am excited about the opportunity to contribute to your team.\n\n"
-        
-        # Skills paragraph
-        letter += "My technical expertise aligns well with your requirements. "
-        
-        if company_info.get('required_skills'):
-            skills_mentioned = company_info['required_skills'][:3]
-            letter += f"I bring extensive experience in {', '.join(skills_mentioned[:-1])}"
-            if len(skills_mentioned) > 1:
-                letter += f", and {skills_mentioned[-1]}"
-            letter += ". "
-        
+        if self.resume_data['experience']:
+            most_recent = self.resume_data['experience'][0]
+            return f"As a {most_recent['title']} with a proven track record in {company_info.get('industry', 'technology')}, "
+        return "With my background in software engineering and "
+    
+    def _slot_skills_sentence(self, company_info, assessment_result):
+        if not company_info.get('required_skills'):
+            return ""
+        skills_mentioned = company_info['required_skills'][:3]
+        sentence = f"I bring extensive experience in {', '.join(skills_mentioned[:-1])}"
+        if len(skills_mentioned) > 1:
+            sentence += f", and {skills_mentioned[-1]}"
+        return sentence + ". "
+    
+    def _slot_accomplishments(self, company_info, assessment_result):
         # Add specific accomplishments based on experience
         if self.resume_data['experience']:
-            letter += self._add_relevant_accomplishments(company_info)
-        
-        letter += "\n\n"
-        
-        # Emphasis areas paragraph
+            return self._add_relevant_accomplishments(company_info)
+        return ""
+    
+    def _slot_emphasis_sentence(self, company_info, assessment_result):
         emphasis_areas = assessment_result['areas_to_emphasize']
-        if emphasis_areas:
-            letter += "I am particularly drawn to this opportunity because of my "
-            letter += emphasis_areas[0].lower()
-            if len(emphasis_areas) > 1:
-                letter += f", as well as my {emphasis_areas[1].lower()}"
-            letter += ". "
-        
-        letter += f"I am confident that my background and skills make me a strong candidate for this role"
-        
+        if not emphasis_areas:
+            return ""
+        sentence = "I am particularly drawn to this opportunity because of my " + emphasis_areas[0].lower()
+        if len(emphasis_areas) > 1:
+            sentence += f", as well as my {emphasis_areas[1].lower()}"
+        return sentence + ". "
+    
+    def _slot_company_size_clause(self, company_info, assessment_result):
         if company_info.get('company_size') == 'startup':
-            letter += ", and I thrive in dynamic, fast-paced environments where I can make an immediate impact"
+            return ", and I thrive in dynamic, fast-paced environments where I can make an immediate impact"
         elif company_info.get('company_size') == 'enterprise':
-            letter += ", and I excel in collaborative environments with established processes"
-        
-        letter += ".\n\n"
-        
-        # Closing
-        letter += f"I would welcome the opportunity to discuss how my experience and skills can contribute to "
-        letter += f"{company_info.get('company_name', 'your organization')}'s success. "
-        letter += "Thank you for considering my application.\n\n"
-        
-        letter += "Sincerely,\n"
-        letter += f"{name}\n"
-        
-        return letter
+            return ", and I excel in collaborative environments with established processes"
+        return ""
+    
+    def _slot_closing_company(self, company_info, assessment_result):
+        return company_info.get('company_name', 'your organization')
     
     def _add_relevant_accomplishments(self, company_info):
         """Add relevant accomplishments based on company info."""
@@ -508,12 +2250,372 @@ class CoverLetterGenerator:
         return text
 
 
+def cover_letter_filename(company_info):
+    """
+    File name used for a posting's saved cover letter.
+    
+    Path separators and '..' in the company name are replaced, so the name
+    cannot point outside the directory or archive it is written to.
+    """
+    company = re.sub(r'[/\\]|\.\.', '_', company_info.get('company_name', '').replace(' ', '_').lower())
+    return f"cover_letter_{company}.txt"
+
+
+class LetterWriter:
+    """
+    Base class for streaming cover letter writers.
+    
+    Letters are written as they arrive, through a buffered file, and the file is
+    flushed and fsynced every `fsync_every` letters and on close, so a crash
+    loses at most one batch and memory use does not grow with the run.
+    """
+    
+    def __init__(self, fsync_every=1000, buffer_size=1024 * 1024):
+        """
+        Args:
+            fsync_every: Letters per durable batch (0 to only sync on close)
+            buffer_size: Write buffer size in bytes
+        """
+        self.fsync_every = fsync_every
+        self.buffer_size = buffer_size
+        self.count = 0
+        self._batch = 0
+    
+    def write(self, company_info, letter):
+        """Write one letter, syncing at batch boundaries."""
+        self._write(company_info, letter)
+        self.count += 1
+        self._batch += 1
+        if self.fsync_every and self._batch >= self.fsync_every:
+            self.sync()
+    
+    def write_all(self, letters):
+        """
+        Write a stream of letters.
+        
+        Args:
+            letters: Iterable of (company_info, letter) pairs, e.g.
+                CoverLetterGenerator.generate_many()
+        
+        Returns:
+            Number of letters written
+        """
+        for company_info, letter in letters:
+            self.write(company_info, letter)
+        return self.count
+    
+    def sync(self):
+        """Flush buffered letters to disk and fsync."""
+        self._batch = 0
+    
+    def _fsync(self, fileobj):
+        fileobj.flush()
+        os.fsync(fileobj.fileno())
+    
+    def close(self):
+        """Sync and close the output."""
+        self.sync()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class JSONLLetterWriter(LetterWriter):
+    """Write letters to a single JSONL/NDJSON file, one object per letter."""
+    
+    def __init__(self, path, fsync_every=1000, buffer_size=1024 * 1024):
+        super().__init__(fsync_every, buffer_size)
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8', buffering=buffer_size)
+    
+    def _write(self, company_info, letter):
+        self._file.write(json.dumps({
+            'company_name': company_info.get('company_name', ''),
+            'position': company_info.get('position', ''),
+            'filename': cover_letter_filename(company_info),
+            'letter': letter,
+        }) + '\n')
+    
+    def sync(self):
+        self._fsync(self._file)
+        super().sync()
+    
+    def close(self):
+        if not self._file.closed:
+            super().close()
+            self._file.close()
+
+
+class ArchiveLetterWriter(LetterWriter):
+    """
+    Write letters into sharded tar or zip archives.
+    
+    Each shard holds up to `shard_size` letters, named from `path` with the
+    shard number before the extension (letters.tar -> letters-00000.tar).
+    Members are named '<sequence>_cover_letter_<company>.txt'.
+    """
+    
+    def __init__(self, path, fmt='tar', shard_size=10000, fsync_every=1000, buffer_size=1024 * 1024):
+        """
+        Args:
+            path: Archive path; the shard number is inserted before the extension
+            fmt: 'tar' or 'zip'
+            shard_size: Letters per archive shard
+            fsync_every: Letters per durable batch (0 to only sync on shard close)
+            buffer_size: Write buffer size in bytes
+        """
+        if fmt not in ('tar', 'zip'):
+            raise ValueError(f"Unsupported archive format: {fmt}")
+        if shard_size < 1:
+            raise ValueError(f"shard_size must be at least 1, got {shard_size}")
+        super().__init__(fsync_every, buffer_size)
+        self.path = path
+        self.fmt = fmt
+        self.shard_size = shard_size
+        self.shards = []
+        self._file = None
+        self._archive = None
+    
+    def _shard_path(self, shard):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}-{shard:05d}{ext}"
+    
+    def _open_shard(self):
+        path = self._shard_path(len(self.shards))
+        self.shards.append(path)
+        self._file = open(path, 'wb', buffering=self.buffer_size)
+        if self.fmt == 'tar':
+            import tarfile
+            self._archive = tarfile.open(fileobj=self._file, mode='w')
+        else:
+            import zipfile
+            self._archive = zipfile.ZipFile(self._file, mode='w', compression=zipfile.ZIP_DEFLATED)
+    
+    def _close_shard(self):
+        self._archive.close()
+        self._fsync(self._file)
+        self._file.close()
+        self._archive = self._file = None
+    
+    def _write(self, company_info, letter):
+        if self._archive is not None and self.count and self.count % self.shard_size == 0:
+            self._close_shard()
+        if self._archive is None:
+            self._open_shard()
+        
+        name = f"{self.count:08d}_{cover_letter_filename(company_info)}"
+        data = letter.encode('utf-8')
+        if self.fmt == 'tar':
+            import tarfile
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, io.BytesIO(data))
+        else:
+            self._archive.writestr(name, data)
+    
+    def sync(self):
+        # Zip central directories are only written on close, so zip shards
+        # become durable when they are closed.
+        if self._file is not None and self.fmt == 'tar':
+            self._fsync(self._file)
+        super().sync()
+    
+    def close(self):
+        if self._archive is not None:
+            self._close_shard()
+        super().close()
+
+
+def open_letter_writer(path, fmt=None, fsync_every=1000, shard_size=10000):
+    """
+    Open a letter writer for a path.
+    
+    Args:
+        path: Output path (.jsonl/.ndjson, .tar or .zip)
+        fmt: 'jsonl', 'tar' or 'zip' (default: guessed from the extension)
+        fsync_every: Letters per durable batch
+        shard_size: Letters per archive shard (tar/zip only)
+    
+    Returns:
+        LetterWriter instance
+    """
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = {'.tar': 'tar', '.zip': 'zip'}.get(ext, 'jsonl')
+    if fmt == 'jsonl':
+        return JSONLLetterWriter(path, fsync_every)
+    return ArchiveLetterWriter(path, fmt, shard_size, fsync_every)
+
+
+class SMTPConnectionPool:
+    """
+    Pool of connected, authenticated SMTP sessions that are reused across messages.
+    
+    At most `size` connections are open at once; acquire() blocks until one is
+    free. A connection that has sat idle longer than `noop_after` seconds is
+    checked with NOOP before it is handed out, and replaced if the server has
+    dropped it.
+    """
+    
+    def __init__(self, config, size=1, noop_after=30.0, timeout=30.0):
+        """
+        Args:
+            config: EmailSender config dict (smtp_server, smtp_port, sender_email,
+                sender_password and optional use_tls, default True)
+            size: Maximum number of open connections
+            noop_after: Idle seconds after which a connection is checked with NOOP
+            timeout: Socket timeout for SMTP connections, in seconds
+        """
+        self.config = config
+        self.size = size
+        self.noop_after = noop_after
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+    
+    def _connect(self):
+        """Open, secure and log in a new SMTP connection."""
+        import smtplib
+        server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'], timeout=self.timeout)
+        try:
+            if self.config.get('use_tls', True):
+                server.starttls()
+            server.login(self.config['sender_email'], self.config['sender_password'])
+        except Exception:
+            server.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return server
+    
+    def _is_alive(self, server):
+        """Check an idle connection with NOOP."""
+        import smtplib
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    def acquire(self):
+        """Take a live connection from the pool, opening one if none is idle."""
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    server, last_used = self._idle.pop()
+                if time.monotonic() - last_used < self.noop_after or self._is_alive(server):
+                    return server
+                self._close(server)
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def release(self, server, discard=False):
+        """
+        Return a connection to the pool.
+        
+        Args:
+            server: Connection obtained from acquire()
+            discard: Close the connection instead of keeping it (e.g. after an error)
+        """
+        if discard:
+            self._close(server)
+        else:
+            with self._lock:
+                self._idle.append((server, time.monotonic()))
+        self._slots.release()
+    
+    def _close(self, server):
+        """Quit a connection, falling back to closing the socket."""
+        import smtplib
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for server, _ in idle:
+            self._close(server)
+
+
+class AttachmentCache:
+    """
+    Base64-encoded attachments, encoded once and shared across messages.
+    
+    Entries are keyed on the file's absolute path and revalidated against its
+    mtime and size, so an edited resume is picked up on the next message. Files
+    of MMAP_THRESHOLD bytes or more are encoded straight from a memory map
+    instead of being read into a bytes copy first.
+    """
+    
+    MMAP_THRESHOLD = 1024 * 1024
+    
+    def __init__(self):
+        self._entries = {}
+    
+    def clear(self):
+        """Drop all cached attachments."""
+        self._entries.clear()
+    
+    def encoded_payload(self, path):
+        """Return the base64 payload for a file, encoding it only if it changed."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        
+        import base64
+        with open(path, 'rb') as f:
+            if stat.st_size >= self.MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    encoded = base64.encodebytes(mapped).decode('ascii')
+            else:
+                encoded = base64.encodebytes(f.read()).decode('ascii')
+        
+        self._entries[path] = (stat.st_mtime_ns, stat.st_size, encoded)
+        return encoded
+    
+    def mime_part(self, path):
+        """Build an attachment part for a file around its cached base64 payload."""
+        from email.mime.base import MIMEBase
+        part = MIMEBase('application', 'octet-stream')
+        part.set_payload(self.encoded_payload(path))
+        part['Content-Transfer-Encoding'] = 'base64'
+        part.add_header(
+            'Content-Disposition',
+            f'attachment; filename= {os.path.basename(path)}'
+        )
+        return part
+
+
+ATTACHMENT_CACHE = AttachmentCache()
+
+
 class EmailSender:
     """Handle email sending functionality."""
     
-    def __init__(self, config_path='email_config.json'):
+    def __init__(self, config_path='email_config.json', pool_size=1):
+        """
+        Args:
+            config_path: Path to the JSON email configuration file
+            pool_size: Number of SMTP connections kept open for reuse
+        """
         self.config_path = config_path
         self.config = self._load_config()
+        self.pool = SMTPConnectionPool(self.config, size=pool_size)
     
     def _load_config(self):
         """Load email configuration from file or environment."""
@@ -532,10 +2634,57 @@ class EmailSender:
         
         return config
     
+    def _build_message(self, recipient_email, subject, cover_letter, resume_path):
+        """Build the MIME message with the cover letter body and resume attachment."""
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        
+        msg = MIMEMultipart()
+        msg['From'] = self.config['sender_email']
+        msg['To'] = recipient_email
+        msg['Subject'] = subject
+        
+        # Add cover letter as body
+        msg.attach(MIMEText(cover_letter, 'plain'))
+        
+        # Attach resume PDF, encoded once and reused across messages
+        msg.attach(ATTACHMENT_CACHE.mime_part(resume_path))
+        
+        return msg
+    
+    def _deliver(self, msg):
+        """
+        Send a message over a pooled connection.
+        
+        A connection the server has dropped is replaced and the send retried once.
+        """
+        import smtplib
+        for attempt in range(2):
+            server = self.pool.acquire()
+            try:
+                server.send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                self.pool.release(server, discard=True)
+                if attempt:
+                    raise
+            except smtplib.SMTPResponseException:
+                # The server rejected this message but the session is still usable.
+                self.pool.release(server)
+                raise
+            except Exception:
+                self.pool.release(server, discard=True)
+                raise
+            else:
+                self.pool.release(server)
+                return
+    
     def send_resume(self, recipient_email, subject, cover_letter, resume_path='resume.pdf'):
         """
         Send resume with cover letter via email.
         
+        The SMTP connection is kept open in the pool for the next message; call
+        close() when done sending.
+        
         Args:
             recipient_email: Recipient's email address
             subject: Email subject line
@@ -548,42 +2697,387 @@ class EmailSender:
         if not self.config['sender_email'] or not self.config['sender_password']:
             return (False, "Email configuration incomplete. Please set SENDER_EMAIL and SENDER_PASSWORD environment variables or create email_config.json")
         
+        if not os.path.exists(resume_path):
+            return (False, f"Resume file not found: {resume_path}")
+        
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.config['sender_email']
-            msg['To'] = recipient_email
-            msg['Subject'] = subject
-            
-            # Add cover letter as body
-            body = cover_letter
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach resume PDF
-            if os.path.exists(resume_path):
-                with open(resume_path, 'rb') as f:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(f.read())
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {os.path.basename(resume_path)}'
-                    )
-                    msg.attach(part)
-            else:
-                return (False, f"Resume file not found: {resume_path}")
-            
-            # Send email
-            server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'])
-            server.starttls()
-            server.login(self.config['sender_email'], self.config['sender_password'])
-            server.send_message(msg)
-            server.quit()
-            
+            msg = self._build_message(recipient_email, subject, cover_letter, resume_path)
+            self._deliver(msg)
             return (True, f"Email sent successfully to {recipient_email}")
         
         except Exception as e:
             return (False, f"Failed to send email: {str(e)}")
+    
+    def send_many(self, messages):
+        """
+        Send a batch of resumes, reusing pooled SMTP connections.
+        
+        Args:
+            messages: Iterable of dicts with send_resume's arguments
+                (recipient_email, subject, cover_letter and optional resume_path)
+        
+        Returns:
+            List of (success: bool, message: str) tuples, one per message
+        """
+        return [self.send_resume(**message) for message in messages]
+    
+    def close(self):
+        """Close pooled SMTP connections."""
+        self.pool.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TokenBucket:
+    """Asyncio token-bucket rate limiter: `rate` tokens per second, bursts up to `burst`."""
+    
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+    
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        import asyncio
+        # asyncio locks belong to one event loop, so each loop gets its own
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncEmailSender:
+    """
+    Send resumes from asyncio code with several messages in flight at once.
+    
+    Messages go out over a pool of `concurrency` SMTP connections. Each blocking
+    smtplib session runs on its own worker thread, so the event loop (and an
+    interactive prompt running on it) is never blocked. An optional token bucket
+    caps the send rate for the provider this sender talks to.
+    """
+    
+    def __init__(self, config_path='email_config.json', concurrency=4, rate_limit=None, burst=None):
+        """
+        Args:
+            config_path: Path to the JSON email configuration file
+            concurrency: Messages (and SMTP connections) in flight at once
+            rate_limit: Maximum messages per second for this provider; defaults to the
+                config's 'rate_limit' key, and None or 0 means unlimited
+            burst: Messages allowed back-to-back before the rate limit applies
+                (default: the config's 'rate_burst' key, or 1)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self.sender = EmailSender(config_path, pool_size=concurrency)
+        self.concurrency = concurrency
+        rate_limit = rate_limit if rate_limit is not None else self.sender.config.get('rate_limit')
+        burst = burst if burst is not None else self.sender.config.get('rate_burst', 1)
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+        self._semaphore = None
+        self._semaphore_loop = None
+    
+    @property
+    def config(self):
+        return self.sender.config
+    
+    async def send_resume(self, recipient_email, subject, cover_letter, resume_path='resume.pdf'):
+        """
+        Send resume with cover letter via email without blocking the event loop.
+        
+        Returns:
+            Tuple of (success: bool, message: str), as EmailSender.send_resume
+        """
+        import asyncio
+        # Like TokenBucket's lock, the semaphore is bound to one event loop
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        async with self._semaphore:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            return await loop.run_in_executor(
+                self._executor, self.sender.send_resume,
+                recipient_email, subject, cover_letter, resume_path
+            )
+    
+    def submit(self, **message):
+        """
+        Schedule one message on the running event loop.
+        
+        Args:
+            **message: send_resume's arguments
+        
+        Returns:
+            asyncio.Task resolving to (success: bool, message: str)
+        """
+        import asyncio
+        return asyncio.ensure_future(self.send_resume(**message))
+    
+    async def send_many(self, messages):
+        """
+        Send a batch of resumes concurrently.
+        
+        Args:
+            messages: Iterable of dicts with send_resume's arguments
+        
+        Returns:
+            List of (success: bool, message: str) tuples, in input order
+        """
+        import asyncio
+        return await asyncio.gather(*(self.submit(**message) for message in messages))
+    
+    def close(self):
+        """Close pooled SMTP connections and stop the worker threads."""
+        self._executor.shutdown()
+        self.sender.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # Waiting for in-flight sends and closing SMTP sessions blocks, so it
+        # runs on the default executor rather than the event loop
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+class Metrics:
+    """
+    Per-stage latency histograms and call counts.
+    
+    Observations are thread-safe. Buckets are cumulative upper bounds in seconds,
+    as in Prometheus histograms.
+    """
+    
+    BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+    
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, stage, seconds):
+        """Record one call to a stage that took `seconds`."""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = {'count': 0, 'sum': 0.0, 'max': 0.0,
+                                               'buckets': [0] * (len(self.BUCKETS) + 1)}
+            stats['count'] += 1
+            stats['sum'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['buckets'][bisect_left(self.BUCKETS, seconds)] += 1
+    
+    def _cumulative(self, stats):
+        """Yield (upper bound label, cumulative count) for a stage's buckets, ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.BUCKETS + (float('inf'),), stats['buckets']):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+    
+    def to_dict(self):
+        """Return the metrics as a JSON-serializable dict keyed by stage."""
+        with self._lock:
+            return {stage: {
+                'count': stats['count'],
+                'sum_seconds': stats['sum'],
+                'mean_seconds': stats['sum'] / stats['count'],
+                'max_seconds': stats['max'],
+                'buckets': dict(self._cumulative(stats)),
+            } for stage, stats in sorted(self._stages.items())}
+    
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = [
+            '# HELP resume_mailer_stage_seconds Latency of resume_mailer pipeline stages.',
+            '# TYPE resume_mailer_stage_seconds histogram',
+        ]
+        with self._lock:
+            for stage, stats in sorted(self._stages.items()):
+                for bound, count in self._cumulative(stats):
+                    lines.append(f'resume_mailer_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'resume_mailer_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]}')
+                lines.append(f'resume_mailer_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        return '\n'.join(lines) + '\n'
+    
+    def write(self, path, fmt=None):
+        """
+        Write the metrics to a file.
+        
+        Args:
+            path: Output file
+            fmt: 'json' or 'prometheus' (default: prometheus for .prom files, else JSON)
+        """
+        fmt = fmt or ('prometheus' if path.endswith('.prom') else 'json')
+        with open(path, 'w', encoding='utf-8') as f:
+            if fmt == 'prometheus':
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+# (class, method, stage) for each instrumented hot path.
+INSTRUMENTED_METHODS = [
+    (ResumeParser, '_parse_resume', 'parse'),
+    (ParseCache, 'load', 'parse_cache.load'),
+    (CompanyAssessment, '_assess_skills_match', 'assess.skills_match'),
+    (CompanyAssessment, '_assess_experience_relevance', 'assess.experience'),
+    (CompanyAssessment, '_assess_culture_fit', 'assess.culture_fit'),
+    (CompanyAssessment, '_assess_growth_potential', 'assess.growth_potential'),
+    (CoverLetterGenerator, 'generate', 'generate'),
+    (EmailSender, 'send_resume', 'send'),
+]
+
+_original_methods = {}
+
+
+def _timed(method, stage, metrics):
+    """Wrap a method so each call is recorded under `stage`."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.observe(stage, time.perf_counter() - start)
+    return wrapper
+
+
+def instrument(metrics=None):
+    """
+    Start recording per-stage latencies for the methods in INSTRUMENTED_METHODS.
+    
+    The methods are wrapped on their classes only while instrumentation is on,
+    so there is no overhead at all when it is off. Metrics are per process:
+    ParallelAssessment and score_matrix workers do not report back.
+    
+    Args:
+        metrics: Metrics to record into (default: a new one)
+    
+    Returns:
+        The Metrics being recorded into
+    """
+    uninstrument()
+    metrics = metrics or Metrics()
+    for cls, name, stage in INSTRUMENTED_METHODS:
+        method = cls.__dict__[name]
+        _original_methods[(cls, name)] = method
+        setattr(cls, name, _timed(method, stage, metrics))
+    return metrics
+
+
+def uninstrument():
+    """Restore the methods wrapped by instrument()."""
+    for (cls, name), method in _original_methods.items():
+        setattr(cls, name, method)
+    _original_methods.clear()
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples the main thread's stack on SIGPROF.
+    
+    Samples are taken every `interval` seconds of CPU time and counted per
+    distinct stack, which is exactly what flamegraph tools read as collapsed
+    stacks ("outer;inner;leaf count"). Needs a platform with SIGPROF and
+    setitimer (Linux, macOS).
+    """
+    
+    def __init__(self, interval=0.001):
+        """
+        Args:
+            interval: Seconds of CPU time between samples
+        """
+        self.interval = interval
+        self.stacks = {}
+        self._previous_handler = None
+    
+    @staticmethod
+    def available():
+        """Return True if this platform supports SIGPROF sampling."""
+        import signal
+        return hasattr(signal, 'SIGPROF') and hasattr(signal, 'setitimer')
+    
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        key = ';'.join(reversed(stack))
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+    
+    def start(self):
+        """Start sampling; must be called from the main thread."""
+        import signal
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+    
+    def stop(self):
+        """Stop sampling and restore the previous SIGPROF handler."""
+        import signal
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+    
+    def write_collapsed(self, path):
+        """Write the samples in collapsed-stack format, heaviest stacks first."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+
+
+def run_profiled(func, prefix, interval=0.001):
+    """
+    Run func under cProfile and the sampling profiler.
+    
+    Writes <prefix>.pstats (for pstats, snakeviz and similar tools) and, where
+    SIGPROF is available, <prefix>.collapsed (for flamegraph.pl, speedscope and
+    similar tools).
+    
+    Args:
+        func: Callable to profile
+        prefix: Output path prefix
+        interval: Sampling interval in seconds of CPU time
+    
+    Returns:
+        func's return value
+    """
+    import cProfile
+    
+    profiler = cProfile.Profile()
+    sampler = SamplingProfiler(interval) if SamplingProfiler.available() else None
+    if sampler is not None:
+        sampler.start()
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        profiler.dump_stats(prefix + '.pstats')
+        outputs = [prefix + '.pstats']
+        if sampler is not None:
+            sampler.write_collapsed(prefix + '.collapsed')
+            outputs.append(prefix + '.collapsed')
+        print(f"✓ Wrote profile to {', '.join(outputs)}", file=sys.stderr)
 
 
 def interactive_mode():
@@ -629,14 +3123,15 @@ def interactive_mode():
     result = assessment.calculate_success_score(company_info)
     
     # Display results
-    print(f"Overall Success Score: {result['total_score']}/100")
+    weights = assessment.rules.weights
+    print(f"Overall Success Score: {result['total_score']}/{assessment.rules.max_score}")
     print(f"Recommendation: {result['recommendation']}\n")
     
     print("Score Breakdown:")
-    print(f"  • Skills Match: {result['breakdown']['skills_match']}/40")
-    print(f"  • Experience Relevance: {result['breakdown']['experience']}/30")
-    print(f"  • Culture Fit: {result['breakdown']['culture_fit']}/15")
-    print(f"  • Growth Potential: {result['breakdown']['growth_potential']}/15\n")
+    print(f"  • Skills Match: {result['breakdown']['skills_match']}/{weights['skills_match']}")
+    print(f"  • Experience Relevance: {result['breakdown']['experience']}/{weights['experience']}")
+    print(f"  • Culture Fit: {result['breakdown']['culture_fit']}/{weights['culture_fit']}")
+    print(f"  • Growth Potential: {result['breakdown']['growth_potential']}/{weights['growth_potential']}\n")
     
     if result['strengths']:
         print("Your Strengths for This Role:")
@@ -667,7 +3162,7 @@ def interactive_mode():
         # Save cover letter
         save_file = input("Save cover letter to file? (y/n): ").strip().lower()
         if save_file == 'y':
-            filename = f"cover_letter_{company_info['company_name'].replace(' ', '_').lower()}.txt"
+            filename = cover_letter_filename(company_info)
             with open(filename, 'w') as f:
                 f.write(cover_letter)
             print(f"✓ Cover letter saved to: {filename}\n")
@@ -686,8 +3181,8 @@ def interactive_mode():
             proceed = input("Proceed with sending? (y/n): ").strip().lower()
             
             if proceed == 'y':
-                sender = EmailSender()
-                success, message = sender.send_resume(recipient, subject, cover_letter)
+                with EmailSender() as sender:
+                    success, message = sender.send_resume(recipient, subject, cover_letter)
                 
                 if success:
                     print(f"\n✓ {message}")
@@ -699,8 +3194,896 @@ def interactive_mode():
     print("=" * 60)
 
 
+def _split_skills(value):
+    """Normalize a required_skills value from a JSON list or a comma-separated string."""
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    return [s.strip() for s in value.split(',') if s.strip()]
+
+
+def read_postings(stream, fmt='jsonl'):
+    """
+    Lazily read company_info records from a text stream.
+    
+    Args:
+        stream: File-like object opened in text mode
+        fmt: 'jsonl' (one JSON object per line) or 'csv' (header row with company_info keys)
+    
+    Yields:
+        Tuple of (line_number, company_info dict or None, error message or None)
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for company_info in reader:
+            company_info = {k: v for k, v in company_info.items() if k is not None and v is not None}
+            company_info['required_skills'] = _split_skills(company_info.get('required_skills'))
+            yield reader.line_num, company_info, None
+        return
+    
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            company_info = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(company_info, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        company_info['required_skills'] = _split_skills(company_info.get('required_skills'))
+        yield line_number, company_info, None
+
+
+# Field names seen in job-board dumps for each company_info key, in order of preference.
+POSTING_FIELD_ALIASES = {
+    'company_name': ['company_name', 'company', 'employer', 'organization'],
+    'position': ['position', 'title', 'job_title', 'role'],
+    'required_skills': ['required_skills', 'skills', 'requirements', 'tags'],
+    'industry': ['industry', 'sector'],
+    'company_size': ['company_size', 'size'],
+    'work_culture': ['work_culture', 'culture', 'pace'],
+    'remote_policy': ['remote_policy', 'remote', 'workplace_type'],
+}
+ENUM_FIELDS = ('industry', 'company_size', 'work_culture', 'remote_policy')
+_ALIASES = {alias for aliases in POSTING_FIELD_ALIASES.values() for alias in aliases}
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_enum(value):
+    """Lowercase and hyphenate an enum-like value ('Fast Paced' -> 'fast-paced')."""
+    return '-'.join(value.lower().replace('_', ' ').split())
+
+
+def normalize_posting(record):
+    """
+    Map a raw posting record onto the company_info schema.
+    
+    Aliased field names are resolved (POSTING_FIELD_ALIASES), whitespace is
+    collapsed, skills are split and stripped, and the enum-like fields are
+    lowercased and hyphenated ('Fast Paced' -> 'fast-paced'). A boolean remote
+    flag becomes 'remote' or 'onsite'. Other fields are kept as they are.
+    
+    Args:
+        record: Dict read from a JSONL or CSV posting dump
+    
+    Returns:
+        company_info dict
+    """
+    company_info = {key: value for key, value in record.items() if key not in _ALIASES}
+    for field, aliases in POSTING_FIELD_ALIASES.items():
+        value = record.get(field)
+        if not value and value is not False:
+            for alias in aliases:
+                value = record.get(alias)
+                if value or value is False:
+                    break
+        
+        if field == 'required_skills':
+            skills = value if isinstance(value, list) else _split_skills(str(value or ''))
+            company_info[field] = [skill for skill in map(str.strip, map(str, skills)) if skill]
+        elif field == 'remote_policy' and isinstance(value, bool):
+            company_info[field] = 'remote' if value else 'onsite'
+        elif field in ENUM_FIELDS:
+            company_info[field] = _normalize_enum(str(value or ''))
+        else:
+            company_info[field] = ' '.join(str(value or '').split())
+    return company_info
+
+
+def posting_fingerprint(company_info):
+    """
+    Fingerprint of a normalized posting, equal for near-identical reposts.
+    
+    Case, whitespace and the order or repetition of skills are ignored.
+    """
+    key = '\x1f'.join([
+        company_info.get('company_name', '').casefold(),
+        company_info.get('position', '').casefold(),
+        '\x1e'.join(sorted({skill.casefold() for skill in company_info.get('required_skills') or []})),
+    ] + [company_info.get(field, '') for field in ENUM_FIELDS])
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Fixed-size set membership filter with no false negatives.
+    
+    Memory is set by the expected number of items and the acceptable false
+    positive rate (about 1.8 MB per million items at 0.1%), however many
+    items are actually added.
+    """
+    
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Args:
+            capacity: Expected number of distinct items
+            error_rate: Acceptable false positive rate at capacity
+        
+        Raises:
+            ValueError: If capacity is below 1 or error_rate is not between 0 and 1
+        """
+        import math
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, digest):
+        """Yield the digest's k bit positions (double hashing over its two 64-bit halves)."""
+        size = self.size
+        position = int.from_bytes(digest[:8], 'little') % size
+        step = int.from_bytes(digest[8:16], 'little') % size or 1
+        for _ in range(self.hashes):
+            yield position
+            position += step
+            if position >= size:
+                position -= size
+    
+    def add(self, digest):
+        """
+        Add a 16-byte digest.
+        
+        Returns:
+            True if it was (probably) already present, False if it is new
+        """
+        bits = self._bits
+        present = True
+        for position in self._positions(digest):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                present = False
+                bits[position >> 3] |= mask
+        return present
+    
+    def __contains__(self, digest):
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class PostingDeduplicator:
+    """
+    Drop near-identical postings from a stream in bounded memory.
+    
+    Postings are fingerprinted with posting_fingerprint() and remembered in a
+    Bloom filter, so a false positive (at most error_rate, at capacity) can
+    drop a posting that was not actually seen before; duplicates are never
+    let through.
+    """
+    
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        """
+        Args:
+            capacity: Expected number of distinct postings
+            error_rate: Acceptable false positive rate at capacity
+        """
+        self.seen = BloomFilter(capacity, error_rate)
+        self.duplicates = 0
+    
+    def is_duplicate(self, company_info):
+        """Record a posting and return True if an identical one was seen before."""
+        if self.seen.add(posting_fingerprint(company_info)):
+            self.duplicates += 1
+            return True
+        return False
+
+
+def open_feed(path):
+    """
+    Open a posting dump for reading as text, decompressing it if needed.
+    
+    gzip and zstd are detected from the file's magic bytes. zstd needs the
+    optional 'zstandard' package.
+    
+    Args:
+        path: File path, or '-' for stdin
+    
+    Returns:
+        Text stream
+    
+    Raises:
+        ImportError: If the file is zstd-compressed and zstandard is not installed
+    """
+    if path == '-':
+        return sys.stdin
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic[:2] == b'\x1f\x8b':
+        import gzip
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    if magic == b'\x28\xb5\x2f\xfd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                f"{path} is zstd-compressed; install the 'zstandard' package to read it "
+                "(pip install zstandard), or decompress it first"
+            ) from None
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return io.TextIOWrapper(io.BufferedReader(reader), encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def ingest_postings(stream, fmt='jsonl', deduplicator=None):
+    """
+    Read, normalize and optionally deduplicate postings from a text stream.
+    
+    Args:
+        stream: Text stream, e.g. from open_feed()
+        fmt: 'jsonl' or 'csv'
+        deduplicator: PostingDeduplicator, or None to keep duplicates
+    
+    Yields:
+        Tuple of (line_number, company_info dict or None, error message or None),
+        as read_postings; duplicates are skipped
+    """
+    for line_number, record, error in read_postings(stream, fmt):
+        if error:
+            yield line_number, None, error
+            continue
+        company_info = normalize_posting(record)
+        if deduplicator is not None and deduplicator.is_duplicate(company_info):
+            continue
+        yield line_number, company_info, None
+
+
+def prefetch(iterable, queue_size=16, batch_size=256):
+    """
+    Run an iterable in a background thread, handing items over a bounded queue.
+    
+    Reading and decompressing the next postings overlaps with scoring the
+    current ones. Items travel in batches, and at most queue_size batches are
+    buffered: when the consumer falls behind, the producer blocks, so memory
+    stays bounded. An exception in the producer is re-raised in the consumer.
+    
+    Args:
+        iterable: Items to produce
+        queue_size: Batches buffered between producer and consumer
+        batch_size: Items per batch
+    
+    Yields:
+        The iterable's items, in order
+    
+    Raises:
+        ValueError: If queue_size or batch_size is below 1
+    """
+    import queue
+    
+    if queue_size < 1 or batch_size < 1:
+        raise ValueError(f"queue_size and batch_size must be at least 1, got {queue_size} and {batch_size}")
+    
+    batches = queue.Queue(queue_size)
+    stop = threading.Event()
+    failure = []
+    
+    def put(batch):
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce():
+        try:
+            iterator = iter(iterable)
+            while True:
+                batch = list(islice(iterator, batch_size))
+                if not batch or not put(batch):
+                    break
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            put(None)
+    
+    thread = threading.Thread(target=produce, name='prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            yield from batch
+        if failure:
+            raise failure[0]
+    finally:
+        stop.set()
+        # A producer blocked reading its source cannot see stop; it is a
+        # daemon thread, so leave it rather than wait on it indefinitely
+        thread.join(timeout=1.0)
+
+
+class SkillVocabulary:
+    """
+    Table of skill strings, each identified by a small integer id.
+    
+    Postings store their skills as an array of ids, so a skill listed by many
+    postings is held in memory once.
+    """
+    
+    __slots__ = ('skills', '_ids')
+    
+    def __init__(self):
+        self.skills = []
+        self._ids = {}
+    
+    def __len__(self):
+        return len(self.skills)
+    
+    def encode(self, skills):
+        """Return the ids of skills as an array('I'), adding new skills to the vocabulary."""
+        ids = self._ids
+        encoded = array('I')
+        for skill in skills:
+            skill_id = ids.get(skill)
+            if skill_id is None:
+                skill_id = ids[skill] = len(self.skills)
+                self.skills.append(skill)
+            encoded.append(skill_id)
+        return encoded
+    
+    def decode(self, skill_ids):
+        """Return the skills for an array of ids, as a list."""
+        skills = self.skills
+        return [skills[skill_id] for skill_id in skill_ids]
+
+
+class Posting(Mapping):
+    """
+    Compact, read-only company_info record.
+    
+    The company_info keys are held in slots instead of a per-posting dict, the
+    position and enum values (industry, company_size, work_culture,
+    remote_policy) are interned so equal values share one string, and skills
+    are stored as ids into a shared SkillVocabulary. Any other keys are kept in
+    a small extra dict.
+    
+    A Posting is a Mapping with the same keys and values as the dict it was
+    built from, so CompanyAssessment, CoverLetterGenerator and the other
+    consumers of company_info accept it unchanged. required_skills is decoded
+    into a new list on each access.
+    """
+    
+    __slots__ = ('company_name', 'position', 'industry', 'company_size', 'work_culture',
+                 'remote_policy', 'skill_ids', 'extra', 'vocabulary')
+    
+    FIELDS = ('company_name', 'position', 'required_skills') + ENUM_FIELDS
+    _FIELD_SET = frozenset(FIELDS)
+    _INTERNED = ('position',) + ENUM_FIELDS
+    
+    def __init__(self, company_info, vocabulary):
+        """
+        Args:
+            company_info: company_info dict
+            vocabulary: SkillVocabulary shared by the catalog
+        """
+        self.vocabulary = vocabulary
+        # Absent keys leave their slot unset, so get() falls back to its default.
+        if 'company_name' in company_info:
+            self.company_name = company_info['company_name']
+        for field in self._INTERNED:
+            if field in company_info:
+                value = company_info[field]
+                setattr(self, field, sys.intern(value) if type(value) is str else value)
+        if 'required_skills' in company_info:
+            self.skill_ids = vocabulary.encode(company_info['required_skills'])
+        extra = {key: value for key, value in company_info.items() if key not in self._FIELD_SET}
+        self.extra = extra or None
+    
+    @property
+    def required_skills(self):
+        return self.vocabulary.decode(self.skill_ids)
+    
+    def get(self, key, default=None):
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        if self.extra is None:
+            return default
+        return self.extra.get(key, default)
+    
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+    
+    def __iter__(self):
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self.extra is not None:
+            yield from self.extra
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def __repr__(self):
+        return f"Posting({dict(self)!r})"
+    
+    def to_dict(self):
+        """Return the posting as a plain company_info dict."""
+        return dict(self)
+
+
+class PostingCatalog:
+    """
+    In-memory catalog of postings stored as compact Posting records.
+    
+    All postings share one SkillVocabulary. A catalog of JSON-loaded postings
+    takes about a fifth of the memory of the equivalent list of dicts (see
+    benchmark_posting_memory), and can be passed to scoring, letter writing
+    and ResultStore in place of an iterable of company_info dicts.
+    """
+    
+    def __init__(self, company_infos=()):
+        """
+        Args:
+            company_infos: Iterable of company_info dicts to add
+        """
+        self.vocabulary = SkillVocabulary()
+        self._postings = []
+        self.extend(company_infos)
+    
+    def add(self, company_info):
+        """Add a company_info dict and return its Posting."""
+        posting = Posting(company_info, self.vocabulary)
+        self._postings.append(posting)
+        return posting
+    
+    def extend(self, company_infos):
+        """Add every company_info dict from an iterable."""
+        for company_info in company_infos:
+            self.add(company_info)
+    
+    def __len__(self):
+        return len(self._postings)
+    
+    def __iter__(self):
+        return iter(self._postings)
+    
+    def __getitem__(self, index):
+        return self._postings[index]
+
+
+class ColumnarCatalog:
+    """
+    Read-only posting catalog stored column-wise in a memory-mapped file.
+    
+    Each company_info key is a column: company_name and position are ids into a
+    string table, the enum fields are codes into small per-field value tables,
+    and required_skills are CSR-style offsets into a flat column of skill ids.
+    The file also carries the resume-independent scoring columns of
+    CompanyAssessment.encode_postings, so score_many() and score_matrix() score
+    an opened catalog straight from the map, without building a dict per
+    posting. Opening parses only a small JSON header; columns are paged in as
+    they are read.
+    
+    Keys other than the company_info keys are not stored.
+    """
+    
+    MAGIC = b'RMPCAT01'
+    VERSION = 1
+    MISSING = 0xFFFFFFFF
+    CODE_COLUMNS = ('company_name', 'position') + ENUM_FIELDS + (
+        'experience_codes', 'culture_codes', 'growth_codes')
+    
+    def __init__(self, path, header, mapping, columns):
+        """Use ColumnarCatalog.open() rather than calling this directly."""
+        self.path = path
+        self.count = header['count']
+        self.skills = header['skills']
+        self._header = header
+        self._enums = header['enums']
+        self._columns = columns
+        self._mmap = mapping
+    
+    @classmethod
+    def is_catalog(cls, path):
+        """Return True if path is a file written by ColumnarCatalog.write()."""
+        try:
+            with open(path, 'rb') as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+    
+    @classmethod
+    def write(cls, path, company_infos):
+        """
+        Stream postings into a catalog file.
+        
+        Args:
+            path: Output file; written to a temporary file and renamed at the end
+            company_infos: Iterable of company_info dicts
+        
+        Returns:
+            Number of postings written
+        """
+        string_ids = {}
+        string_offsets = array('Q', [0])
+        string_data = bytearray()
+        skill_ids = {}
+        skill_offsets = array('Q', [0])
+        skill_values = array('I')
+        enum_codes = {field: {} for field in ENUM_FIELDS}
+        columns = {name: array('I') for name in cls.CODE_COLUMNS}
+        
+        def string_id(value):
+            if value is None:
+                return cls.MISSING
+            value = str(value)
+            code = string_ids.get(value)
+            if code is None:
+                code = string_ids[value] = len(string_ids)
+                string_data.extend(value.encode('utf-8'))
+                string_offsets.append(len(string_data))
+            return code
+        
+        def stored(company_infos):
+            for company_info in company_infos:
+                columns['company_name'].append(string_id(company_info.get('company_name')))
+                columns['position'].append(string_id(company_info.get('position')))
+                for field in ENUM_FIELDS:
+                    codes = enum_codes[field]
+                    columns[field].append(codes.setdefault(company_info.get(field), len(codes)))
+                for skill in company_info.get('required_skills') or []:
+                    skill_values.append(skill_ids.setdefault(skill, len(skill_ids)))
+                skill_offsets.append(len(skill_values))
+                yield company_info
+        
+        # The scoring key tables come from encode_postings itself, so catalog
+        # scores cannot drift from scores of the original dicts.
+        encoded = CompanyAssessment.encode_postings(stored(company_infos))
+        for name in ('experience_codes', 'culture_codes', 'growth_codes'):
+            columns[name] = array('I', encoded[name])
+        
+        header = json.dumps({
+            'version': cls.VERSION,
+            'byteorder': sys.byteorder,
+            'count': encoded['count'],
+            'strings': len(string_ids),
+            'skills': list(skill_ids),
+            'skill_values': len(skill_values),
+            'enums': {field: list(codes) for field, codes in enum_codes.items()},
+            'experience_keys': encoded['experience_keys'],
+            'culture_keys': encoded['culture_keys'],
+            'growth_keys': encoded['growth_keys'],
+        }).encode('utf-8')
+        # Pad the header so the 8-byte offset columns that follow are aligned.
+        header += b' ' * (-(len(cls.MAGIC) + 4 + len(header)) % 8)
+        
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.MAGIC)
+            f.write(len(header).to_bytes(4, 'little'))
+            f.write(header)
+            f.write(string_offsets.tobytes())
+            f.write(skill_offsets.tobytes())
+            for name in cls.CODE_COLUMNS:
+                f.write(columns[name].tobytes())
+            f.write(skill_values.tobytes())
+            f.write(string_data)
+        os.replace(tmp_path, path)
+        return encoded['count']
+    
+    @classmethod
+    def open(cls, path):
+        """
+        Map a catalog written by write().
+        
+        Raises:
+            ValueError: If the file is not a posting catalog this version can read
+        """
+        with open(path, 'rb') as f:
+            prefix = f.read(len(cls.MAGIC) + 4)
+            if prefix[:len(cls.MAGIC)] != cls.MAGIC:
+                raise ValueError(f"{path} is not a posting catalog")
+            header_size = int.from_bytes(prefix[len(cls.MAGIC):], 'little')
+            header = json.loads(f.read(header_size).decode('utf-8'))
+            if header['version'] != cls.VERSION or header['byteorder'] != sys.byteorder:
+                raise ValueError(f"{path}: unsupported posting catalog version or byte order")
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        count = header['count']
+        layout = [('string_offsets', 'Q', header['strings'] + 1), ('skill_offsets', 'Q', count + 1)]
+        layout += [(name, 'I', count) for name in cls.CODE_COLUMNS]
+        layout.append(('skill_values', 'I', header['skill_values']))
+        
+        view = memoryview(mapping)
+        columns = {}
+        start = len(prefix) + header_size
+        for name, typecode, length in layout:
+            end = start + length * (8 if typecode == 'Q' else 4)
+            columns[name] = view[start:end].cast(typecode)
+            start = end
+        columns['string_data'] = view[start:]
+        view.release()
+        return cls(path, header, mapping, columns)
+    
+    def __len__(self):
+        return self.count
+    
+    def string(self, string_id):
+        """Return an entry of the string table (None for MISSING)."""
+        if string_id == self.MISSING:
+            return None
+        offsets = self._columns['string_offsets']
+        return str(self._columns['string_data'][offsets[string_id]:offsets[string_id + 1]], 'utf-8')
+    
+    def __getitem__(self, index):
+        """Return one posting as a company_info dict."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("posting index out of range")
+        columns = self._columns
+        company_info = {}
+        for field in ('company_name', 'position'):
+            value = self.string(columns[field][index])
+            if value is not None:
+                company_info[field] = value
+        offsets = columns['skill_offsets']
+        company_info['required_skills'] = [
+            self.skills[skill_id] for skill_id in columns['skill_values'][offsets[index]:offsets[index + 1]]
+        ]
+        for field in ENUM_FIELDS:
+            value = self._enums[field][columns[field][index]]
+            if value is not None:
+                company_info[field] = value
+        return company_info
+    
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+    
+    def labels(self):
+        """Return (company_name, position) for every posting, without reading the other columns."""
+        string = functools.lru_cache(maxsize=65536)(self.string)
+        return [(string(name) or '', string(position) or '')
+                for name, position in zip(self._columns['company_name'], self._columns['position'])]
+    
+    def encoded(self):
+        """
+        Return the scoring columns in the form of CompanyAssessment.encode_postings().
+        
+        The columns are views into the map, valid until close().
+        """
+        columns = self._columns
+        return {
+            'count': self.count,
+            'skill_offsets': columns['skill_offsets'],
+            'skill_values': columns['skill_values'],
+            'experience_codes': columns['experience_codes'],
+            'culture_codes': columns['culture_codes'],
+            'growth_codes': columns['growth_codes'],
+            'skills': self.skills,
+            'experience_keys': [tuple(key) for key in self._header['experience_keys']],
+            'culture_keys': [tuple(key) for key in self._header['culture_keys']],
+            'growth_keys': self._header['growth_keys'],
+        }
+    
+    def close(self):
+        """Release the memory map."""
+        if self._mmap is not None:
+            for column in self._columns.values():
+                column.release()
+            self._mmap.close()
+            self._mmap = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def score_postings(assessment, company_infos):
+    """
+    Score company_info records and tag each result with its posting.
+    
+    Args:
+        assessment: CompanyAssessment or ParallelAssessment built from the parsed resume
+        company_infos: Iterable of company_info dicts
+    
+    Yields:
+        Result dicts from calculate_success_score, tagged with company_name and position
+    """
+    for company_info, result in assessment.iter_scores(company_infos):
+        yield _score_record(company_info, result)
+
+
+def _score_record(company_info, result):
+    """Tag a result with the posting's company_name and position."""
+    record = {
+        'company_name': company_info.get('company_name', ''),
+        'position': company_info.get('position', ''),
+    }
+    record.update(result)
+    return record
+
+
+def _guess_format(path):
+    """Guess the posting file format from its extension, ignoring .gz/.zst."""
+    root, ext = os.path.splitext(path.lower())
+    if ext in ('.gz', '.zst'):
+        ext = os.path.splitext(root)[1]
+    return 'csv' if ext == '.csv' else 'jsonl'
+
+
+def score_command(args):
+    """Run the `score` subcommand: stream postings in, stream JSONL results out."""
+    resume_parser = ResumeParser(args.resume, cache=ParseCache(sidecar=True) if args.parse_cache else True)
+    rules = ScoringRules.from_file(args.rules) if args.rules else None
+    if args.workers > 1:
+        assessment = ParallelAssessment(resume_parser.data, args.workers, args.chunk_size, rules)
+    else:
+        assessment = CompanyAssessment(resume_parser.data, rules=rules)
+    fmt = args.format or ('jsonl' if args.input == '-' else _guess_format(args.input))
+    
+    catalog = ColumnarCatalog.open(args.input) if ColumnarCatalog.is_catalog(args.input) else None
+    infile = open_feed(args.input) if catalog is None else None
+    deduplicator = PostingDeduplicator(args.dedupe_capacity) if args.dedupe else None
+    outfile = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    store = ResultStore(args.store) if args.store else None
+    letter_writer = None
+    if args.letters:
+        letter_writer = open_letter_writer(args.letters, args.letters_format, args.fsync_every, args.shard_size)
+        generator = CoverLetterGenerator(resume_parser.data)
+    errors = 0
+    
+    def valid_records():
+        nonlocal errors
+        if catalog is not None:
+            yield from catalog
+            return
+        for line_number, company_info, error in ingest_postings(infile, fmt, deduplicator):
+            if error:
+                errors += 1
+                print(f"✗ Skipping record at line {line_number}: {error}", file=sys.stderr)
+                continue
+            yield company_info
+    
+    records = prefetch(valid_records(), args.queue_size)
+    if store is None:
+        scored = assessment.iter_scores(records)
+    else:
+        scored = store.iter_scores(assessment, records)
+    
+    try:
+        for company_info, result in scored:
+            outfile.write(json.dumps(_score_record(company_info, result)) + '\n')
+            if letter_writer is not None:
+                letter_writer.write(company_info, generator.generate(company_info, result))
+    finally:
+        records.close()
+        if store is not None:
+            store.close()
+        if letter_writer is not None:
+            letter_writer.close()
+        if isinstance(assessment, ParallelAssessment):
+            assessment.close()
+        if catalog is not None:
+            catalog.close()
+        elif infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+        else:
+            outfile.flush()
+    
+    if deduplicator is not None and deduplicator.duplicates:
+        print(f"✓ Skipped {deduplicator.duplicates} duplicate postings", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def matrix_command(args):
+    """Run the `matrix` subcommand: score a directory of resumes against a posting file."""
+    resume_paths = sorted(
+        os.path.join(args.resumes, name) for name in os.listdir(args.resumes) if name.endswith('.md')
+    )
+    if not resume_paths:
+        print(f"✗ No .md resumes found in {args.resumes}", file=sys.stderr)
+        return 1
+    if ColumnarCatalog.is_catalog(args.input):
+        with ColumnarCatalog.open(args.input) as catalog:
+            rows, columns = score_matrix(resume_paths, catalog, args.output, args.workers, args.rules)
+        print(f"✓ Wrote {rows} x {columns} score matrix to {args.output}", file=sys.stderr)
+        return 0
+    
+    fmt = args.format or ('jsonl' if args.input == '-' else _guess_format(args.input))
+    infile = open_feed(args.input)
+    errors = 0
+    
+    def valid_records():
+        nonlocal errors
+        for line_number, company_info, error in ingest_postings(infile, fmt):
+            if error:
+                errors += 1
+                print(f"✗ Skipping record at line {line_number}: {error}", file=sys.stderr)
+                continue
+            yield company_info
+    
+    try:
+        rows, columns = score_matrix(resume_paths, valid_records(), args.output, args.workers, args.rules)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+    print(f"✓ Wrote {rows} x {columns} score matrix to {args.output}", file=sys.stderr)
+    
+    return 1 if errors else 0
+
+
+def catalog_command(args):
+    """Run the `catalog` subcommand: convert a posting file into a ColumnarCatalog."""
+    fmt = args.format or ('jsonl' if args.input == '-' else _guess_format(args.input))
+    infile = open_feed(args.input)
+    deduplicator = PostingDeduplicator(args.dedupe_capacity) if args.dedupe else None
+    errors = 0
+    
+    def valid_records():
+        nonlocal errors
+        for line_number, company_info, error in ingest_postings(infile, fmt, deduplicator):
+            if error:
+                errors += 1
+                print(f"✗ Skipping record at line {line_number}: {error}", file=sys.stderr)
+                continue
+            yield company_info
+    
+    try:
+        count = ColumnarCatalog.write(args.output, valid_records())
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+    print(f"✓ Wrote {count} postings to {args.output}", file=sys.stderr)
+    if deduplicator is not None and deduplicator.duplicates:
+        print(f"✓ Skipped {deduplicator.duplicates} duplicate postings", file=sys.stderr)
+    
+    return 1 if errors else 0
+
+
+def _positive_int(text):
+    """argparse type for options that must be at least 1."""
+    import argparse
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
 def main():
     """Main entry point."""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Resume Mailer - Assess company fit and send customized resumes",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -713,6 +4096,26 @@ Examples:
   export SENDER_EMAIL="your-email@gmail.com"
   export SENDER_PASSWORD="your-app-password"
   python resume_mailer.py
+  
+  # Batch-score postings (JSONL or CSV) and write JSONL results
+  python resume_mailer.py score postings.jsonl -o scores.jsonl
+  cat postings.csv | python resume_mailer.py score --format csv
+  python resume_mailer.py score postings.jsonl --workers 8 -o scores.jsonl
+  python resume_mailer.py score postings.jsonl -o scores.jsonl --letters letters.tar
+  python resume_mailer.py score postings.jsonl --store assessments.db -o scores.jsonl
+  
+  # Record per-stage timings of a run
+  python resume_mailer.py --metrics metrics.prom score postings.jsonl -o scores.jsonl
+  
+  # Profile a run (writes slow-run.pstats and slow-run.collapsed)
+  python resume_mailer.py --profile slow-run score postings.jsonl -o scores.jsonl
+  
+  # Score every resume in a directory against every posting
+  python resume_mailer.py matrix resumes/ postings.jsonl -o scores.matrix --workers 8
+  
+  # Convert postings once into a memory-mapped catalog, then score it
+  python resume_mailer.py catalog postings.jsonl.gz -o postings.catalog
+  python resume_mailer.py matrix resumes/ postings.catalog -o scores.matrix
         """
     )
     
@@ -722,8 +4125,219 @@ Examples:
         help='Run in non-interactive mode (for testing)'
     )
     
+    parser.add_argument(
+        '--metrics',
+        metavar='PATH',
+        help='Record per-stage latency histograms and write them to PATH on exit '
+             '(also enabled by the RESUME_MAILER_METRICS environment variable)'
+    )
+    parser.add_argument(
+        '--metrics-format',
+        choices=['json', 'prometheus'],
+        help='Metrics file format (default: prometheus for .prom files, else JSON)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        metavar='PREFIX',
+        help='Profile the run: write PREFIX.pstats (cProfile) and PREFIX.collapsed '
+             '(sampled stacks for flamegraph tools)'
+    )
+    parser.add_argument(
+        '--profile-interval',
+        type=float,
+        default=0.001,
+        help='Sampling interval for --profile, in seconds of CPU time (default: 0.001)'
+    )
+    
+    subparsers = parser.add_subparsers(dest='command')
+    
+    score_parser = subparsers.add_parser(
+        'score',
+        help='Score company_info records from a JSONL or CSV file'
+    )
+    score_parser.add_argument(
+        'input',
+        nargs='?',
+        default='-',
+        help="JSONL or CSV file of company_info records, optionally .gz or .zst compressed, "
+             "or a posting catalog ('-' for stdin, the default)"
+    )
+    score_parser.add_argument(
+        '--format',
+        choices=['jsonl', 'csv'],
+        help='Input format (default: guessed from the file extension, JSONL for stdin)'
+    )
+    score_parser.add_argument(
+        '--resume',
+        default='resume.md',
+        help='Resume markdown file to score against (default: resume.md)'
+    )
+    score_parser.add_argument(
+        '--rules',
+        metavar='PATH',
+        help='Scoring rules file (.json, .yaml or .toml); reloaded when it changes during the run'
+    )
+    score_parser.add_argument(
+        '--parse-cache',
+        action='store_true',
+        help='Keep the parsed resume in a <resume>.parsecache sidecar file for faster restarts'
+    )
+    score_parser.add_argument(
+        '-o', '--output',
+        default='-',
+        help="Where to write JSONL results ('-' for stdout, the default)"
+    )
+    score_parser.add_argument(
+        '--workers',
+        type=_positive_int,
+        default=1,
+        help='Number of worker processes to score with (default: 1, no pool)'
+    )
+    score_parser.add_argument(
+        '--chunk-size',
+        type=_positive_int,
+        default=256,
+        help='Postings sent to a worker process per task (default: 256)'
+    )
+    score_parser.add_argument(
+        '--dedupe',
+        action='store_true',
+        help='Skip near-identical postings (same company, position, skills and enums)'
+    )
+    score_parser.add_argument(
+        '--dedupe-capacity',
+        type=_positive_int,
+        default=1000000,
+        help='Expected distinct postings for --dedupe; sets its fixed memory (default: 1000000, ~1.8 MB)'
+    )
+    score_parser.add_argument(
+        '--queue-size',
+        type=_positive_int,
+        default=16,
+        help='Batches of postings read ahead of scoring in a background thread (default: 16)'
+    )
+    score_parser.add_argument(
+        '--store',
+        metavar='DB',
+        help='SQLite result store: reuse results for unchanged postings and record new ones'
+    )
+    score_parser.add_argument(
+        '--letters',
+        metavar='PATH',
+        help='Also generate a cover letter per posting into PATH (.jsonl, .tar or .zip)'
+    )
+    score_parser.add_argument(
+        '--letters-format',
+        choices=['jsonl', 'tar', 'zip'],
+        help='Cover letter output format (default: guessed from the --letters extension)'
+    )
+    score_parser.add_argument(
+        '--fsync-every',
+        type=int,
+        default=1000,
+        help='Letters written between fsyncs (default: 1000)'
+    )
+    score_parser.add_argument(
+        '--shard-size',
+        type=_positive_int,
+        default=10000,
+        help='Letters per tar/zip shard (default: 10000)'
+    )
+    
+    matrix_parser = subparsers.add_parser(
+        'matrix',
+        help='Score a directory of resumes against company_info records into a score matrix'
+    )
+    matrix_parser.add_argument(
+        'resumes',
+        help='Directory of resume markdown (.md) files, one matrix row each'
+    )
+    matrix_parser.add_argument(
+        'input',
+        nargs='?',
+        default='-',
+        help="JSONL or CSV file of company_info records, or a posting catalog "
+             "('-' for stdin, the default)"
+    )
+    matrix_parser.add_argument(
+        '--format',
+        choices=['jsonl', 'csv'],
+        help='Input format (default: guessed from the file extension, JSONL for stdin)'
+    )
+    matrix_parser.add_argument(
+        '-o', '--output',
+        required=True,
+        help='Score matrix file to write (one byte per score, see ScoreMatrix)'
+    )
+    matrix_parser.add_argument(
+        '--workers',
+        type=_positive_int,
+        default=1,
+        help='Number of worker processes parsing and scoring resumes (default: 1, no pool)'
+    )
+    matrix_parser.add_argument(
+        '--rules',
+        metavar='PATH',
+        help='Scoring rules file (.json, .yaml or .toml)'
+    )
+    
+    catalog_parser = subparsers.add_parser(
+        'catalog',
+        help='Convert company_info records into a memory-mapped columnar posting catalog'
+    )
+    catalog_parser.add_argument(
+        'input',
+        nargs='?',
+        default='-',
+        help="JSONL or CSV file of company_info records, optionally .gz or .zst compressed "
+             "('-' for stdin, the default)"
+    )
+    catalog_parser.add_argument(
+        '--format',
+        choices=['jsonl', 'csv'],
+        help='Input format (default: guessed from the file extension, JSONL for stdin)'
+    )
+    catalog_parser.add_argument(
+        '-o', '--output',
+        required=True,
+        help='Catalog file to write (see ColumnarCatalog)'
+    )
+    catalog_parser.add_argument(
+        '--dedupe',
+        action='store_true',
+        help='Skip near-identical postings (same company, position, skills and enums)'
+    )
+    catalog_parser.add_argument(
+        '--dedupe-capacity',
+        type=_positive_int,
+        default=1000000,
+        help='Expected distinct postings for --dedupe; sets its fixed memory (default: 1000000, ~1.8 MB)'
+    )
+    
     args = parser.parse_args()
     
+    metrics_path = args.metrics or os.environ.get('RESUME_MAILER_METRICS')
+    metrics = instrument() if metrics_path else None
+    try:
+        if args.profile:
+            return run_profiled(lambda: run_command(args), args.profile, args.profile_interval)
+        return run_command(args)
+    finally:
+        if metrics is not None:
+            uninstrument()
+            metrics.write(metrics_path, args.metrics_format)
+
+
+def run_command(args):
+    """Dispatch parsed command-line arguments to the selected mode."""
+    if args.command == 'score':
+        return score_command(args)
+    if args.command == 'matrix':
+        return matrix_command(args)
+    if args.command == 'catalog':
+        return catalog_command(args)
+    
     if args.non_interactive:
         print("Non-interactive mode selected. Use without this flag for full functionality.")
         return
@@ -732,4 +4346,4 @@ Examples:
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by test_resume_mailer.py and benchmark_resume_mailer.py:
+a local SMTP sink and the pre-profile experience and culture scoring used
+as a reference for the tabulated versions.
+"""
+
+import socketserver
+import threading
+import time
+
+from resume_mailer import CompanyAssessment
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Minimal SMTP stand-in on localhost that accepts any login and records messages."""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, delay=0.0):
+        """
+        Args:
+            delay: Seconds to wait before accepting each message, to mimic network latency
+        """
+        super().__init__(('127.0.0.1', 0), LocalSMTPHandler)
+        self.port = self.server_address[1]
+        self.delay = delay
+        self.messages = []
+        self.connections = 0
+        self.sockets = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+    
+    def config(self):
+        """EmailSender config pointing at this server."""
+        return {
+            'smtp_server': '127.0.0.1',
+            'smtp_port': self.port,
+            'sender_email': 'sender@example.com',
+            'sender_password': 'secret',
+            'use_tls': False,
+        }
+    
+    def drop_connections(self):
+        """Close every client connection, as a server-side idle timeout would."""
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+            sock.close()
+    
+    def stop(self):
+        self.drop_connections()
+        self.shutdown()
+        self.server_close()
+
+
+class LocalSMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: EHLO, AUTH, MAIL, RCPT, DATA, NOOP, RSET, QUIT."""
+    
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+    
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.sockets.append(self.connection)
+        self.reply('220 localhost ESMTP test server')
+        data_lines = None
+        try:
+            for raw in self.rfile:
+                line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+                if data_lines is not None:
+                    if line == '.':
+                        time.sleep(self.server.delay)
+                        with self.server.lock:
+                            self.server.messages.append('\n'.join(data_lines))
+                        data_lines = None
+                        self.reply('250 OK queued')
+                    else:
+                        data_lines.append(line[1:] if line.startswith('..') else line)
+                    continue
+                
+                verb = line.split(' ', 1)[0].upper()
+                if verb == 'EHLO':
+                    self.reply('250-localhost')
+                    self.reply('250 AUTH PLAIN LOGIN')
+                elif verb == 'HELO':
+                    self.reply('250 localhost')
+                elif verb == 'AUTH':
+                    self.reply('235 Authentication successful')
+                elif verb == 'DATA':
+                    data_lines = []
+                    self.reply('354 End data with <CR><LF>.<CR><LF>')
+                elif verb == 'QUIT':
+                    self.reply('221 Bye')
+                    return
+                else:
+                    self.reply('250 OK')
+        except OSError:
+            pass
+
+
+def reference_experience_relevance(resume_data, industry, position):
+    """CompanyAssessment._assess_experience_relevance as it was before the resume profile."""
+    score = 0
+    position_level = CompanyAssessment._position_level(position)
+    industry_keywords = {
+        'tech': ['software', 'developer', 'engineer', 'devops'],
+        'ecommerce': ['ecommerce', 'e-commerce', 'shopify', 'retail', 'online'],
+        'finance': ['financial', 'banking', 'fintech'],
+        'automotive': ['automotive', 'cars', 'vehicle']
+    }
+    relevant_jobs = 0
+    for job in resume_data['experience']:
+        job_text = (job['title'] + ' ' + job['company']).lower()
+        if industry.lower() in industry_keywords:
+            if any(keyword in job_text for keyword in industry_keywords[industry.lower()]):
+                relevant_jobs += 1
+        if position_level == 'senior':
+            if any(term in job_text for term in ['lead', 'senior', 'engineer']):
+                score += 5
+        elif position_level == 'junior':
+            score += 8
+    if relevant_jobs > 0:
+        score += min(relevant_jobs * 8, 20)
+    else:
+        score += 10
+    return min(score, 30)
+
+
+def reference_culture_fit(resume_data, company_size, work_culture):
+    """CompanyAssessment._assess_culture_fit as it was before the resume profile."""
+    score = 0
+    has_startup_exp = has_enterprise_exp = has_small_business_exp = False
+    for job in resume_data['experience']:
+        company_lower = job['company'].lower()
+        title_lower = job['title'].lower()
+        dates_lower = job['dates'].lower()
+        startup_keywords = ['mobile', 'app', 'ios', 'android', 'tech', 'software']
+        if any(keyword in company_lower or keyword in title_lower for keyword in startup_keywords):
+            if 'present' in dates_lower or any(str(year) in dates_lower for year in [2024, 2025]):
+                has_startup_exp = True
+        if 'intern' in title_lower:
+            has_enterprise_exp = True
+        if 'lead' in title_lower or 'owner' in company_lower:
+            has_small_business_exp = True
+    if company_size.lower() == 'startup' and has_startup_exp:
+        score += 8
+    elif company_size.lower() == 'enterprise' and has_enterprise_exp:
+        score += 8
+    elif company_size.lower() == 'medium' and (has_small_business_exp or has_enterprise_exp):
+        score += 7
+    else:
+        score += 5
+    if work_culture.lower() == 'fast-paced':
+        if has_startup_exp or 'CI/CD' in str(resume_data['skills']):
+            score += 7
+        else:
+            score += 5
+    else:
+        score += 6
+    return min(score, 15)
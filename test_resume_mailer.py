@@ -4,8 +4,53 @@ Test script for resume_mailer.py
 Tests the core functionality without requiring user interaction.
 """
 
+import asyncio
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
 import sys
-from resume_mailer import ResumeParser, CompanyAssessment, CoverLetterGenerator
+import tempfile
+import threading
+import time
+from resume_mailer import (
+    ResumeParser, CompanyAssessment, CoverLetterGenerator,
+    read_postings, score_postings, ParallelAssessment, SkillIndex,
+    ParseCache, tokenize_sections, EmailSender, AsyncEmailSender, AttachmentCache,
+    CoverLetterTemplate, open_letter_writer, ResultStore, resume_fingerprint,
+    PostingIndex, ScoreMatrix, score_matrix, Metrics, instrument, uninstrument,
+    run_profiled, SamplingProfiler, normalize_posting, PostingDeduplicator, BloomFilter,
+    open_feed, ingest_postings, prefetch, Posting, PostingCatalog, ColumnarCatalog,
+    ScoringRules, DEFAULT_SCORING_RULES,
+)
+from resume_mailer_testing import LocalSMTPServer, reference_experience_relevance, reference_culture_fit
+
+
+SAMPLE_SKILLS = ['Swift', 'Python', 'AWS', 'Docker', 'React', 'Kubernetes', 'SQL', 'Go',
+                 'CI/CD', 'TensorFlow', 'Rust', 'Clinical Research', 'js', 'Django']
+SAMPLE_POSITIONS = ['Senior iOS Developer', 'DevOps Engineer', 'Junior Analyst',
+                    'Lead Data Engineer', 'Entry Level Developer', 'Product Manager']
+
+
+def sample_postings(count):
+    """Build a deterministic mix of company_info dicts covering every scoring branch."""
+    industries = ['tech', 'ecommerce', 'finance', 'automotive', 'healthcare', 'Tech', '']
+    sizes = ['startup', 'medium', 'enterprise', 'Startup', '']
+    cultures = ['fast-paced', 'balanced', 'traditional', 'Fast-Paced']
+    postings = []
+    for i in range(count):
+        postings.append({
+            'company_name': f'Company {i}',
+            'position': SAMPLE_POSITIONS[i % len(SAMPLE_POSITIONS)],
+            'required_skills': [SAMPLE_SKILLS[(i * 3 + j) % len(SAMPLE_SKILLS)] for j in range(i % 7)],
+            'industry': industries[i % len(industries)],
+            'company_size': sizes[i % len(sizes)],
+            'work_culture': cultures[i % len(cultures)],
+            'remote_policy': 'remote',
+        })
+    return postings
 
 
 def test_resume_parser():
@@ -125,6 +170,1261 @@ def test_cover_letter_generator(parser, company_info, assessment_result):
     print()
 
 
+def test_batch_scoring():
+    """Test streaming batch scoring of JSONL and CSV postings."""
+    print("Testing Batch Scoring...")
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    
+    jsonl_input = io.StringIO(
+        '{"company_name": "AppCo", "position": "iOS Developer", "required_skills": ["Swift", "SwiftUI"], '
+        '"industry": "tech", "company_size": "startup", "work_culture": "fast-paced"}\n'
+        '\n'
+        'not json\n'
+        '{"company_name": "ShopTech", "required_skills": "Python, AWS, Docker", "industry": "ecommerce"}\n'
+    )
+    records = list(read_postings(jsonl_input))
+    assert [line for line, _, _ in records] == [1, 3, 4], "Line numbers not tracked correctly"
+    assert records[1][1] is None and records[1][2], "Invalid JSON line should be reported"
+    assert records[2][1]['required_skills'] == ['Python', 'AWS', 'Docker'], "Skill string not split"
+    
+    csv_input = io.StringIO(
+        'company_name,position,required_skills,industry,company_size,work_culture,remote_policy\n'
+        'AppCo,iOS Developer,"Swift, SwiftUI",tech,startup,fast-paced,remote\n'
+    )
+    (_, csv_info, _), = read_postings(csv_input, 'csv')
+    json_info = records[0][1]
+    
+    results = list(score_postings(assessment, [json_info, csv_info]))
+    assert results[0]['company_name'] == 'AppCo', "Results should be tagged with the company name"
+    assert results[0]['total_score'] == assessment.calculate_success_score(json_info)['total_score']
+    assert results[0]['breakdown'] == results[1]['breakdown'], "JSONL and CSV inputs should score the same"
+    json.dumps(results[0])
+    
+    print("✓ Batch Scoring tests passed")
+    print(f"  - Scored {len(results)} postings, first score: {results[0]['total_score']}/100")
+    print()
+
+
+def test_parallel_assessment():
+    """Test that the process-pool engine matches the serial path exactly."""
+    print("Testing Parallel Assessment...")
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    postings = sample_postings(50)
+    
+    serial = [assessment.calculate_success_score(info) for info in postings]
+    with ParallelAssessment(parser.data, workers=2, chunk_size=7) as engine:
+        parallel = engine.score(postings)
+        pairs = list(engine.iter_scores(iter(postings)))
+    
+    assert parallel == serial, "Parallel results differ from the serial path"
+    assert [info for info, _ in pairs] == postings, "Results are not in input order"
+    
+    print("✓ Parallel Assessment tests passed")
+    print(f"  - {len(parallel)} postings scored identically across 2 workers")
+    print()
+
+
+def test_skill_index():
+    """Test that the skill index matches the original two-way substring scan."""
+    print("Testing Skill Index...")
+    
+    def substring_scan(candidate_skills, required_skills):
+        candidates = [c.lower() for c in candidate_skills]
+        pairs = []
+        for required_skill in required_skills:
+            for candidate in candidates:
+                if required_skill.lower() in candidate or candidate in required_skill.lower():
+                    pairs.append((required_skill, candidate))
+                    break
+        return pairs
+    
+    rng = random.Random(42)
+    for _ in range(500):
+        candidates = [''.join(rng.choice('abcd') for _ in range(rng.randint(0, 5)))
+                      for _ in range(rng.randint(0, 6))]
+        required = [''.join(rng.choice('abcdAB') for _ in range(rng.randint(0, 7))) for _ in range(8)]
+        index = SkillIndex(candidates)
+        assert index.match(required) == substring_scan(candidates, required), \
+            f"Index disagrees with substring scan for {candidates} / {required}"
+    
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    pairs = assessment.matched_skills(['Swift', 'AWS', 'Cobol', 'Django REST'])
+    assert [required for required, _ in pairs] == ['Swift', 'AWS', 'Django REST'], f"Unexpected matches: {pairs}"
+    assert pairs[2] == ('Django REST', 'django'), f"Unexpected match for Django REST: {pairs[2]}"
+    
+    print("✓ Skill Index tests passed")
+    print(f"  - Matched pairs: {pairs}")
+    print()
+
+
+def test_score_many():
+    """Test that columnar batch scoring agrees with calculate_success_score."""
+    print("Testing Columnar Batch Scoring...")
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    postings = sample_postings(200)
+    
+    columns = assessment.score_many(postings)
+    for i, company_info in enumerate(postings):
+        expected = assessment.calculate_success_score(company_info)
+        for component, value in expected['breakdown'].items():
+            assert columns[component][i] == value, f"{component} differs for posting {i}"
+        assert columns['total_score'][i] == expected['total_score'], f"Total differs for posting {i}"
+        assert columns['recommendation'][i] == expected['recommendation'], f"Recommendation differs for posting {i}"
+    
+    assert list(assessment.score_many([])['total_score']) == [], "Empty batch should give empty columns"
+    
+    print("✓ Columnar Batch Scoring tests passed")
+    print(f"  - {len(postings)} postings agree with calculate_success_score")
+    print()
+
+
+def test_parse_cache():
+    """Test cached and incremental resume parsing."""
+    print("Testing Parse Cache...")
+    workdir = tempfile.mkdtemp()
+    try:
+        resume_path = os.path.join(workdir, 'resume.md')
+        shutil.copy('resume.md', resume_path)
+        uncached = ResumeParser(resume_path, cache=False)
+        
+        cache = ParseCache(sidecar=True)
+        first = ResumeParser(resume_path, cache=cache)
+        assert first.data == uncached.data, "Cached parse differs from a full parse"
+        assert first.content_hash == uncached.content_hash, "Content hash not recorded"
+        first.data['name'] = 'Mutated'
+        assert ResumeParser(resume_path, cache=cache).data == uncached.data, "Cache returned shared data"
+        assert os.path.exists(cache.sidecar_path(resume_path)), "Sidecar file not written"
+        
+        with open(resume_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        with open(resume_path, 'w', encoding='utf-8') as f:
+            f.write(content.replace('**BS in Mathematics**', '**BS in Physics**'))
+        
+        extracted = []
+        original_extract = ResumeParser._extract_experience
+        ResumeParser._extract_experience = lambda self, text: extracted.append(text) or original_extract(self, text)
+        try:
+            updated = ResumeParser(resume_path, cache=cache)
+        finally:
+            ResumeParser._extract_experience = original_extract
+        
+        assert not extracted, "Unchanged Experience section was re-extracted"
+        assert updated.data == ResumeParser(resume_path, cache=False).data, "Incremental parse differs from a full parse"
+        assert updated.data['education'][1]['degree'] == 'BS in Physics', "Changed section not re-extracted"
+        
+        warm = ResumeParser(resume_path, cache=ParseCache(sidecar=True))
+        assert warm.data == updated.data, "Sidecar did not round-trip"
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Parse Cache tests passed")
+    print()
+
+
+def test_tokenize_sections():
+    """Test the single-pass section tokenizer."""
+    print("Testing Section Tokenizer...")
+    content = (
+        "# Name\n"
+        "intro\n"
+        "## Summary  \n"
+        "\n"
+        "Body line\n"
+        "\n"
+        "### Sub Heading\n"
+        "nested\n"
+        "## Empty\n"
+        "## Summary\n"
+        "duplicate"
+    )
+    sections = tokenize_sections(content)
+    assert list(sections) == ['Summary', 'Sub Heading', 'Empty'], f"Unexpected sections: {list(sections)}"
+    assert sections['Summary'] == "Body line\n", f"Unexpected body: {sections['Summary']!r}"
+    assert sections['Sub Heading'] == "nested", "Section should end before the next heading"
+    assert sections['Empty'] == "", "Empty section should not absorb the next one"
+    assert tokenize_sections("no headings") == {}, "Document without headings has no sections"
+    
+    with open('resume.md', 'r', encoding='utf-8') as f:
+        resume_sections = tokenize_sections(f.read())
+    for title in ['Professional Summary', 'Technical Skills', 'Experience', 'Projects', 'Education']:
+        assert title in resume_sections, f"Section {title} not found in resume.md"
+    
+    print("✓ Section Tokenizer tests passed")
+    print(f"  - resume.md sections: {len(resume_sections)}")
+    print()
+
+
+def test_email_connection_pool():
+    """Test SMTP connection reuse, keepalive checks and reconnects."""
+    print("Testing Email Connection Pool...")
+    server = LocalSMTPServer()
+    sender = EmailSender(config_path='missing_email_config.json')
+    sender.config.update(server.config())
+    try:
+        messages = [{
+            'recipient_email': f'hiring{i}@example.com',
+            'subject': f'Application {i}',
+            'cover_letter': 'Dear Hiring Manager,\n\nHello.\n',
+        } for i in range(5)]
+        results = sender.send_many(messages)
+        assert all(success for success, _ in results), f"Bulk send failed: {results}"
+        assert len(server.messages) == 5, f"Expected 5 delivered messages, got {len(server.messages)}"
+        assert server.connections == 1, f"Expected one reused connection, got {server.connections}"
+        assert 'attachment; filename= resume.pdf' in server.messages[0], "Resume not attached"
+        
+        # Server drops the idle session: the failed send reconnects and retries.
+        server.drop_connections()
+        success, message = sender.send_resume('late@example.com', 'Late', 'Hello.')
+        assert success, f"Send after disconnect failed: {message}"
+        assert server.connections == 2, "Dropped connection was not replaced"
+        
+        # With an immediate keepalive check, the dead session is caught by NOOP instead.
+        server.drop_connections()
+        sender.pool.noop_after = 0
+        success, message = sender.send_resume('noop@example.com', 'Noop', 'Hello.')
+        assert success, f"Send after NOOP check failed: {message}"
+        assert server.connections == 3, "Dead connection was not detected by NOOP"
+        
+        success, message = sender.send_resume('x@example.com', 'Missing', 'Hello.', resume_path='missing.pdf')
+        assert not success and 'not found' in message, "Missing resume should be reported"
+    finally:
+        sender.close()
+        server.stop()
+    
+    print("✓ Email Connection Pool tests passed")
+    print(f"  - {len(server.messages)} messages over {server.connections} connections")
+    print()
+
+
+def test_async_email_sender():
+    """Test concurrent asyncio sending with a rate limit."""
+    print("Testing Async Email Sender...")
+    server = LocalSMTPServer(delay=0.05)
+    messages = [{
+        'recipient_email': f'hiring{i}@example.com',
+        'subject': f'Application {i}',
+        'cover_letter': 'Dear Hiring Manager,\n\nHello.\n',
+    } for i in range(8)]
+    
+    async def send(sender, batch):
+        async with sender:
+            return await sender.send_many(batch)
+    
+    try:
+        sender = AsyncEmailSender(config_path='missing_email_config.json', concurrency=4)
+        sender.config.update(server.config())
+        start = time.perf_counter()
+        results = asyncio.run(send(sender, messages))
+        elapsed = time.perf_counter() - start
+        assert all(success for success, _ in results), f"Async send failed: {results}"
+        assert [message for _, message in results] == [
+            f"Email sent successfully to hiring{i}@example.com" for i in range(8)
+        ], "Results are not in input order"
+        assert server.connections <= 4, f"Too many connections: {server.connections}"
+        assert elapsed < 8 * server.delay, f"Sends did not overlap ({elapsed:.2f}s)"
+        
+        server.delay = 0
+        limited = AsyncEmailSender(config_path='missing_email_config.json', concurrency=4, rate_limit=20)
+        limited.config.update(server.config())
+        start = time.perf_counter()
+        results = asyncio.run(send(limited, messages[:5]))
+        limited_elapsed = time.perf_counter() - start
+        assert all(success for success, _ in results), f"Rate-limited send failed: {results}"
+        assert limited_elapsed >= 0.19, f"Rate limit not applied ({limited_elapsed:.2f}s for 5 at 20/s)"
+        
+        # One sender (and its token bucket) reused across event loops
+        reused = AsyncEmailSender(config_path='missing_email_config.json', concurrency=2, rate_limit=50)
+        reused.config.update(server.config())
+        try:
+            for _ in range(2):
+                results = asyncio.run(reused.send_many(messages[:4]))
+                assert all(success for success, _ in results), f"Send on a second event loop failed: {results}"
+        finally:
+            reused.close()
+    finally:
+        server.stop()
+    
+    print("✓ Async Email Sender tests passed")
+    print(f"  - 8 messages in {elapsed:.2f}s with 4 in flight")
+    print()
+
+
+def test_attachment_cache():
+    """Test that resume attachments are encoded once and refreshed when the file changes."""
+    print("Testing Attachment Cache...")
+    from email import encoders
+    from email.mime.base import MIMEBase
+    
+    with open('resume.pdf', 'rb') as f:
+        expected = MIMEBase('application', 'octet-stream')
+        expected.set_payload(f.read())
+        encoders.encode_base64(expected)
+        expected.add_header('Content-Disposition', 'attachment; filename= resume.pdf')
+    
+    cache = AttachmentCache()
+    assert cache.mime_part('resume.pdf').as_string() == expected.as_string(), "Cached part differs from encode_base64"
+    assert cache.encoded_payload('resume.pdf') is cache.encoded_payload('resume.pdf'), "Payload was re-encoded"
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, 'portfolio.pdf')
+        with open(path, 'wb') as f:
+            f.write(b'%PDF' * 10)
+        first = cache.encoded_payload(path)
+        with open(path, 'wb') as f:
+            f.write(b'%PDF' * 20)
+        second = cache.encoded_payload(path)
+        assert first != second, "Changed file was served from the cache"
+        
+        big_cache = AttachmentCache()
+        big_cache.MMAP_THRESHOLD = 1
+        assert big_cache.encoded_payload(path) == second, "Memory-mapped encoding differs"
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Attachment Cache tests passed")
+    print()
+
+
+EXPECTED_ECOMMERCE_LETTER = """Nikou Zarrabi
+zarrabinikou@gmail.com | (404) 433-4290
+
+{date}
+
+Hiring Manager
+ShopTech
+
+Dear Hiring Manager,
+
+I am writing to express my strong interest in the DevOps Engineer position at ShopTech. \
+As a Applied ML & Computer Vision Engineer (Football Analytics) with a proven track record in ecommerce, \
+I am excited about the opportunity to contribute to your team.
+
+My technical expertise aligns well with your requirements. I bring extensive experience in AWS, CI/CD, and Docker. \
+I have extensive experience building automated infrastructure for product listings across multiple platforms, \
+significantly reducing manual processing time and improving operational efficiency. 
+
+I am particularly drawn to this opportunity because of my technical expertise in aws, ci/cd, docker, \
+as well as my e-commerce platform experience and automation skills. \
+I am confident that my background and skills make me a strong candidate for this role, \
+and I excel in collaborative environments with established processes.
+
+I would welcome the opportunity to discuss how my experience and skills can contribute to ShopTech's success. \
+Thank you for considering my application.
+
+Sincerely,
+Nikou Zarrabi
+"""
+
+
+def test_cover_letter_template():
+    """Test the compiled cover letter template and custom templates."""
+    print("Testing Cover Letter Template...")
+    from datetime import datetime
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    company_info = {
+        'company_name': 'ShopTech',
+        'position': 'DevOps Engineer',
+        'required_skills': ['AWS', 'CI/CD', 'Docker', 'Python'],
+        'industry': 'ecommerce',
+        'company_size': 'enterprise',
+        'work_culture': 'balanced',
+        'remote_policy': 'hybrid'
+    }
+    result = assessment.calculate_success_score(company_info)
+    
+    letter = CoverLetterGenerator(parser.data).generate(company_info, result)
+    expected = EXPECTED_ECOMMERCE_LETTER.format(date=datetime.now().strftime("%B %d, %Y"))
+    assert letter == expected, "Default template output changed"
+    
+    custom = CoverLetterGenerator(parser.data, template="{name} -> {company_name:>10}|{position!r} {{ok}}")
+    assert custom.generate(company_info, result) == "Nikou Zarrabi ->   ShopTech|'DevOps Engineer' {ok}", \
+        "Custom template rendered incorrectly"
+    
+    try:
+        CoverLetterTemplate("Hello {salary}")
+        assert False, "Unknown slot should be rejected"
+    except ValueError:
+        pass
+    
+    print("✓ Cover Letter Template tests passed")
+    print()
+
+
+def test_letter_writers():
+    """Test streaming cover letters into JSONL and sharded archives."""
+    print("Testing Letter Writers...")
+    import tarfile
+    import types
+    import zipfile
+    
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    generator = CoverLetterGenerator(parser.data)
+    postings = sample_postings(5)
+    
+    letters = generator.generate_many(assessment.iter_scores(postings))
+    assert isinstance(letters, types.GeneratorType), "generate_many should be lazy"
+    letters = list(letters)
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        jsonl_path = os.path.join(workdir, 'letters.jsonl')
+        with open_letter_writer(jsonl_path, fsync_every=2) as writer:
+            assert writer.write_all(iter(letters)) == 5, "Not every letter was written"
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert [r['letter'] for r in records] == [letter for _, letter in letters], "JSONL letters differ"
+        assert records[0]['filename'] == 'cover_letter_company_0.txt', f"Unexpected filename {records[0]['filename']}"
+        
+        for fmt in ['tar', 'zip']:
+            path = os.path.join(workdir, f'letters.{fmt}')
+            with open_letter_writer(path, shard_size=2) as writer:
+                writer.write_all(letters)
+            assert [os.path.basename(shard) for shard in writer.shards] == [
+                f'letters-0000{i}.{fmt}' for i in range(3)
+            ], f"Unexpected {fmt} shards: {writer.shards}"
+            if fmt == 'tar':
+                with tarfile.open(writer.shards[2]) as archive:
+                    names = archive.getnames()
+                    content = archive.extractfile(names[0]).read().decode('utf-8')
+            else:
+                with zipfile.ZipFile(writer.shards[2]) as archive:
+                    names = archive.namelist()
+                    content = archive.read(names[0]).decode('utf-8')
+            assert names == ['00000004_cover_letter_company_4.txt'], f"Unexpected {fmt} members: {names}"
+            assert content == letters[4][1], f"{fmt} letter content differs"
+        
+        for fmt in ['tar', 'zip']:
+            path = os.path.join(workdir, f'unsafe.{fmt}')
+            with open_letter_writer(path) as writer:
+                for company_name in ['x/../../evil', 'x\\..\\evil', '..']:
+                    writer.write({'company_name': company_name}, 'letter')
+            if fmt == 'tar':
+                with tarfile.open(writer.shards[0]) as archive:
+                    names = archive.getnames()
+            else:
+                with zipfile.ZipFile(writer.shards[0]) as archive:
+                    names = archive.namelist()
+            assert not any(c in name for name in names for c in ('/', '\\', '..')), \
+                f"Unsafe {fmt} member names: {names}"
+        
+        try:
+            open_letter_writer(os.path.join(workdir, 'empty.tar'), shard_size=0)
+            assert False, "A shard size below 1 should be rejected"
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Letter Writers tests passed")
+    print()
+
+
+def test_result_store():
+    """Test that stored assessments are reused and can be looked up."""
+    print("Testing Result Store...")
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    resume_hash = resume_fingerprint(parser.data)
+    postings = sample_postings(20)
+    
+    class CountingAssessment:
+        def __init__(self):
+            self.scored = 0
+        
+        def iter_scores(self, company_infos):
+            for company_info, result in assessment.iter_scores(company_infos):
+                self.scored += 1
+                yield company_info, result
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, 'assessments.db')
+        counting = CountingAssessment()
+        with ResultStore(path, batch_size=6) as store:
+            first = list(store.iter_scores(counting, postings, resume_hash))
+        assert counting.scored == 20, "Every posting should be scored on the first run"
+        
+        changed = dict(postings[3], company_size='enterprise')
+        rerun_postings = postings[:3] + [changed] + postings[4:]
+        with ResultStore(path, batch_size=6) as store:
+            rerun = list(store.iter_scores(counting, rerun_postings, resume_hash))
+            assert counting.scored == 21, "Only the changed posting should be re-scored"
+            assert store.hits == 19 and store.misses == 1, f"Unexpected hits/misses {store.hits}/{store.misses}"
+            assert [info for info, _ in rerun] == rerun_postings, "Results are not in input order"
+            assert [r for _, r in rerun] == [assessment.calculate_success_score(i) for i in rerun_postings], \
+                "Stored results differ from fresh ones"
+            assert rerun[0][1] == first[0][1], "Unchanged posting should return the stored result"
+            
+            assert store.get(postings[0], 'other-resume') is None, "A different resume must not hit the store"
+            
+            company_name = postings[0]['company_name']
+            found = store.find(company_name=company_name)
+            assert len(found) == 1 and found[0]['company_info'] == postings[0], "Lookup by company failed"
+            assert found[0]['breakdown'] == first[0][1]['breakdown'], "Breakdown not stored"
+            
+            scores = [r['total_score'] for _, r in first] + [rerun[3][1]['total_score']]
+            ranged = store.find(min_score=50, max_score=80)
+            assert all(50 <= r['total_score'] <= 80 for r in ranged), "Score range filter ignored"
+            assert len(ranged) == sum(50 <= s <= 80 for s in scores), "Score range lookup missed rows"
+            assert len(store.find(since=time.time() + 60)) == 0, "Date filter ignored"
+            assert len(store.find(until=time.time() + 60)) == 21, "Every stored row should be found by date"
+        
+        # Results are keyed on the scoring rules as well as the resume
+        rules_path = os.path.join(workdir, 'rules.json')
+        with open(rules_path, 'w') as f:
+            json.dump({'weights': {'skills_match': 5}}, f)
+        rules = ScoringRules.from_file(rules_path)
+        rules.check_interval = 0
+        custom = CompanyAssessment(parser.data, rules=rules)
+        with ResultStore(path, batch_size=6) as store:
+            custom_results = list(store.iter_scores(custom, postings))
+            assert store.hits == 0 and store.misses == 20, "Other rules must not reuse default results"
+            assert [r for _, r in custom_results] == [custom.calculate_success_score(i) for i in postings], \
+                "Results under custom rules differ from fresh ones"
+            assert custom_results[0][1]['total_score'] != first[0][1]['total_score'], \
+                "Custom rules should change the score"
+            list(store.iter_scores(custom, postings))
+            assert store.hits == 20, "Results under the same rules should be reused"
+        
+            with open(rules_path, 'w') as f:
+                json.dump({'weights': {'skills_match': 10}}, f)
+            os.utime(rules_path, ns=(0, 0))
+            reloaded = list(store.iter_scores(custom, postings))
+            assert store.hits == 20 and store.misses == 40, "Reloaded rules must miss the store"
+            assert reloaded[0][1] != custom_results[0][1], "Reloaded rules were not applied"
+        
+            list(store.iter_scores(assessment, postings, resume_hash))
+            assert store.hits == 40, "Default results should still be stored under the resume hash"
+        
+        # Rewriting the rules file mid-stream with worker processes must never
+        # store a result under the key of rules it was not scored with
+        with open(rules_path, 'w') as f:
+            json.dump({'weights': {'skills_match': 5}}, f)
+        os.utime(rules_path, ns=(10 ** 18, 10 ** 18))
+        many = sample_postings(120)
+        parallel_rules = ScoringRules.from_file(rules_path)
+        parallel_rules.check_interval = 0
+        
+        class RewritingAssessment:
+            """Rewrites the rules file after the store has keyed its third batch."""
+            
+            def __init__(self, parallel):
+                self.parallel = parallel
+                self.resume_data = parallel.resume_data
+                self.rules = parallel.rules
+                self.batches = 0
+            
+            def iter_scores(self, company_infos):
+                self.batches += 1
+                if self.batches == 3:
+                    with open(rules_path, 'w') as f:
+                        json.dump({'weights': {'skills_match': 10}}, f)
+                    os.utime(rules_path, ns=(2 * 10 ** 18, 2 * 10 ** 18))
+                return self.parallel.iter_scores(company_infos)
+        
+        with ParallelAssessment(parser.data, workers=2, chunk_size=7, rules=parallel_rules) as parallel, \
+                ResultStore(path, batch_size=20) as store:
+            streamed = list(store.iter_scores(RewritingAssessment(parallel), many))
+        assert parallel_rules.version == 1, "The rules file should have been reloaded"
+        assert [r for _, r in streamed][-1] == \
+            CompanyAssessment(parser.data, rules={'weights': {'skills_match': 10}}).calculate_success_score(many[-1])
+        for weights in [{'skills_match': 5}, {'skills_match': 10}]:
+            pinned = CompanyAssessment(parser.data, rules={'weights': weights})
+            with ResultStore(path, batch_size=20) as store:
+                served = list(store.iter_scores(pinned, many))
+                assert store.hits > 0, f"Nothing was stored under {weights}"
+            assert [r for _, r in served] == [pinned.calculate_success_score(i) for i in many], \
+                f"A result stored under {weights} was scored with other rules"
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Result Store tests passed")
+    print()
+
+
+def test_assessment_cache():
+    """Test the LRU score cache: canonical keys, counters, eviction and invalidation."""
+    print("Testing Assessment Cache...")
+    import copy
+    parser = ResumeParser()
+    uncached = CompanyAssessment(parser.data, cache_size=0)
+    assessment = CompanyAssessment(parser.data, cache_size=8)
+    postings = sample_postings(30)
+    
+    for info in postings + postings:
+        assert assessment.calculate_success_score(info) == uncached.calculate_success_score(info), \
+            f"Cached result differs for {info['company_name']}"
+    info = assessment.cache_info()
+    assert info['hits'] + info['misses'] == 60, f"Unexpected counters {info}"
+    assert info['size'] <= 8 and info['evictions'] == info['misses'] - info['size'], f"Bad eviction count {info}"
+    
+    posting = {'company_name': 'AppCo', 'position': 'Senior iOS Developer',
+               'required_skills': ['Swift', 'AWS', 'Cobol'], 'industry': 'Tech',
+               'company_size': 'Startup', 'work_culture': 'fast-paced'}
+    repost = dict(posting, required_skills=['cobol', 'SWIFT', 'aws'], industry='tech', company_size='startup')
+    first = assessment.calculate_success_score(posting)
+    hits = assessment.cache_info()['hits']
+    second = assessment.calculate_success_score(repost)
+    assert assessment.cache_info()['hits'] == hits + 1, "Reordered/recased repost should hit the cache"
+    assert second == uncached.calculate_success_score(repost), "Emphasis areas must follow the repost's own skills"
+    second['breakdown']['skills_match'] = 0
+    assert assessment.calculate_success_score(posting) == first, "Callers must not be able to corrupt the cache"
+    
+    no_skills = dict(posting, required_skills=None)
+    for scorer in [assessment, uncached]:
+        assert scorer.calculate_success_score(no_skills) == scorer.calculate_success_score(
+            dict(posting, required_skills=[])), "Null required_skills should score as no skills"
+    assert assessment.score_many([no_skills]) == assessment.score_many([dict(posting, required_skills=[])])
+    
+    changed = copy.deepcopy(parser.data)
+    changed['skills'] = {'Languages': ['Cobol']}
+    assessment.resume_data = changed
+    assert assessment.cache_info()['size'] == 0, "Changing resume_data should clear the cache"
+    assert assessment.calculate_success_score(posting) == \
+        CompanyAssessment(changed, cache_size=0).calculate_success_score(posting), "Stale score after resume change"
+    
+    print("✓ Assessment Cache tests passed")
+    print(f"  - {assessment.cache_info()}")
+    print()
+
+
+def test_top_k():
+    """Test that top_k matches a full sort and skips postings that cannot make the cut."""
+    print("Testing Top-K Ranking...")
+    parser = ResumeParser()
+    
+    class CountingAssessment(CompanyAssessment):
+        skills_scored = 0
+        
+        def _assess_skills_match(self, required_skills):
+            self.skills_scored += 1
+            return super()._assess_skills_match(required_skills)
+    
+    postings = sample_postings(200)
+    for i in range(0, 200, 40):
+        postings[i] = dict(postings[i - 1], company_name=f'Duplicate {i}')  # ties across the catalog
+    reference = CompanyAssessment(parser.data, cache_size=0)
+    results = [reference.calculate_success_score(info) for info in postings]
+    ranked = sorted(range(len(postings)), key=lambda i: -results[i]['total_score'])
+    
+    for k in [1, 5, 50, 500]:
+        top = CompanyAssessment(parser.data).top_k(iter(postings), k)
+        assert [index for index, _, _ in top] == ranked[:k], f"top_k({k}) order differs from a full sort"
+        assert all(result == results[index] and info is postings[index] for index, info, result in top), \
+            f"top_k({k}) results differ from calculate_success_score"
+    assert CompanyAssessment(parser.data).top_k(postings, 0) == [], "k=0 should return nothing"
+    
+    strong = {'company_name': 'ShopTech', 'position': 'Senior DevOps Engineer',
+              'required_skills': ['Python', 'AWS'], 'industry': 'tech',
+              'company_size': 'startup', 'work_culture': 'fast-paced'}
+    weak = {'company_name': 'Weak', 'position': 'Analyst', 'required_skills': ['Swift'],
+            'industry': 'other', 'company_size': 'enterprise', 'work_culture': 'traditional'}
+    assessment = CountingAssessment(parser.data)
+    top = assessment.top_k([strong, strong] + [weak] * 100, 2)
+    assert [index for index, _, _ in top] == [0, 1], "Strong postings should rank first"
+    assert assessment.skills_scored == 2, f"Weak postings should be pruned, scored {assessment.skills_scored}"
+    
+    print("✓ Top-K Ranking tests passed")
+    print()
+
+
+def test_posting_index():
+    """Test the inverted posting index in memory and memory-mapped from disk."""
+    print("Testing Posting Index...")
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data)
+    postings = sample_postings(100)
+    postings.append({'company_name': 'Padded', 'required_skills': ['  Swift ', 'SWIFT']})
+    postings.append({'company_name': 'No Skills', 'required_skills': []})
+    
+    def scan(predicate):
+        return [i for i, info in enumerate(postings) if predicate({s.strip().lower() for s in info['required_skills']})]
+    
+    built = PostingIndex.build(iter(postings))
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, 'postings.idx')
+        built.write(path)
+        with PostingIndex.open(path) as index:
+            for name, idx in [('built', built), ('opened', index)]:
+                assert idx.count == 102, f"{name}: wrong posting count"
+                assert list(idx.postings('Swift')) == scan(lambda skills: 'swift' in skills), f"{name}: wrong list"
+                assert list(idx.postings('COBOL')) == [], f"{name}: unknown skill should be empty"
+                assert list(idx.union(['AWS', 'Go'])) == scan(lambda skills: skills & {'aws', 'go'}), \
+                    f"{name}: wrong union"
+                assert list(idx.intersection(['python', 'docker'])) == \
+                    scan(lambda skills: {'python', 'docker'} <= skills), f"{name}: wrong intersection"
+                candidates = list(idx.candidates(parser.data))
+                assert candidates == [i for i, info in enumerate(postings)
+                                      if info['required_skills'] and
+                                      assessment.calculate_success_score(info)['breakdown']['skills_match'] > 0], \
+                    f"{name}: candidates should be exactly the postings with a skills match"
+        
+        with open(path, 'wb') as f:
+            f.write(b'not an index')
+        try:
+            PostingIndex.open(path)
+            assert False, "A corrupt index should be rejected"
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Posting Index tests passed")
+    print(f"  - {len(built.terms)} skills indexed over {built.count} postings")
+    print()
+
+
+def test_score_matrix():
+    """Test many-resume scoring into a streamed score matrix."""
+    print("Testing Score Matrix...")
+    postings = sample_postings(40)
+    with open('resume.md', 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        resume_paths = []
+        for name, text in [('a_original.md', content),
+                           ('b_no_skills.md', content.replace('## Technical Skills', '## Hobbies')),
+                           ('c_renamed.md', content.replace('# Nikou Zarrabi', '# Someone Else'))]:
+            resume_paths.append(os.path.join(workdir, name))
+            with open(resume_paths[-1], 'w', encoding='utf-8') as f:
+                f.write(text)
+        
+        expected = [[CompanyAssessment(ResumeParser(path, cache=False).data).calculate_success_score(info)['total_score']
+                     for info in postings] for path in resume_paths]
+        
+        for workers in [1, 2]:
+            path = os.path.join(workdir, f'scores-{workers}.matrix')
+            assert score_matrix(resume_paths, iter(postings), path, workers=workers) == (3, 40), \
+                "Unexpected matrix shape"
+            with ScoreMatrix.open(path) as matrix:
+                assert matrix.shape == (3, 40), f"Unexpected shape {matrix.shape}"
+                assert matrix.resumes == ['a_original.md', 'b_no_skills.md', 'c_renamed.md'], matrix.resumes
+                assert matrix.postings[0] == (postings[0]['company_name'], postings[0]['position'])
+                assert [list(matrix.row(i)) for i in range(3)] == expected, \
+                    f"Matrix scores differ from calculate_success_score with {workers} workers"
+                assert matrix.score(2, 5) == expected[2][5], "Single score lookup is wrong"
+        assert expected[0] != expected[1], "Resumes with different skills should score differently"
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Score Matrix tests passed")
+    print()
+
+
+def test_instrumentation():
+    """Test per-stage metrics: wrapping only while on, counts, and both export formats."""
+    print("Testing Instrumentation...")
+    original = CompanyAssessment._assess_skills_match
+    
+    metrics = instrument()
+    try:
+        assert CompanyAssessment._assess_skills_match is not original, "Methods should be wrapped while on"
+        parser = ResumeParser(cache=False)
+        assessment = CompanyAssessment(parser.data, cache_size=0)
+        generator = CoverLetterGenerator(parser.data)
+        for info in sample_postings(5):
+            generator.generate(info, assessment.calculate_success_score(info))
+        with EmailSender(config_path='missing_email_config.json') as sender:
+            sender.send_resume('hiring@example.com', 'Application', 'Hello')
+    finally:
+        uninstrument()
+    assert CompanyAssessment._assess_skills_match is original, "uninstrument should restore the methods"
+    
+    stats = metrics.to_dict()
+    assert stats['parse']['count'] == 1, "Parse not recorded"
+    for stage in ['assess.skills_match', 'assess.experience', 'assess.culture_fit',
+                  'assess.growth_potential', 'generate']:
+        assert stats[stage]['count'] == 5, f"Expected 5 {stage} calls, got {stats[stage]['count']}"
+    assert stats['send']['count'] == 1, "send_resume not recorded"
+    assert stats['generate']['buckets']['+Inf'] == 5, "Histogram buckets should be cumulative"
+    
+    text = metrics.to_prometheus()
+    assert '# TYPE resume_mailer_stage_seconds histogram' in text
+    assert 'resume_mailer_stage_seconds_count{stage="generate"} 5' in text, "Prometheus count missing"
+    assert 'resume_mailer_stage_seconds_bucket{stage="parse",le="+Inf"} 1' in text, "Prometheus +Inf bucket missing"
+    
+    metrics = Metrics()
+    metrics.observe('send', 0.002)
+    metrics.observe('send', 20.0)
+    assert metrics.to_dict()['send']['buckets']['0.001'] == 0
+    assert metrics.to_dict()['send']['buckets']['0.005'] == 1
+    assert metrics.to_dict()['send']['buckets']['10.0'] == 1
+    assert metrics.to_dict()['send']['max_seconds'] == 20.0
+    
+    print("✓ Instrumentation tests passed")
+    print()
+
+
+def test_profiling():
+    """Test that a profiled run writes pstats and collapsed-stack output."""
+    print("Testing Profiling...")
+    import pstats
+    parser = ResumeParser()
+    assessment = CompanyAssessment(parser.data, cache_size=0)
+    postings = sample_postings(100)
+    
+    def workload():
+        deadline = time.process_time() + 0.2
+        while time.process_time() < deadline:
+            for info in postings:
+                assessment.calculate_success_score(info)
+        return 'done'
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        prefix = os.path.join(workdir, 'run')
+        assert run_profiled(workload, prefix) == 'done', "The workload's result should be returned"
+        
+        stats = pstats.Stats(prefix + '.pstats')
+        assert any(name == 'calculate_success_score' for _, _, name in stats.stats), "Missing from pstats"
+        
+        if SamplingProfiler.available():
+            with open(prefix + '.collapsed', 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            assert lines, "No stacks were sampled"
+            for line in lines:
+                stack, count = line.rsplit(' ', 1)
+                assert stack and int(count) > 0, f"Bad collapsed-stack line {line}"
+            assert any('calculate_success_score' in line for line in lines), "Hot function not sampled"
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Profiling tests passed")
+    print()
+
+
+def test_ingestion():
+    """Test compressed feeds, normalization, deduplication and the bounded prefetch queue."""
+    print("Testing Ingestion...")
+    import gzip
+    
+    raw = {'company': '  Acme   Inc ', 'title': 'Senior iOS Developer', 'skills': 'Swift, SwiftUI , ,AWS',
+           'sector': 'Tech', 'size': 'Startup', 'culture': 'Fast Paced', 'remote': True, 'url': 'https://x'}
+    company_info = normalize_posting(raw)
+    assert company_info == {
+        'url': 'https://x', 'company_name': 'Acme Inc', 'position': 'Senior iOS Developer',
+        'required_skills': ['Swift', 'SwiftUI', 'AWS'], 'industry': 'tech', 'company_size': 'startup',
+        'work_culture': 'fast-paced', 'remote_policy': 'remote',
+    }, f"Unexpected normalization {company_info}"
+    assessment = CompanyAssessment(ResumeParser().data)
+    canonical = dict(company_info, work_culture='fast-paced')
+    assert assessment.calculate_success_score(company_info) == assessment.calculate_success_score(canonical)
+    
+    repost = dict(raw, company='ACME INC', skills=['aws', 'Swift', 'swiftui', 'Swift'], size='startup')
+    lines = [json.dumps(raw), json.dumps(repost), 'not json', json.dumps(dict(raw, title='Junior iOS Developer'))]
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, 'postings.jsonl.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        with open_feed(path) as stream:
+            deduplicator = PostingDeduplicator(capacity=1000)
+            records = list(ingest_postings(stream, 'jsonl', deduplicator))
+        assert [(line, info is None, error is None) for line, info, error in records] == \
+            [(1, False, True), (3, True, False), (4, False, True)], f"Unexpected records {records}"
+        assert deduplicator.duplicates == 1, "The recased, reordered repost should be a duplicate"
+        
+        zst_path = os.path.join(workdir, 'postings.jsonl.zst')
+        with open(zst_path, 'wb') as f:
+            f.write(b'\x28\xb5\x2f\xfd' + b'\x00' * 8)
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            try:
+                open_feed(zst_path)
+                assert False, "Reading zstd without zstandard should fail clearly"
+            except ImportError as e:
+                assert 'zstandard' in str(e), f"Unhelpful error: {e}"
+    finally:
+        shutil.rmtree(workdir)
+    
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    digests = [os.urandom(16) for _ in range(1000)]
+    for digest in digests[:500]:
+        bloom.add(digest)
+    assert all(bloom.add(digest) for digest in digests[:500]), "A Bloom filter must never forget an item"
+    assert all(digest in bloom for digest in digests[:500])
+    for capacity in [0, -1]:
+        try:
+            BloomFilter(capacity)
+            assert False, f"A Bloom filter capacity of {capacity} should be rejected"
+        except ValueError:
+            pass
+    
+    produced = []
+    
+    def numbers():
+        for i in range(10000):
+            produced.append(i)
+            yield i
+    
+    consumed = prefetch(numbers(), queue_size=2, batch_size=10)
+    assert [next(consumed) for _ in range(5)] == list(range(5)), "Items should arrive in order"
+    time.sleep(0.05)
+    assert len(produced) <= 50, f"Producer ran {len(produced)} items ahead despite the bounded queue"
+    assert list(consumed) == list(range(5, 10000)), "Items lost or reordered"
+    
+    def failing():
+        yield 1
+        raise ValueError("bad feed")
+    
+    try:
+        list(prefetch(failing()))
+        assert False, "Producer errors should reach the consumer"
+    except ValueError:
+        pass
+    
+    release = threading.Event()
+    
+    def blocking():
+        yield 1
+        release.wait()
+        yield 2
+    
+    try:
+        next(prefetch(range(10), queue_size=0))
+        assert False, "An unbounded prefetch queue should be rejected"
+    except ValueError:
+        pass
+    
+    consumed = prefetch(blocking(), batch_size=1)
+    assert next(consumed) == 1
+    started = time.monotonic()
+    consumed.close()
+    assert time.monotonic() - started < 5, "Closing early should not wait on a blocked producer"
+    release.set()
+    
+    print("✓ Ingestion tests passed")
+    print()
+
+
+def test_posting_catalog():
+    """Test compact Posting records against the dicts they are built from."""
+    print("Testing Posting Catalog...")
+    import tracemalloc
+    
+    # Round-trip through JSON so, as with a loaded feed, no strings are shared between dicts.
+    lines = [json.dumps(company_info) for company_info in sample_postings(2000)]
+    lines.append(json.dumps({'company_name': 'Bare Inc', 'url': 'https://example.com/jobs/1'}))
+    infos = [json.loads(line) for line in lines]
+    catalog = PostingCatalog(infos)
+    
+    assert len(catalog) == len(infos), "Every posting should be added"
+    assert all(isinstance(posting, Posting) for posting in catalog), "A catalog should hold Posting records"
+    for company_info, posting in zip(infos, catalog):
+        assert posting == company_info and dict(posting) == company_info, f"{posting!r} != {company_info}"
+    bare = catalog[-1]
+    assert bare['url'] == 'https://example.com/jobs/1' and 'industry' not in bare
+    assert bare.get('industry', 'tech') == 'tech' and bare.get('required_skills', []) == []
+    try:
+        bare['position']
+        assert False, "Missing keys should raise KeyError"
+    except KeyError:
+        pass
+    assert catalog[0]['industry'] is catalog[7]['industry'], "Enum values should be interned"
+    assert catalog[2]['work_culture'] is catalog[6]['work_culture'], "Enum values should be interned"
+    
+    resume_data = ResumeParser().data
+    assessment = CompanyAssessment(resume_data, cache_size=0)
+    generator = CoverLetterGenerator(resume_data)
+    results = [assessment.calculate_success_score(company_info) for company_info in infos]
+    assert [assessment.calculate_success_score(posting) for posting in catalog] == results
+    assert assessment.score_many(catalog) == assessment.score_many(infos), "Batch scores should match"
+    for company_info, posting, result in zip(infos[:50], catalog, results):
+        assert generator.generate(posting, result) == generator.generate(company_info, result)
+    
+    with ResultStore(':memory:', batch_size=64) as store:
+        stored = list(store.iter_scores(assessment, PostingCatalog(infos[:200])))
+        assert [result for _, result in stored] == results[:200], "Stored catalog scores differ"
+        list(store.iter_scores(assessment, infos[:200]))
+        assert store.hits == 200, "A Posting should hit the results stored for its dict"
+        assert store.get(catalog[0], resume_fingerprint(resume_data)) == results[0]
+        assert store.find(company_name=infos[0]['company_name'])[0]['company_info'] == infos[0]
+    with ParallelAssessment(resume_data, workers=2, chunk_size=50) as parallel:
+        assert parallel.score(catalog[:200]) == results[:200], "Parallel catalog scores differ"
+    
+    def measure(build):
+        tracemalloc.start()
+        try:
+            records = build()
+            return tracemalloc.get_traced_memory()[0], records
+        finally:
+            tracemalloc.stop()
+    
+    dict_bytes, _ = measure(lambda: [json.loads(line) for line in lines])
+    catalog_bytes, _ = measure(lambda: PostingCatalog(json.loads(line) for line in lines))
+    assert catalog_bytes < dict_bytes * 0.6, f"Catalog uses {catalog_bytes} bytes vs {dict_bytes} for dicts"
+    
+    print("✓ Posting catalog tests passed")
+    print()
+
+
+def test_columnar_catalog():
+    """Test the memory-mapped columnar catalog against the dicts it was written from."""
+    print("Testing Columnar Catalog...")
+    postings = sample_postings(200)
+    postings.append({'company_name': 'Bare Inc', 'position': 'Café Owner'})
+    resume_data = ResumeParser().data
+    assessment = CompanyAssessment(resume_data)
+    here = os.path.dirname(os.path.abspath(__file__))
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, 'postings.catalog')
+        assert ColumnarCatalog.write(path, iter(postings)) == len(postings), "Every posting should be written"
+        assert ColumnarCatalog.is_catalog(path) and not ColumnarCatalog.is_catalog(os.path.join(here, 'resume.md'))
+        
+        with ColumnarCatalog.open(path) as catalog:
+            assert len(catalog) == len(postings)
+            assert list(catalog) == postings[:-1] + [dict(postings[-1], required_skills=[])], \
+                "Rows should read back as the original company_info dicts"
+            assert catalog[-1]['position'] == 'Café Owner' and 'industry' not in catalog[-1]
+            assert catalog.labels()[3] == (postings[3]['company_name'], postings[3]['position'])
+            assert assessment.score_many(catalog) == assessment.score_many(postings), \
+                "Catalog scores should match scores of the original dicts"
+            for workers in [1, 2]:
+                matrix_path = os.path.join(workdir, f'scores-{workers}.matrix')
+                score_matrix([os.path.join(here, 'resume.md')], catalog, matrix_path, workers=workers)
+                with ScoreMatrix.open(matrix_path) as matrix:
+                    assert list(matrix.row(0)) == [assessment.calculate_success_score(info)['total_score']
+                                                   for info in postings], f"Matrix differs with {workers} workers"
+        
+        try:
+            ColumnarCatalog.open(os.path.join(here, 'resume.md'))
+            assert False, "Opening a non-catalog file should fail"
+        except ValueError:
+            pass
+        
+        jsonl_path = os.path.join(workdir, 'postings.jsonl')
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(info) + '\n' for info in postings[:20]))
+        cli = [sys.executable, os.path.join(here, 'resume_mailer.py')]
+        subprocess.run(cli + ['catalog', jsonl_path, '-o', path], cwd=here, capture_output=True, check=True)
+        from_jsonl, from_catalog = [
+            subprocess.run(cli + ['score', source], cwd=here, capture_output=True, text=True, check=True).stdout
+            for source in (jsonl_path, path)
+        ]
+        assert from_catalog == from_jsonl and from_catalog.count('\n') == 20, "score output differs for a catalog"
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Columnar Catalog tests passed")
+    print()
+
+
+def test_assessment_profile():
+    """Test that profile lookups score exactly like the original per-job loops."""
+    print("Testing Assessment Profile...")
+    import copy
+    
+    original = ResumeParser().data
+    no_experience = dict(original, experience=[])
+    small_shop = copy.deepcopy(original)
+    small_shop['experience'] = [
+        {'title': 'Store Manager', 'company': 'Owner Operated Bikes', 'dates': '2019 - 2021'},
+        {'title': 'Summer Intern', 'company': 'Big Bank Financial', 'dates': '2018'},
+        {'title': 'Online Sales Lead', 'company': 'Retail Co', 'dates': '2021 - 2022'},
+    ]
+    small_shop['skills'] = {'Tools': ['Excel', 'CI/CD pipelines']}
+    veteran = copy.deepcopy(original)
+    veteran['experience'] = [
+        {'title': f'Senior Software Engineer {i}', 'company': 'Vehicle Tech', 'dates': '2024 - Present'}
+        for i in range(6)
+    ]
+    
+    industries = ['tech', 'Tech', 'ecommerce', 'finance', 'automotive', 'healthcare', '']
+    positions = ['Senior iOS Developer', 'Lead Engineer', 'Junior Analyst', 'Entry Level Developer',
+                 'Data Scientist', '']
+    sizes = ['startup', 'Startup', 'medium', 'enterprise', 'small', '']
+    cultures = ['fast-paced', 'Fast-Paced', 'balanced', 'traditional', '']
+    
+    for resume_data in [original, no_experience, small_shop, veteran]:
+        assessment = CompanyAssessment(resume_data)
+        for industry in industries:
+            for position in positions:
+                assert assessment._assess_experience_relevance(industry, position) == \
+                    reference_experience_relevance(resume_data, industry, position), \
+                    f"Experience differs for {industry!r}, {position!r}"
+        for company_size in sizes:
+            for work_culture in cultures:
+                assert assessment._assess_culture_fit(company_size, work_culture) == \
+                    reference_culture_fit(resume_data, company_size, work_culture), \
+                    f"Culture fit differs for {company_size!r}, {work_culture!r}"
+    
+    assessment = CompanyAssessment(small_shop)
+    assert assessment.profile['relevant_jobs']['ecommerce'] == 1 and assessment.profile['has_ci_cd']
+    assert assessment.profile['has_enterprise_exp'] and assessment.profile['has_small_business_exp']
+    assert not assessment.profile['has_startup_exp']
+    
+    # The profile follows the resume, whether it is replaced or edited in place.
+    assessment.resume_data = veteran
+    assert assessment.profile['senior_jobs'] == 6 and assessment.profile['has_startup_exp']
+    veteran['experience'].clear()
+    assessment.invalidate()
+    assert assessment.profile['jobs'] == 0
+    assert assessment._assess_experience_relevance('tech', 'Senior Engineer') == \
+        reference_experience_relevance(veteran, 'tech', 'Senior Engineer')
+    
+    print("✓ Assessment Profile tests passed")
+    print()
+
+
+def test_scoring_rules():
+    """Test rules files: defaults, weights, keywords, every file format and hot reload."""
+    print("Testing Scoring Rules...")
+    import warnings
+    
+    resume_data = ResumeParser().data
+    postings = sample_postings(60)
+    default = CompanyAssessment(resume_data)
+    expected = [default.calculate_success_score(info) for info in postings]
+    
+    assert ScoringRules().rules == DEFAULT_SCORING_RULES, "No rules should mean the defaults"
+    explicit = CompanyAssessment(resume_data, rules=json.loads(json.dumps(DEFAULT_SCORING_RULES)))
+    assert [explicit.calculate_success_score(info) for info in postings] == expected
+    labels = [(85, "Excellent Fit - Highly Recommended"), (70, "Strong Fit - Recommended"),
+              (55, "Good Fit - Worth Pursuing"), (40, "Moderate Fit - Consider Carefully"),
+              (-10 ** 9, "Low Fit - May Not Be Ideal")]
+    for score in range(-5, 110):
+        assert default._get_recommendation(score) == next(label for floor, label in labels if score >= floor)
+    
+    weighted = CompanyAssessment(resume_data, rules={
+        'weights': {'skills_match': 80, 'growth_potential': 5},
+        'industry_keywords': {'mobile': ['ios', 'devops', 'computer vision']},
+        'recommendations': [{'min_score': 100, 'label': 'Apply'}, {'min_score': 0, 'label': 'Skip'}],
+    })
+    assert weighted.rules.max_score == 130 and weighted.rules.weights['experience'] == 30
+    assert weighted._assess_skills_match([]) == 70, "Skills points should scale with their weight"
+    assert weighted._assess_growth_potential('', 'startup') == 5
+    assert weighted.profile['relevant_jobs'] == {'mobile': 3}, "industry_keywords should replace the defaults"
+    assert weighted._assess_experience_relevance('Mobile', 'Engineer') > \
+        weighted._assess_experience_relevance('tech', 'Engineer'), "Industries should come from the rules"
+    results = [weighted.calculate_success_score(info) for info in postings]
+    assert {result['recommendation'] for result in results} <= {'Apply', 'Skip'}
+    assert list(weighted.score_many(postings)['total_score']) == [r['total_score'] for r in results]
+    ranked = sorted(range(len(postings)), key=lambda i: -results[i]['total_score'])[:10]
+    assert [index for index, _, _ in weighted.top_k(postings, 10)] == ranked, "top_k should use the rules"
+    
+    for bad in [{'wieghts': {}}, {'weights': {'skills_match': -1}}, {'weights': {'typing_speed': 5}},
+                {'recommendations': [{'min_score': 50, 'label': 'Maybe'}]}, {'startup_keywords': 'app'},
+                {'seniority_terms': [1]}, {'industry_keywords': {'tech': [3]}}, {'industry_keywords': {1: ['a']}},
+                {'recommendations': None}]:
+        try:
+            ScoringRules(bad)
+            assert False, f"Rules {bad} should be rejected"
+        except ValueError:
+            pass
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        sources = {
+            'rules.json': json.dumps({'weights': {'skills_match': 50}, 'startup_keywords': ['bank']}),
+            'rules.toml': 'startup_keywords = ["bank"]\n\n[weights]\nskills_match = 50\n',
+        }
+        try:
+            import yaml  # noqa: F401
+            sources['rules.yaml'] = 'weights:\n  skills_match: 50\nstartup_keywords: [bank]\n'
+        except ImportError:
+            pass
+        for name, text in sources.items():
+            path = os.path.join(workdir, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            rules = ScoringRules.from_file(path)
+            assert rules.weights['skills_match'] == 50 and rules.rules['startup_keywords'] == ['bank'], name
+        
+        path = os.path.join(workdir, 'rules.json')
+        assessment = CompanyAssessment(resume_data, rules=path)
+        assessment.rules.check_interval = 0
+        before = assessment.calculate_success_score(postings[0])
+        
+        def rewrite(text, tick):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.utime(path, ns=(tick, tick))
+        
+        rewrite(json.dumps({'recommendations': [{'min_score': 0, 'label': 'Reloaded'}]}), 10 ** 18)
+        after = assessment.calculate_success_score(postings[0])
+        assert after['recommendation'] == 'Reloaded' and assessment.rules.version == 1, "Rules were not reloaded"
+        assert before['breakdown'] != after['breakdown'] == expected[0]['breakdown'], \
+            "Reloaded rules should drop the old weights and cached scores"
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            rewrite('{"weights": ', 2 * 10 ** 18)
+            assert assessment.calculate_success_score(postings[0])['recommendation'] == 'Reloaded'
+        assert caught and 'Keeping previous scoring rules' in str(caught[0].message), "Bad reload not reported"
+        
+        weights = assessment.rules.weights
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            rewrite(json.dumps({'weights': {'skills_match': 5}, 'industry_keywords': {'tech': [3]}}), 3 * 10 ** 18)
+            assert assessment.calculate_success_score(postings[0]) == after, "Malformed reload changed scores"
+        assert caught and assessment.rules.weights is weights, "Malformed rules left the rules half-updated"
+        
+        try:
+            score_matrix([os.path.join(workdir, 'missing.md')], postings, os.path.join(workdir, 'm'),
+                         rules={'weights': {'skills_match': 250}})
+            assert False, "Scores above 255 cannot fit a score matrix"
+        except ValueError:
+            pass
+    finally:
+        shutil.rmtree(workdir)
+    
+    print("✓ Scoring Rules tests passed")
+    print()
+# Modules a scoring run must not import, and a generous sanity bound on importing resume_mailer.
+
+# Modules a scoring run must not import, and the budget for importing resume_mailer.
+HEAVY_MODULES = ['smtplib', 'email.mime.multipart', 'asyncio', 'sqlite3', 'tarfile', 'zipfile',
+                 'concurrent.futures', 'argparse']
+IMPORT_BUDGET_SECONDS = 1.0
+
+
+def test_startup_imports():
+    """Test that importing resume_mailer and running `score` skip the heavy modules."""
+    print("Testing Startup Imports...")
+    here = os.path.dirname(os.path.abspath(__file__))
+    
+    script = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import resume_mailer\n"
+        "print(time.perf_counter() - start)\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=here, capture_output=True, text=True, check=True)
+    elapsed, loaded = result.stdout.strip().splitlines()
+    assert loaded == '[]', f"Importing resume_mailer pulled in {loaded}"
+    elapsed = float(elapsed)
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"Import took {elapsed * 1000:.1f} ms, something heavy is loaded eagerly"
+    
+    script = (
+        "import sys, resume_mailer\n"
+        "sys.argv = ['resume_mailer.py', 'score', '-o', '-']\n"
+        "assert resume_mailer.main() == 0\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules and m != 'argparse'])\n"
+    )
+    posting = json.dumps({'company_name': 'AppCo', 'required_skills': ['Swift']}) + '\n'
+    result = subprocess.run([sys.executable, '-c', script], cwd=here, input=posting,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == '[]', f"score imported {result.stdout.splitlines()[-1]}"
+    
+    print("✓ Startup Imports tests passed")
+    print(f"  - import resume_mailer: {elapsed * 1000:.1f} ms")
+    print()
+
+
 def main():
     """Run all tests."""
     print("=" * 60)
@@ -136,6 +1436,30 @@ def main():
         parser = test_resume_parser()
         company_info, assessment_result = test_company_assessment(parser)
         test_cover_letter_generator(parser, company_info, assessment_result)
+        test_batch_scoring()
+        test_parallel_assessment()
+        test_skill_index()
+        test_score_many()
+        test_parse_cache()
+        test_tokenize_sections()
+        test_email_connection_pool()
+        test_async_email_sender()
+        test_attachment_cache()
+        test_cover_letter_template()
+        test_letter_writers()
+        test_result_store()
+        test_assessment_cache()
+        test_top_k()
+        test_posting_index()
+        test_score_matrix()
+        test_instrumentation()
+        test_profiling()
+        test_startup_imports()
+        test_ingestion()
+        test_posting_catalog()
+        test_columnar_catalog()
+        test_assessment_profile()
+        test_scoring_rules()
         
         print("=" * 60)
         print("All tests passed! ✓")